@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Compares TEXT and BIGINT snowflake keys on the leaderboard and rule lookups.
+
+Builds two copies of public.users, public.bypass_roles and the three channel
+restriction tables in scratch schemas, one keyed on TEXT IDs (the schema
+before 005_bigint_snowflakes.sql) and one on BIGINT, filled with the same
+synthetic rows. It then runs the bot's own statements from queries.py
+against each copy and reports the p50/p99 latency and throughput per
+statement, plus the size of every table's primary key index.
+
+Needs a Postgres URL; use a scratch database. The schemas snowflake_text
+and snowflake_bigint are dropped and recreated on every run, and dropped
+again at the end unless --keep is given.
+
+Usage:
+    python Benchmarks/bench_snowflake_ids.py --dsn URL
+        [--guilds 500] [--users 2000] [--channels 50] [--lookups 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Python_Files"))
+
+import asyncpg
+import queries
+
+SCHEMAS = {"text": "snowflake_text", "bigint": "snowflake_bigint"}
+FIRST_ID = 1_100_000_000_000_000_000
+
+# The key columns of each table; {id} is TEXT or BIGINT.
+TABLES = {
+    "users": """
+        guild_id {id} NOT NULL, user_id {id} NOT NULL, guild_name TEXT, username TEXT,
+        xp INTEGER DEFAULT 0, level INTEGER DEFAULT 0, voice_xp_earned INTEGER DEFAULT 0,
+        PRIMARY KEY (guild_id, user_id)
+    """,
+    "bypass_roles": """
+        guild_id {id} NOT NULL, role_id {id} NOT NULL, guild_name TEXT, role_name TEXT,
+        PRIMARY KEY (guild_id, role_id)
+    """,
+    "no_links_channels": """
+        guild_id {id} NOT NULL, channel_id {id} NOT NULL, guild_name TEXT, channel_name TEXT,
+        PRIMARY KEY (guild_id, channel_id)
+    """,
+    "no_discord_links_channels": """
+        guild_id {id} NOT NULL, channel_id {id} NOT NULL, guild_name TEXT, channel_name TEXT,
+        PRIMARY KEY (guild_id, channel_id)
+    """,
+    "no_text_channels": """
+        guild_id {id} NOT NULL, channel_id {id} NOT NULL, redirect_channel_id {id},
+        guild_name TEXT, channel_name TEXT,
+        PRIMARY KEY (guild_id, channel_id)
+    """,
+}
+
+# The statements a message or /l3-leaderboard runs; "channel" lookups take (guild, channel).
+LOOKUPS = {
+    queries.USER_LEADERBOARD: "guild",
+    queries.USER_GET: "user",
+    queries.BYPASS_ROLE_IDS: "guild",
+    queries.NO_LINKS_CHECK: "channel",
+    queries.NO_DISCORD_LINKS_CHECK: "channel",
+    queries.NO_TEXT_GET: "channel",
+}
+
+
+def snowflake(n: int) -> int:
+    return FIRST_ID + n * 4_194_304  # consecutive IDs one millisecond apart
+
+
+async def build(conn: asyncpg.Connection, kind: str, args):
+    schema = SCHEMAS[kind]
+    key = str if kind == "text" else int
+    id_type = "TEXT" if kind == "text" else "BIGINT"
+    await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema}")
+    for table, columns in TABLES.items():
+        await conn.execute(f"CREATE TABLE {schema}.{table} ({columns.format(id=id_type)})")
+
+    rng = random.Random(args.seed)
+    users, roles, links, discord_links, no_text = [], [], [], [], []
+    for g in range(args.guilds):
+        guild_id = snowflake(g * 1_000_000)
+        for u in range(args.users):
+            users.append((key(guild_id), key(snowflake(g * 1_000_000 + 1000 + u)), f"Guild {g}",
+                          f"user{u}", rng.randint(0, 25000), 0, 0))
+        for r in range(2):
+            roles.append((key(guild_id), key(guild_id + 1 + r), f"Guild {g}", f"bypass{r}"))
+        channel_ids = [guild_id + 100 + c for c in range(args.channels)]
+        for channel_id in channel_ids[:2]:
+            links.append((key(guild_id), key(channel_id), f"Guild {g}", "no-links"))
+        for channel_id in channel_ids[2:4]:
+            discord_links.append((key(guild_id), key(channel_id), f"Guild {g}", "no-invites"))
+        for channel_id in channel_ids[4:6]:
+            no_text.append((key(guild_id), key(channel_id), key(channel_ids[-1]), f"Guild {g}", "media"))
+
+    for table, rows in (
+        ("users", users),
+        ("bypass_roles", roles),
+        ("no_links_channels", links),
+        ("no_discord_links_channels", discord_links),
+        ("no_text_channels", no_text),
+    ):
+        await conn.copy_records_to_table(table, records=rows, schema_name=schema)
+    await conn.execute(f"ANALYZE {schema}.users, {schema}.bypass_roles, {schema}.no_links_channels, "
+                       f"{schema}.no_discord_links_channels, {schema}.no_text_channels")
+
+
+def lookup_args(kind: str, shape: str, rng: random.Random, args) -> tuple:
+    """Random (guild[, user or channel]) arguments, as the bot would now send them for `kind`."""
+    key = str if kind == "text" else int
+    g = rng.randrange(args.guilds)
+    guild_id = snowflake(g * 1_000_000)
+    if shape == "guild":
+        return (key(guild_id),)
+    if shape == "user":
+        return key(guild_id), key(snowflake(g * 1_000_000 + 1000 + rng.randrange(args.users)))
+    # Most messages are in unrestricted channels, so most rule lookups miss.
+    return key(guild_id), key(guild_id + 100 + rng.randrange(args.channels))
+
+
+async def time_lookups(conn: asyncpg.Connection, kind: str, args) -> dict:
+    results = {}
+    for statement, shape in LOOKUPS.items():
+        sql = statement.replace("public.", f"{SCHEMAS[kind]}.")
+        prepared = await conn.prepare(sql)
+        rng = random.Random(args.seed)
+        calls = [lookup_args(kind, shape, rng, args) for _ in range(args.lookups)]
+        for call in calls[:200]:  # warm the buffer cache
+            await prepared.fetch(*call)
+        latencies = []
+        started = time.perf_counter()
+        for call in calls:
+            call_started = time.perf_counter()
+            await prepared.fetch(*call)
+            latencies.append(time.perf_counter() - call_started)
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        results[statement.name] = {
+            "p50": latencies[len(latencies) // 2],
+            "p99": latencies[min(int(0.99 * len(latencies)), len(latencies) - 1)],
+            "per_second": len(calls) / elapsed,
+        }
+    return results
+
+
+async def index_sizes(conn: asyncpg.Connection, kind: str) -> dict:
+    rows = await conn.fetch(
+        """
+        SELECT c.relname AS table_name, pg_relation_size(i.indexrelid) AS index_bytes
+          FROM pg_index i
+          JOIN pg_class c ON c.oid = i.indrelid
+          JOIN pg_namespace n ON n.oid = c.relnamespace
+         WHERE n.nspname = $1 AND i.indisprimary
+        """,
+        SCHEMAS[kind],
+    )
+    return {row["table_name"]: row["index_bytes"] for row in rows}
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--dsn", required=True, help="Postgres URL (scratch database)")
+    arg_parser.add_argument("--guilds", type=int, default=500)
+    arg_parser.add_argument("--users", type=int, default=2000, help="users per guild")
+    arg_parser.add_argument("--channels", type=int, default=50, help="text channels per guild")
+    arg_parser.add_argument("--lookups", type=int, default=20000, help="calls per statement")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--keep", action="store_true", help="keep the scratch schemas")
+    args = arg_parser.parse_args()
+
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        results, sizes = {}, {}
+        for kind in SCHEMAS:
+            started = time.perf_counter()
+            await build(conn, kind, args)
+            print(f"Built {kind} copy ({args.guilds} guilds x {args.users} users) in "
+                  f"{time.perf_counter() - started:.1f} s")
+            results[kind] = await time_lookups(conn, kind, args)
+            sizes[kind] = await index_sizes(conn, kind)
+
+        print(f"\n{'primary key index':<28} {'TEXT KB':>9} {'BIGINT KB':>10} {'change':>8}")
+        for table in TABLES:
+            before, after = sizes["text"][table], sizes["bigint"][table]
+            print(f"{table:<28} {before / 1024:>9.0f} {after / 1024:>10.0f} {after / before - 1:>+8.0%}")
+
+        print(
+            f"\n{'statement':<30} {'TEXT p50 ms':>12} {'p99 ms':>8} {'calls/s':>8}"
+            f" {'BIGINT p50 ms':>14} {'p99 ms':>8} {'calls/s':>8}"
+        )
+        for name in results["text"]:
+            before, after = results["text"][name], results["bigint"][name]
+            print(
+                f"{name:<30} {before['p50'] * 1000:>12.3f} {before['p99'] * 1000:>8.3f} {before['per_second']:>8.0f}"
+                f" {after['p50'] * 1000:>14.3f} {after['p99'] * 1000:>8.3f} {after['per_second']:>8.0f}"
+            )
+    finally:
+        if not args.keep:
+            for schema in SCHEMAS.values():
+                await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,220 @@
+# Benchmarks/fake_discord.py
+
+"""
+Stand-ins for the discord.py objects the event handlers read: guilds,
+members, roles, channels, messages and voice states.
+
+They carry the same attribute names as the real models, so handlers run on
+them unchanged, but they are plain objects that need no gateway connection.
+Sending, deleting and role edits are recorded instead of being sent to Discord.
+"""
+
+import random
+from itertools import count
+
+_ids = count(1_100_000_000_000_000_000)  # snowflake-sized, far from real IDs
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+class FakePermissions:
+    def __init__(self, administrator: bool = False):
+        self.administrator = administrator
+
+
+class FakeRole:
+    def __init__(self, name: str):
+        self.id = next_id()
+        self.name = name
+        self.mention = f"<@&{self.id}>"
+
+
+class FakeAttachment:
+    def __init__(self, content_type: str):
+        self.content_type = content_type
+
+
+class FakeChannel:
+    def __init__(self, guild: "FakeGuild", name: str):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.sent = 0
+
+    async def send(self, content: str = None, **kwargs) -> "FakeMessage":
+        self.sent += 1
+        return FakeMessage(self.guild.bot_member, self, content or "")
+
+
+class FakeMember:
+    def __init__(self, guild: "FakeGuild", name: str, bot: bool = False, administrator: bool = False):
+        self.id = next_id()
+        self.guild = guild
+        self.name = self.display_name = name
+        self.bot = bot
+        self.mention = f"<@{self.id}>"
+        self.guild_permissions = FakePermissions(administrator)
+        self.roles = []
+
+    async def add_roles(self, *roles, reason: str = None):
+        self.roles.extend(role for role in roles if role not in self.roles)
+
+    async def remove_roles(self, *roles, reason: str = None):
+        self.roles = [role for role in self.roles if role not in roles]
+
+
+class FakeGuild:
+    def __init__(self, name: str):
+        self.id = next_id()
+        self.name = name
+        self.members = []
+        self.roles = []
+        self.text_channels = []
+        self.voice_channels = []
+        self._members = {}
+        self._roles = {}
+        self.bot_member = FakeMember(self, "Supporter", bot=True)
+
+    @property
+    def member_count(self) -> int:
+        return len(self.members)
+
+    def get_member(self, user_id: int):
+        return self._members.get(user_id)
+
+    def get_role(self, role_id: int):
+        return self._roles.get(role_id)
+
+    def add_member(self, member: FakeMember):
+        self.members.append(member)
+        self._members[member.id] = member
+
+    def add_role(self, role: FakeRole):
+        self.roles.append(role)
+        self._roles[role.id] = role
+
+
+class FakeMessage:
+    def __init__(self, author: FakeMember, channel: FakeChannel, content: str, attachments=(), embeds=()):
+        self.id = next_id()
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.attachments = list(attachments)
+        self.embeds = list(embeds)
+        self.deleted = False
+
+    async def delete(self):
+        self.deleted = True
+
+
+class FakeVoiceState:
+    def __init__(self, channel: FakeChannel = None, afk: bool = False, self_deaf: bool = False):
+        self.channel = channel
+        self.afk = afk
+        self.self_deaf = self_deaf
+
+
+class FakeBot:
+    """Just enough of commands.Bot for the managers: cache lookups and listener registration."""
+
+    def __init__(self):
+        self.guilds = []
+        self._guilds = {}
+        self._channels = {}
+        self.listeners = {}
+
+    def get_guild(self, guild_id: int):
+        return self._guilds.get(guild_id)
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+    async def wait_until_ready(self):
+        return
+
+    def add_listener(self, func, name: str = None):
+        self.listeners.setdefault(name or func.__name__, []).append(func)
+
+    def add_guild(self, guild: FakeGuild):
+        self.guilds.append(guild)
+        self._guilds[guild.id] = guild
+        for channel in guild.text_channels + guild.voice_channels:
+            self._channels[channel.id] = channel
+
+
+# --- World Builder ---
+
+MESSAGE_TEXTS = (
+    "hello everyone",
+    "did anyone see the new video?",
+    "gg, that was close",
+    "check this out https://example.com/some/page",
+    "join us at https://discord.gg/abcdef",
+    "lol",
+    "what time is the event tonight?",
+)
+
+
+class World:
+    """
+    A reproducible set of guilds, each with members, text and voice channels
+    and a few roles, plus helpers that draw events from it.
+    """
+
+    def __init__(
+        self,
+        guilds: int,
+        users_per_guild: int,
+        channels_per_guild: int = 5,
+        admin_share: float = 0.02,
+        seed: int = 1,
+    ):
+        self.random = random.Random(seed)
+        self.bot = FakeBot()
+        for g in range(guilds):
+            guild = FakeGuild(f"Guild {g}")
+            for c in range(channels_per_guild):
+                guild.text_channels.append(FakeChannel(guild, f"text-{c}"))
+            guild.voice_channels.append(FakeChannel(guild, "voice"))
+            for level in (5, 10, 20):
+                guild.add_role(FakeRole(f"Level {level}"))
+            guild.add_role(FakeRole("Bypass"))
+            for u in range(users_per_guild):
+                guild.add_member(
+                    FakeMember(guild, f"user{g}_{u}", administrator=self.random.random() < admin_share)
+                )
+            self.bot.add_guild(guild)
+        self.guilds = self.bot.guilds
+        self.in_voice = set()  # member ids currently connected
+
+    def pick_member(self, guild: FakeGuild, skew: float) -> FakeMember:
+        """With skew > 0 a few members send most of the traffic, as in real servers."""
+        if skew <= 0:
+            return self.random.choice(guild.members)
+        index = min(int(self.random.paretovariate(1 / skew)) - 1, len(guild.members) - 1)
+        return guild.members[index]
+
+    def message(self, skew: float = 1.0) -> FakeMessage:
+        guild = self.random.choice(self.guilds)
+        author = self.pick_member(guild, skew)
+        channel = self.random.choice(guild.text_channels)
+        text = self.random.choice(MESSAGE_TEXTS)
+        attachments = [FakeAttachment("image/png")] if self.random.random() < 0.1 else []
+        return FakeMessage(author, channel, text, attachments)
+
+    def voice(self, skew: float = 1.0) -> tuple:
+        """A join for a member outside voice, a leave for one already connected."""
+        guild = self.random.choice(self.guilds)
+        member = self.pick_member(guild, skew)
+        connected = FakeVoiceState(guild.voice_channels[0])
+        disconnected = FakeVoiceState()
+        if member.id in self.in_voice:
+            self.in_voice.discard(member.id)
+            return member, connected, disconnected
+        self.in_voice.add(member.id)
+        return member, disconnected, connected
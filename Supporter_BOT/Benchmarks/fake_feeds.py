@@ -0,0 +1,97 @@
+# Benchmarks/fake_feeds.py
+
+"""
+Synthetic YouTube Atom feeds, shaped like the real
+https://www.youtube.com/feeds/videos.xml?channel_id=... responses.
+"""
+
+from datetime import datetime, timezone, timedelta
+from xml.sax.saxutils import escape
+
+FEED_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+ <link rel="self" href="http://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"/>
+ <id>yt:channel:{channel_id}</id>
+ <yt:channelId>{channel_id}</yt:channelId>
+ <title>{title}</title>
+ <link rel="alternate" href="https://www.youtube.com/channel/{channel_id}"/>
+ <author>
+  <name>{title}</name>
+  <uri>https://www.youtube.com/channel/{channel_id}</uri>
+ </author>
+ <published>2015-01-01T00:00:00+00:00</published>
+{entries}
+</feed>
+"""
+
+ENTRY_TEMPLATE = """ <entry>
+  <id>yt:video:{video_id}</id>
+  <yt:videoId>{video_id}</yt:videoId>
+  <yt:channelId>{channel_id}</yt:channelId>
+  <title>{video_title}</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+  <author>
+   <name>{title}</name>
+   <uri>https://www.youtube.com/channel/{channel_id}</uri>
+  </author>
+  <published>{published}</published>
+  <updated>{published}</updated>
+  <media:group>
+   <media:title>{video_title}</media:title>
+   <media:content url="https://www.youtube.com/v/{video_id}?version=3" type="application/x-shockwave-flash" width="640" height="390"/>
+   <media:thumbnail url="https://i.ytimg.com/vi/{video_id}/hqdefault.jpg" width="480" height="360"/>
+   <media:description>{description}</media:description>
+   <media:community>
+    <media:starRating count="120" average="5.00" min="1" max="5"/>
+    <media:statistics views="4567"/>
+   </media:community>
+  </media:group>
+ </entry>"""
+
+
+def channel_id_for(index: int) -> str:
+    return f"UC{index:022d}"
+
+
+def video_id_for(channel_index: int, video_index: int) -> str:
+    return f"v{channel_index:06d}{video_index:04d}"[:11]
+
+
+def render_feed(channel_index: int, videos: list) -> bytes:
+    """Builds one channel feed from `(video_number, published)` pairs, newest first."""
+    channel_id = channel_id_for(channel_index)
+    title = escape(f"Benchmark Channel {channel_index}")
+
+    rendered = []
+    for video_number, published in videos:
+        rendered.append(
+            ENTRY_TEMPLATE.format(
+                video_id=video_id_for(channel_index, video_number),
+                channel_id=channel_id,
+                title=title,
+                video_title=escape(f"Upload #{video_number + 1} & more"),
+                published=published.isoformat(timespec="seconds"),
+                description=escape("A fairly ordinary video description. " * 8),
+            )
+        )
+    return FEED_TEMPLATE.format(
+        channel_id=channel_id, title=title, entries="\n".join(rendered)
+    ).encode()
+
+
+def make_feed(
+    channel_index: int,
+    entries: int = 15,
+    newest: datetime = None,
+    spacing: timedelta = timedelta(days=1),
+) -> bytes:
+    """Builds one channel feed with `entries` uploads, newest first."""
+    newest = newest or datetime.now(timezone.utc)
+    return render_feed(
+        channel_index,
+        [(entries - 1 - index, newest - spacing * index) for index in range(entries)],
+    )
+
+
+def make_feeds(count: int, entries: int = 15) -> list:
+    return [make_feed(index, entries) for index in range(count)]
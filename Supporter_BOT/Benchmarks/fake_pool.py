@@ -0,0 +1,478 @@
+# Benchmarks/fake_pool.py
+
+"""
+An in-memory stand-in for the asyncpg pool, for running the managers
+without Postgres.
+
+It understands the statements in Python_Files/queries.py by their registry
+name, not by parsing SQL; plain SQL text (what InstrumentedPool passes on)
+is matched back to its registry statement. Each name maps to a small handler over FakeTables,
+which are dicts keyed by the real table's primary key, plus secondary indexes
+on the columns the statements filter by. Results follow asyncpg: rows for
+fetch/fetchrow/fetchval, and status strings such as "DELETE 1" for execute.
+Partition DDL and transactions are accepted and ignored. Any other query, or
+a registry statement without a handler here, raises NotImplementedError.
+
+Every statement counts as one round trip. `round_trips` and `calls` (per
+statement name) let a benchmark check how many queries a handler makes.
+"""
+
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Python_Files"))
+
+from queries import STATEMENTS, Statement
+
+_DDL_PREFIXES = ("CREATE TABLE", "DROP TABLE")
+_BY_SQL = {statement.sql: statement for statement in STATEMENTS.values()}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class FakeTable:
+    """Rows by primary key, with secondary indexes from column value to keys."""
+
+    def __init__(self, key: tuple, indexes: tuple = ()):
+        self.key = key
+        self.rows = {}  # primary key tuple -> row dict
+        self.indexes = {column: {} for column in indexes}  # column -> value -> {key, ...}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _key(self, values: dict) -> tuple:
+        return tuple(values[column] for column in self.key)
+
+    def get(self, *key):
+        return self.rows.get(key)
+
+    def where(self, column: str, value) -> list:
+        if column in self.indexes:
+            return [self.rows[key] for key in self.indexes[column].get(value, ())]
+        return [row for row in self.rows.values() if row[column] == value]
+
+    def insert(self, row: dict) -> bool:
+        """Adds `row` unless its key exists (ON CONFLICT DO NOTHING); True if added."""
+        key = self._key(row)
+        if key in self.rows:
+            return False
+        self.rows[key] = row
+        for column, index in self.indexes.items():
+            index.setdefault(row[column], set()).add(key)
+        return True
+
+    def upsert(self, row: dict, *update_columns) -> dict:
+        """INSERT ... ON CONFLICT (key) DO UPDATE SET update_columns."""
+        existing = self.rows.get(self._key(row))
+        if existing is None:
+            self.insert(row)
+            return row
+        existing.update({column: row[column] for column in update_columns})
+        return existing
+
+    def delete(self, *key) -> int:
+        row = self.rows.pop(key, None)
+        if row is None:
+            return 0
+        for column, index in self.indexes.items():
+            keys = index[row[column]]
+            keys.discard(key)
+            if not keys:
+                del index[row[column]]
+        return 1
+
+
+class _Acquire:
+    def __init__(self, pool: "FakePool"):
+        self.pool = pool
+
+    async def __aenter__(self) -> "FakeConnection":
+        return FakeConnection(self.pool)
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class _Transaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeConnection:
+    def __init__(self, pool: "FakePool"):
+        self.pool = pool
+
+    def transaction(self) -> _Transaction:
+        return _Transaction()
+
+    async def execute(self, query: str, *args, timeout: float = None) -> str:
+        status, _ = self.pool._run(query, args)
+        return status
+
+    async def executemany(self, command: str, args, *, timeout: float = None):
+        # asyncpg pipelines the whole batch, so it is one round trip.
+        self.pool._count(command)
+        for record in args:
+            self.pool._dispatch(command, tuple(record))
+
+    async def fetch(self, query: str, *args, timeout: float = None) -> list:
+        _, rows = self.pool._run(query, args)
+        return rows
+
+    async def fetchrow(self, query: str, *args, timeout: float = None):
+        _, rows = self.pool._run(query, args)
+        return rows[0] if rows else None
+
+    async def fetchval(self, query: str, *args, column: int = 0, timeout: float = None):
+        _, rows = self.pool._run(query, args)
+        return list(rows[0].values())[column] if rows else None
+
+
+class FakePool(FakeConnection):
+    """Use it wherever the managers expect a pool, including wrapped in InstrumentedPool."""
+
+    def __init__(self):
+        super().__init__(self)
+        self.round_trips = 0
+        self.calls = Counter()  # statement name -> round trips
+        self.tables = t = {
+            "users": FakeTable(("guild_id", "user_id"), ("guild_id",)),
+            "last_notified_level": FakeTable(("guild_id", "user_id"), ("guild_id",)),
+            "level_notify_channel": FakeTable(("guild_id",)),
+            "level_roles": FakeTable(("guild_id", "level"), ("guild_id",)),
+            "auto_reset": FakeTable(("guild_id",)),
+            "bypass_roles": FakeTable(("guild_id", "role_id"), ("guild_id",)),
+            "no_links_channels": FakeTable(("guild_id", "channel_id"), ("guild_id",)),
+            "no_discord_links_channels": FakeTable(("guild_id", "channel_id"), ("guild_id",)),
+            "no_text_channels": FakeTable(("guild_id", "channel_id"), ("guild_id",)),
+            "youtube_notification_config": FakeTable(
+                ("guild_id", "yt_channel_id"), ("guild_id", "yt_channel_id")
+            ),
+            "youtube_notification_logs": FakeTable(("guild_id", "yt_channel_id", "video_id")),
+            "youtube_handle_cache": FakeTable(("handle",)),
+            "time_channel_clocks": FakeTable(("channel_id",), ("guild_id",)),
+            "banned_guilds": FakeTable(("guild_id",)),
+            "command_sync_state": FakeTable(("application_id", "scope")),
+        }
+        self.handlers = {
+            # --- Leveling ---
+            "level.user_get": lambda g, u: _select(_one(t["users"].get(g, u))),
+            "level.user_upsert": lambda g, u, guild_name, username: _inserted(
+                t["users"].upsert(
+                    dict(guild_id=g, user_id=u, guild_name=guild_name, username=username,
+                         xp=0, level=0, voice_xp_earned=0),
+                    "guild_name", "username",
+                )
+            ),
+            "level.user_set_xp": lambda g, u, xp, level, voice_xp: _update(
+                _one(t["users"].get(g, u)), xp=xp, level=level, voice_xp_earned=voice_xp
+            ),
+            "level.leaderboard": lambda g: _select(
+                sorted(t["users"].where("guild_id", g), key=lambda r: -r["xp"])[:10]
+            ),
+            "level.user_levels": lambda g: _select(t["users"].where("guild_id", g), "user_id", "level"),
+            "level.users_reset": lambda g: _update(
+                t["users"].where("guild_id", g), xp=0, level=0, voice_xp_earned=0
+            ),
+            "level.last_notified_get": lambda g, u: _select(
+                _one(t["last_notified_level"].get(g, u)), "level"
+            ),
+            "level.last_notified_upsert": lambda g, u, level, guild_name, username: _inserted(
+                t["last_notified_level"].upsert(
+                    dict(guild_id=g, user_id=u, level=level, guild_name=guild_name, username=username),
+                    "level", "username",
+                )
+            ),
+            "level.last_notified_reset": lambda g: _update(
+                t["last_notified_level"].where("guild_id", g), level=0
+            ),
+            "level.notify_channel_get": lambda g: _select(
+                _one(t["level_notify_channel"].get(g)), "channel_id"
+            ),
+            "level.notify_channel_upsert": lambda g, c, guild_name, channel_name: _inserted(
+                t["level_notify_channel"].upsert(
+                    dict(guild_id=g, channel_id=c, guild_name=guild_name, channel_name=channel_name),
+                    "channel_id", "channel_name",
+                )
+            ),
+            "level.roles_by_level": lambda g: _select(
+                _by_level(t["level_roles"].where("guild_id", g)), "role_id", "level"
+            ),
+            "level.role_ids": lambda g: _select(t["level_roles"].where("guild_id", g), "role_id"),
+            "level.roles_show": lambda g: _select(
+                _by_level(t["level_roles"].where("guild_id", g)), "level", "role_id", "role_name"
+            ),
+            "level.role_upsert": lambda g, level, role_id, guild_name, role_name: _inserted(
+                t["level_roles"].upsert(
+                    dict(guild_id=g, level=level, role_id=role_id, guild_name=guild_name, role_name=role_name),
+                    "role_id", "role_name",
+                )
+            ),
+            "level.role_count": lambda g: _count(t["level_roles"].where("guild_id", g)),
+            "level.auto_reset_all": lambda: _select(t["auto_reset"].rows.values()),
+            "level.auto_reset_get": lambda g: _select(_one(t["auto_reset"].get(g))),
+            "level.auto_reset_days": lambda g: _select(_one(t["auto_reset"].get(g)), "days"),
+            "level.auto_reset_upsert": lambda g, days, guild_name: _inserted(
+                t["auto_reset"].upsert(
+                    dict(guild_id=g, days=days, last_reset=_now(), guild_name=guild_name),
+                    "days", "last_reset",
+                )
+            ),
+            "level.auto_reset_mark_done": lambda g: _update(
+                _one(t["auto_reset"].get(g)), last_reset=_now()
+            ),
+            "level.auto_reset_delete": lambda g: _deleted(t["auto_reset"].delete(g)),
+            # --- No-Text ---
+            "no_text.bypass_role_ids": lambda g: _select(t["bypass_roles"].where("guild_id", g), "role_id"),
+            "no_text.bypass_roles_show": lambda g: _select(
+                t["bypass_roles"].where("guild_id", g), "role_id", "role_name"
+            ),
+            "no_text.bypass_role_count": lambda g: _count(t["bypass_roles"].where("guild_id", g)),
+            "no_text.bypass_role_add": lambda g, role_id, guild_name, role_name: _inserted(
+                t["bypass_roles"].insert(
+                    dict(guild_id=g, role_id=role_id, guild_name=guild_name, role_name=role_name)
+                )
+            ),
+            "no_text.bypass_role_delete": lambda g, role_id: _deleted(t["bypass_roles"].delete(g, role_id)),
+            # --- YouTube ---
+            "youtube.configs_enabled": lambda: _select(
+                row for row in t["youtube_notification_config"].rows.values() if row["is_enabled"]
+            ),
+            "youtube.configs_for_channel": lambda yt: _select(
+                row for row in t["youtube_notification_config"].where("yt_channel_id", yt)
+                if row["is_enabled"]
+            ),
+            "youtube.enabled_channel_ids": lambda: _select(
+                {"yt_channel_id": yt}
+                for yt, keys in t["youtube_notification_config"].indexes["yt_channel_id"].items()
+                if any(t["youtube_notification_config"].rows[key]["is_enabled"] for key in keys)
+            ),
+            "youtube.channel_followed": lambda yt: _exists(
+                t["youtube_notification_config"].where("yt_channel_id", yt)
+            ),
+            "youtube.guild_channels": lambda g: _select(
+                t["youtube_notification_config"].where("guild_id", g), "yt_channel_id", "yt_channel_name"
+            ),
+            "youtube.guild_targets": lambda g: _select(
+                t["youtube_notification_config"].where("guild_id", g), "yt_channel_name", "target_channel_id"
+            ),
+            "youtube.config_upsert": self._youtube_config_upsert,
+            "youtube.config_delete": lambda g, yt: _deleted(t["youtube_notification_config"].delete(g, yt)),
+            "youtube.log_lock": lambda g, yt: _select([{"pg_advisory_xact_lock": None}]),
+            "youtube.log_videos": self._youtube_log_videos,
+            "youtube.log_contains": lambda g, yt, video: _exists(
+                _one(t["youtube_notification_logs"].get(g, yt, video))
+            ),
+            "youtube.log_partitions": lambda: _select([]),
+            "youtube.handle_cache_get": lambda handle, days: _select(
+                (
+                    row for row in _one(t["youtube_handle_cache"].get(handle))
+                    if row["resolved_at"] > _now() - timedelta(days=days)
+                ),
+                "yt_channel_id",
+            ),
+            "youtube.handle_cache_put": lambda handle, yt: _inserted(
+                t["youtube_handle_cache"].upsert(
+                    dict(handle=handle, yt_channel_id=yt, resolved_at=_now()),
+                    "yt_channel_id", "resolved_at",
+                )
+            ),
+            # --- Clock Channels ---
+            "clocks.all": lambda: _select(
+                t["time_channel_clocks"].rows.values(), "guild_id", "channel_id", "timezone", "name_format"
+            ),
+            "clocks.for_guild": lambda g: _select(
+                t["time_channel_clocks"].where("guild_id", g), "channel_id", "timezone"
+            ),
+            "clocks.upsert": lambda c, g, tz, name_format: _inserted(
+                t["time_channel_clocks"].upsert(
+                    dict(channel_id=c, guild_id=g, timezone=tz, name_format=name_format, updated_at=_now()),
+                    "timezone", "name_format", "updated_at",
+                )
+            ),
+            "clocks.delete": self._clock_delete,
+            # --- Owner Actions ---
+            "owner.banned_all": lambda: _select(t["banned_guilds"].rows.values(), "guild_id"),
+            "owner.banned_among": lambda guild_ids: _select(
+                (row for g in dict.fromkeys(guild_ids) for row in _one(t["banned_guilds"].get(g))),
+                "guild_id",
+            ),
+            "owner.ban": lambda g, banned_by: _inserted(
+                t["banned_guilds"].upsert(
+                    dict(guild_id=g, banned_at=_now(), banned_by=banned_by), "banned_at", "banned_by"
+                )
+            ),
+            "owner.unban": lambda g: _deleted(t["banned_guilds"].delete(g)),
+            # --- Command Sync ---
+            "command_sync.hash_get": lambda app, scope: _select(
+                _one(t["command_sync_state"].get(app, scope)), "tree_hash"
+            ),
+            "command_sync.hash_upsert": lambda app, scope, tree_hash: _inserted(
+                t["command_sync_state"].upsert(
+                    dict(application_id=app, scope=scope, tree_hash=tree_hash, synced_at=_now()),
+                    "tree_hash", "synced_at",
+                )
+            ),
+            "shard.notify": lambda channel, payload: _select([{"pg_notify": None}]),
+        }
+
+        # The three channel-restriction tables share their statement shapes.
+        for prefix, table in (
+            ("no_text.no_links", t["no_links_channels"]),
+            ("no_text.no_discord_links", t["no_discord_links_channels"]),
+            ("no_text.no_text", t["no_text_channels"]),
+        ):
+            self.handlers.update(self._restriction_handlers(prefix, table))
+
+    def _restriction_handlers(self, prefix: str, table: FakeTable) -> dict:
+        handlers = {
+            f"{prefix}_channels": lambda g: _select(table.where("guild_id", g), "channel_id"),
+            f"{prefix}_delete": lambda g, c: _deleted(table.delete(g, c)),
+        }
+        if prefix == "no_text.no_text":
+            handlers["no_text.no_text_get"] = lambda g, c: _select(
+                _one(table.get(g, c)), "redirect_channel_id"
+            )
+            handlers["no_text.no_text_upsert"] = lambda g, c, guild_name, channel_name, redirect: _inserted(
+                table.upsert(
+                    dict(guild_id=g, channel_id=c, guild_name=guild_name, channel_name=channel_name,
+                         redirect_channel_id=redirect),
+                    "redirect_channel_id",
+                )
+            )
+        else:
+            handlers[f"{prefix}_check"] = lambda g, c: _exists(_one(table.get(g, c)))
+            handlers[f"{prefix}_add"] = lambda g, c, guild_name, channel_name: _inserted(
+                table.insert(dict(guild_id=g, channel_id=c, guild_name=guild_name, channel_name=channel_name))
+            )
+        return handlers
+
+    def _youtube_config_upsert(
+        self, g, yt, target, mention_role, guild_name, yt_name, target_name, mention_role_name
+    ) -> tuple:
+        return _inserted(
+            self.tables["youtube_notification_config"].upsert(
+                dict(
+                    guild_id=g, yt_channel_id=yt, target_channel_id=target,
+                    mention_role_id=mention_role, guild_name=guild_name, yt_channel_name=yt_name,
+                    target_channel_name=target_name, mention_role_name=mention_role_name,
+                    is_enabled=True, updated_at=_now(),
+                ),
+                "target_channel_id", "mention_role_id", "updated_at",
+                "yt_channel_name", "target_channel_name", "mention_role_name",
+            )
+        )
+
+    def _clock_delete(self, g, c) -> tuple:
+        clocks = self.tables["time_channel_clocks"]
+        clock = clocks.get(c)
+        return _deleted(clocks.delete(c) if clock and clock["guild_id"] == g else 0)
+
+    def _youtube_log_videos(self, g, yt, video_ids, days) -> tuple:
+        logs = self.tables["youtube_notification_logs"]
+        now = _now()
+        inserted = [
+            {"video_id": video}
+            for video in dict.fromkeys(video_ids)
+            if logs.insert(
+                dict(guild_id=g, yt_channel_id=yt, video_id=video, video_status="none",
+                     notified_at=now - timedelta(days=days), logged_at=now)
+            )
+        ]
+        return f"INSERT 0 {len(inserted)}", inserted
+
+    # --- asyncpg.Pool Surface ---
+
+    def acquire(self, *, timeout: float = None) -> _Acquire:
+        return _Acquire(self)
+
+    def get_size(self) -> int:
+        return 1
+
+    def get_idle_size(self) -> int:
+        return 1
+
+    async def close(self):
+        pass
+
+    # --- Statement Dispatch ---
+
+    def reset_counts(self):
+        self.round_trips = 0
+        self.calls.clear()
+
+    @classmethod
+    def unhandled_statements(cls) -> list:
+        """Registry statements this stand-in cannot run yet."""
+        return sorted(set(STATEMENTS) - set(cls().handlers))
+
+    def _count(self, query: str):
+        query = _BY_SQL.get(query, query)
+        self.round_trips += 1
+        self.calls[query.name if isinstance(query, Statement) else query.split(" ", 2)[0]] += 1
+
+    def _run(self, query: str, args: tuple) -> tuple:
+        self._count(query)
+        return self._dispatch(query, args)
+
+    def _dispatch(self, query: str, args: tuple) -> tuple:
+        query = _BY_SQL.get(query, query)
+        handler = self.handlers.get(query.name) if isinstance(query, Statement) else None
+        if handler is None:
+            ddl = query.lstrip().upper()
+            for prefix in _DDL_PREFIXES:
+                if ddl.startswith(prefix):
+                    return prefix, []
+            raise NotImplementedError(f"FakePool has no handler for: {query[:80]}")
+        return handler(*args)
+
+
+# --- Result Helpers ---
+
+
+def _one(row) -> list:
+    return [row] if row is not None else []
+
+
+def _select(rows, *columns) -> tuple:
+    """Copies rows out, keeping only `columns` (in that order) when given, like a SELECT list."""
+    if columns:
+        rows = [{column: row[column] for column in columns} for row in rows]
+    else:
+        rows = [dict(row) for row in rows]
+    return f"SELECT {len(rows)}", rows
+
+
+def _exists(rows) -> tuple:
+    return _select([{"?column?": 1}] if rows else [])
+
+
+def _count(rows) -> tuple:
+    return _select([{"count": len(rows)}])
+
+
+def _by_level(rows) -> list:
+    return sorted(rows, key=lambda row: -row["level"])
+
+
+def _inserted(added) -> tuple:
+    # An upsert that updates still reports "INSERT 0 1"; only DO NOTHING reports 0.
+    return f"INSERT 0 {0 if added is False else 1}", []
+
+
+def _update(rows, **values) -> tuple:
+    for row in rows:
+        row.update(values)
+    return f"UPDATE {len(rows)}", []
+
+
+def _deleted(count: int) -> tuple:
+    return f"DELETE {count}", []
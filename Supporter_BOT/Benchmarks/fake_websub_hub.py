@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for YouTube's WebSub hub (pubsubhubbub.appspot.com).
+
+Subscription requests are POSTed to /subscribe as form data. The hub answers
+202 and then verifies the intent asynchronously with a GET to the callback
+carrying hub.challenge; only a callback that echoes the challenge becomes a
+subscriber (or, for hub.mode=unsubscribe, stops being one). Publishing a
+video POSTs a one-entry Atom feed to every subscriber of that channel,
+signed with X-Hub-Signature: sha1=HMAC(hub.secret, body).
+
+`drop_verifications` accepts the first N subscription requests without ever
+verifying them, like a hub whose callback was lost, and `verify_delay`
+delays every verification.
+
+A benchmark that runs the hub as a separate process controls it over
+/admin: GET /admin/stats and
+POST /admin/publish?channel_id=UC...&bad_signature=0.
+
+Usage:
+    python Benchmarks/fake_websub_hub.py [--port 9000] [--verify-delay-ms 50]
+        [--drop-verifications 0]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import random
+import string
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+from aiohttp import web
+
+from fake_feeds import channel_id_for, render_feed
+
+SUBSCRIBE_PATH = "/subscribe"
+TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={}"  # as in websub.py
+
+
+class FakeHub:
+    """
+    Subscriptions are kept per topic and callback. Each published video gets
+    the next number on its channel, so every publish is a new upload.
+    """
+
+    def __init__(
+        self,
+        verify_delay: float = 0.0,
+        drop_verifications: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 1,
+    ):
+        self.verify_delay = verify_delay
+        self.drop_verifications = drop_verifications
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+        # topic -> {callback: {"secret", "expires_at"}}
+        self.subscriptions = {}
+        self.videos = {}  # channel index -> videos published so far
+        self.tasks = set()
+        self.runner = None
+        self.session = None
+        self.reset_stats()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{SUBSCRIBE_PATH}"
+
+    def reset_stats(self):
+        self.stats = {
+            "requests": 0, "rejected": 0, "dropped": 0, "verified": 0, "verify_failed": 0,
+            "published": 0, "delivered": 0, "delivery_errors": 0,
+        }
+
+    # --- Subscriptions ---
+
+    async def handle_subscribe(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        form = await request.post()
+        mode = form.get("hub.mode")
+        callback, topic = form.get("hub.callback"), form.get("hub.topic")
+        if mode not in ("subscribe", "unsubscribe") or not callback or not topic:
+            self.stats["rejected"] += 1
+            return web.Response(status=400, text="Bad Request")
+
+        if mode == "subscribe" and self.drop_verifications:
+            self.drop_verifications -= 1
+            self.stats["dropped"] += 1
+        else:
+            task = asyncio.create_task(self._verify(form))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        return web.Response(status=202)
+
+    async def _verify(self, form):
+        if self.verify_delay:
+            await asyncio.sleep(self.verify_delay)
+        mode, callback, topic = form["hub.mode"], form["hub.callback"], form["hub.topic"]
+        lease_seconds = int(form.get("hub.lease_seconds", "432000"))
+        challenge = "".join(self.random.choices(string.ascii_letters + string.digits, k=32))
+        params = {"hub.mode": mode, "hub.topic": topic, "hub.challenge": challenge}
+        if mode == "subscribe":
+            params["hub.lease_seconds"] = str(lease_seconds)
+        try:
+            async with self.session.get(callback, params=params) as response:
+                confirmed = response.status == 200 and await response.text() == challenge
+        except aiohttp.ClientError:
+            confirmed = False
+        if not confirmed:
+            self.stats["verify_failed"] += 1
+            return
+
+        self.stats["verified"] += 1
+        if mode == "subscribe":
+            self.subscriptions.setdefault(topic, {})[callback] = {
+                "secret": form.get("hub.secret", "").encode(),
+                "expires_at": datetime.now(timezone.utc) + timedelta(seconds=lease_seconds),
+            }
+        else:
+            self.subscriptions.get(topic, {}).pop(callback, None)
+
+    # --- Publishing ---
+
+    def subscribers(self, channel_index: int) -> int:
+        return len(self.subscriptions.get(TOPIC_URL.format(channel_id_for(channel_index)), {}))
+
+    async def publish(self, channel_index: int, bad_signature: bool = False) -> int:
+        """Pushes a new upload on `channel_index` to its subscribers; returns the deliveries."""
+        topic = TOPIC_URL.format(channel_id_for(channel_index))
+        number = self.videos.get(channel_index, 0)
+        self.videos[channel_index] = number + 1
+        body = render_feed(channel_index, [(number, datetime.now(timezone.utc))])
+        self.stats["published"] += 1
+
+        delivered = 0
+        for callback, subscription in list(self.subscriptions.get(topic, {}).items()):
+            secret = b"not-the-secret" if bad_signature else subscription["secret"]
+            signature = hmac.new(secret, body, hashlib.sha1).hexdigest()
+            try:
+                async with self.session.post(
+                    callback,
+                    data=body,
+                    headers={"Content-Type": "application/atom+xml", "X-Hub-Signature": f"sha1={signature}"},
+                ) as response:
+                    if 200 <= response.status < 300:
+                        delivered += 1
+                    else:
+                        self.stats["delivery_errors"] += 1
+            except aiohttp.ClientError:
+                self.stats["delivery_errors"] += 1
+        self.stats["delivered"] += delivered
+        return delivered
+
+    # --- HTTP ---
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {**self.stats, "subscriptions": sum(len(s) for s in self.subscriptions.values())}
+        )
+
+    async def handle_publish(self, request: web.Request) -> web.Response:
+        channel_id = request.query.get("channel_id", "")
+        if not (channel_id.startswith("UC") and channel_id[2:].isdigit()):
+            return web.Response(status=400, text="Bad Request")
+        delivered = await self.publish(
+            int(channel_id[2:]), bad_signature=request.query.get("bad_signature") == "1"
+        )
+        return web.json_response({"delivered": delivered})
+
+    async def start(self):
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        app = web.Application()
+        app.router.add_post(SUBSCRIBE_PATH, self.handle_subscribe)
+        app.router.add_get("/admin/stats", self.handle_stats)
+        app.router.add_post("/admin/publish", self.handle_publish)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.port = self.runner.addresses[0][1]  # the real port when 0 was asked for
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.runner:
+            await self.runner.cleanup()
+        if self.session:
+            await self.session.close()
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=9000)
+    arg_parser.add_argument("--verify-delay-ms", type=float, default=0)
+    arg_parser.add_argument("--drop-verifications", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    hub = FakeHub(
+        verify_delay=args.verify_delay_ms / 1000,
+        drop_verifications=args.drop_verifications,
+        host=args.host,
+        port=args.port,
+    )
+    await hub.start()
+    print(f"WebSub hub listening at {hub.url}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await hub.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,10 @@
+-- Data_Files/Migrations/001_youtube_handle_cache.sql
+-- Persistent cache of resolved YouTube @handle / custom URL -> channel ID
+-- mappings, used by /y1-find-youtube-channel-id.
+-- Entries older than YOUTUBE_HANDLE_CACHE_DAYS are ignored and refreshed.
+
+CREATE TABLE IF NOT EXISTS public.youtube_handle_cache (
+    handle        TEXT PRIMARY KEY,            -- lower-cased search term
+    yt_channel_id TEXT NOT NULL,
+    resolved_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,61 @@
+-- Data_Files/Migrations/002_partition_youtube_notification_logs.sql
+-- Turns public.youtube_notification_logs into a table partitioned by month
+-- on a new logged_at column, so old rows can be dropped a partition at a time
+-- by the bot's retention job (YOUTUBE_LOG_RETENTION_DAYS).
+--
+-- Notes:
+-- * Partitioning by logged_at (when the bot first saw the video) rather than
+--   notified_at, which /y4 back-dates by 90 days.
+-- * A partitioned table cannot have a UNIQUE (guild_id, yt_channel_id, video_id)
+--   constraint, because unique constraints must include the partition key.
+--   The bot now inserts with WHERE NOT EXISTS instead of ON CONFLICT.
+-- * Existing rows are copied with logged_at = NOW(), so every migrated row gets
+--   a full retention window from the day of the migration.
+-- * Run while the bot is stopped.
+
+BEGIN;
+
+ALTER TABLE public.youtube_notification_logs RENAME TO youtube_notification_logs_legacy;
+
+CREATE TABLE public.youtube_notification_logs (
+    guild_id      TEXT NOT NULL,
+    yt_channel_id TEXT NOT NULL,
+    video_id      TEXT NOT NULL,
+    video_status  TEXT DEFAULT 'none',
+    notified_at   TIMESTAMPTZ DEFAULT NOW(),
+    logged_at     TIMESTAMPTZ NOT NULL DEFAULT NOW()
+) PARTITION BY RANGE (logged_at);
+
+-- Safety net for rows outside the monthly partitions the bot creates ahead of time.
+CREATE TABLE public.youtube_notification_logs_default
+    PARTITION OF public.youtube_notification_logs DEFAULT;
+
+-- This month and the next two; the bot keeps creating partitions ahead from here on.
+DO $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW())::date;
+BEGIN
+    FOR i IN 0..2 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.youtube_notification_logs FOR VALUES FROM (%L) TO (%L)',
+            'youtube_notification_logs_p' || to_char(month_start + make_interval(months => i), 'YYYYMM'),
+            month_start + make_interval(months => i),
+            month_start + make_interval(months => i + 1)
+        );
+    END LOOP;
+END $$;
+
+-- Dedupe lookups: (guild, channel, video). Created on every partition.
+CREATE INDEX IF NOT EXISTS youtube_notification_logs_lookup_idx
+    ON public.youtube_notification_logs (guild_id, yt_channel_id, video_id);
+
+INSERT INTO public.youtube_notification_logs
+    (guild_id, yt_channel_id, video_id, video_status, notified_at, logged_at)
+SELECT DISTINCT ON (guild_id, yt_channel_id, video_id)
+    guild_id, yt_channel_id, video_id, video_status, notified_at, NOW()
+FROM public.youtube_notification_logs_legacy;
+
+COMMIT;
+
+-- After checking the bot runs fine against the new table:
+-- DROP TABLE public.youtube_notification_logs_legacy;
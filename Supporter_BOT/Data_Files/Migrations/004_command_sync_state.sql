@@ -0,0 +1,15 @@
+-- Data_Files/Migrations/004_command_sync_state.sql
+-- Remembers a hash of the last slash-command tree pushed to Discord, per
+-- bot application and scope ('global' or 'guild:<id>'), so the bot only
+-- syncs its commands when they have changed (or /g7-sync-commands forces it).
+--
+-- Safe to run while the bot is online; until it exists the bot syncs on
+-- every start as before.
+
+CREATE TABLE IF NOT EXISTS public.command_sync_state (
+    application_id TEXT NOT NULL,
+    scope          TEXT NOT NULL,            -- 'global' or 'guild:<server id>'
+    tree_hash      TEXT NOT NULL,            -- sha256 of the synced command payload
+    synced_at      TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (application_id, scope)
+);
@@ -0,0 +1,73 @@
+-- Data_Files/Migrations/005_bigint_snowflakes.sql
+-- Stores every Discord ID (guild, user, channel, role, application) as
+-- BIGINT instead of TEXT. A snowflake fits a signed 64-bit integer, so the
+-- keys and indexes shrink from ~19-20 byte strings to 8 bytes and compare
+-- as integers. The bot sends and reads plain ints from this version on.
+--
+-- YouTube channel and video IDs are not Discord IDs and stay TEXT.
+-- ALTER COLUMN ... TYPE rewrites each table and rebuilds its indexes and
+-- primary key, and on the partitioned youtube_notification_logs it also
+-- converts every partition. Run while the bot is stopped. A value that is
+-- not a number makes the cast fail and rolls the whole migration back.
+
+BEGIN;
+
+ALTER TABLE public.users
+    ALTER COLUMN guild_id TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN user_id  TYPE BIGINT USING user_id::bigint;
+
+ALTER TABLE public.last_notified_level
+    ALTER COLUMN guild_id TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN user_id  TYPE BIGINT USING user_id::bigint;
+
+ALTER TABLE public.level_notify_channel
+    ALTER COLUMN guild_id   TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN channel_id TYPE BIGINT USING channel_id::bigint;
+
+ALTER TABLE public.level_roles
+    ALTER COLUMN guild_id TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN role_id  TYPE BIGINT USING role_id::bigint;
+
+ALTER TABLE public.auto_reset
+    ALTER COLUMN guild_id TYPE BIGINT USING guild_id::bigint;
+
+ALTER TABLE public.bypass_roles
+    ALTER COLUMN guild_id TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN role_id  TYPE BIGINT USING role_id::bigint;
+
+ALTER TABLE public.no_links_channels
+    ALTER COLUMN guild_id   TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN channel_id TYPE BIGINT USING channel_id::bigint;
+
+ALTER TABLE public.no_discord_links_channels
+    ALTER COLUMN guild_id   TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN channel_id TYPE BIGINT USING channel_id::bigint;
+
+ALTER TABLE public.no_text_channels
+    ALTER COLUMN guild_id            TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN channel_id          TYPE BIGINT USING channel_id::bigint,
+    ALTER COLUMN redirect_channel_id TYPE BIGINT USING NULLIF(redirect_channel_id, '')::bigint;
+
+ALTER TABLE public.youtube_notification_config
+    ALTER COLUMN guild_id          TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN target_channel_id TYPE BIGINT USING target_channel_id::bigint,
+    ALTER COLUMN mention_role_id   TYPE BIGINT USING NULLIF(mention_role_id, '')::bigint;
+
+ALTER TABLE public.youtube_notification_logs
+    ALTER COLUMN guild_id TYPE BIGINT USING guild_id::bigint;
+
+ALTER TABLE public.time_channel_clocks
+    ALTER COLUMN channel_id TYPE BIGINT USING channel_id::bigint,
+    ALTER COLUMN guild_id   TYPE BIGINT USING guild_id::bigint;
+
+ALTER TABLE public.banned_guilds
+    ALTER COLUMN guild_id  TYPE BIGINT USING guild_id::bigint,
+    ALTER COLUMN banned_by TYPE BIGINT USING NULLIF(banned_by, '')::bigint;
+
+ALTER TABLE public.command_sync_state
+    ALTER COLUMN application_id TYPE BIGINT USING application_id::bigint;
+
+COMMIT;
+
+-- Refresh planner statistics for the rewritten tables.
+ANALYZE;
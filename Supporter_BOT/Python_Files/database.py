@@ -0,0 +1,230 @@
+# Python_Files/database.py
+
+import asyncpg
+import logging
+import os
+import re
+import time
+import metrics
+from queries import Statement
+
+log = logging.getLogger(__name__)
+
+# Statements slower than this (execution only, not the wait for a connection) are logged.
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "250"))
+
+QUERY_SECONDS = metrics.Histogram(
+    "supporter_db_query_seconds",
+    "Database statement execution time.",
+    ("scope", "statement"),
+)
+QUERY_ROWS = metrics.Counter(
+    "supporter_db_query_rows_total",
+    "Rows returned or affected by database statements.",
+    ("scope", "statement"),
+)
+QUERY_ERRORS = metrics.Counter(
+    "supporter_db_query_errors_total",
+    "Database statements that raised.",
+    ("scope", "statement"),
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_TABLE = re.compile(
+    r"\b(?:FROM|INTO|UPDATE|TABLE(?: IF (?:NOT )?EXISTS)?)\s+([\w.\"]+)", re.IGNORECASE
+)
+_PARTITION_SUFFIX = re.compile(r"_p\d{6}\b")
+_labels = {}  # raw query -> (label, normalized text)
+
+
+def describe_query(query: str) -> tuple:
+    """
+    Returns `(label, normalized text)` for a statement. Registry statements
+    are labelled by name; for other SQL the label is the verb and main
+    table, e.g. "SELECT public.users", which keeps metric cardinality low.
+    The normalized text is the query on one line.
+    """
+    if isinstance(query, Statement):
+        return query.name, query
+    described = _labels.get(query)
+    if described is None:
+        normalized = _WHITESPACE.sub(" ", query).strip()
+        verb = normalized.split(" ", 1)[0].upper() if normalized else "?"
+        table = _TABLE.search(normalized)
+        label = f"{verb} {_PARTITION_SUFFIX.sub('_pYYYYMM', table.group(1))}" if table else verb
+        if len(_labels) >= 2048:
+            _labels.clear()  # only reachable with dynamic SQL; just start over
+        described = _labels[query] = (label, normalized)
+    return described
+
+
+def _row_count(method: str, result) -> int:
+    if method == "fetch":
+        return len(result)
+    if method in ("fetchrow", "fetchval"):
+        return int(result is not None)
+    if method == "execute" and isinstance(result, str):
+        # Status strings look like "INSERT 0 5", "UPDATE 3", "SELECT 2" or "CREATE TABLE".
+        last = result.rpartition(" ")[2]
+        return int(last) if last.isdigit() else 0
+    return 0
+
+
+class InstrumentedConnection:
+    """Times the query methods of an acquired connection; everything else passes through."""
+
+    def __init__(self, connection, pool: "InstrumentedPool", acquire_wait: float = 0.0):
+        self._connection = connection
+        self._pool = pool
+        self._acquire_wait = acquire_wait
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    async def _run(self, method: str, query: str, args: tuple, kwargs: dict):
+        # Only the first statement on a connection is charged with its acquire wait.
+        wait, self._acquire_wait = self._acquire_wait, 0.0
+        call = getattr(self._connection, method)
+        return await self._pool._timed(call, method, query, args, kwargs, wait)
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        return await self._run("execute", query, args, kwargs)
+
+    async def executemany(self, command: str, args, **kwargs):
+        return await self._run("executemany", command, (args,), kwargs)
+
+    async def fetch(self, query: str, *args, **kwargs) -> list:
+        return await self._run("fetch", query, args, kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs):
+        return await self._run("fetchrow", query, args, kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs):
+        return await self._run("fetchval", query, args, kwargs)
+
+
+class _TimedAcquire:
+    """Wraps `pool.acquire()` and records how long the caller waited for a connection."""
+
+    def __init__(self, context, pool: "InstrumentedPool"):
+        self.context = context
+        self.pool = pool
+
+    async def __aenter__(self):
+        started = time.perf_counter()
+        connection = await self.context.__aenter__()
+        wait = time.perf_counter() - started
+        metrics.POOL_ACQUIRE_SECONDS.observe(wait, self.pool.scope)
+        return InstrumentedConnection(connection, self.pool, wait)
+
+    async def __aexit__(self, *exc_info):
+        return await self.context.__aexit__(*exc_info)
+
+
+class InstrumentedPool:
+    """
+    A drop-in stand-in for asyncpg.Pool that the managers receive instead of
+    the raw pool. `pool.fetch(...)` and `async with pool.acquire()` work as
+    before; everything not defined here is passed through to the real pool.
+
+    Every statement is recorded under its scope (the manager that ran it)
+    and a normalized label: execution time, rows and, for the statement
+    that follows an acquire, the wait for the connection. Statements over
+    DB_SLOW_QUERY_MS are logged with their full text.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, scope: str = "bot", stats: dict = None):
+        self._pool = pool
+        self.scope = scope
+        # (scope, label) -> {"calls", "errors", "rows", "total_seconds", "max_seconds"}
+        self.stats = {} if stats is None else stats
+        if stats is None:
+            metrics.POOL_CONNECTIONS.track(pool.get_idle_size, "idle")
+            metrics.POOL_CONNECTIONS.track(
+                lambda: pool.get_size() - pool.get_idle_size(), "in_use"
+            )
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    def scoped(self, scope: str) -> "InstrumentedPool":
+        """The same pool, with statements recorded under `scope` (e.g. "level")."""
+        return InstrumentedPool(self._pool, scope, self.stats)
+
+    def acquire(self, *, timeout: float = None):
+        return _TimedAcquire(self._pool.acquire(timeout=timeout), self)
+
+    async def execute(self, query: str, *args, timeout: float = None) -> str:
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, timeout=timeout)
+
+    async def executemany(self, command: str, args, *, timeout: float = None):
+        async with self.acquire() as conn:
+            return await conn.executemany(command, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args, timeout: float = None) -> list:
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args, timeout=timeout)
+
+    async def fetchrow(self, query: str, *args, timeout: float = None):
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args, timeout=timeout)
+
+    async def fetchval(self, query: str, *args, column: int = 0, timeout: float = None):
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, column=column, timeout=timeout)
+
+    async def close(self):
+        await self._pool.close()
+        for (scope, label), statement_stats in sorted(
+            self.stats.items(), key=lambda item: -item[1]["total_seconds"]
+        )[:15]:
+            log.info(f"DB stats [{scope}] {label}: {self.format_stats(statement_stats)}")
+
+    # --- Statement Timing ---
+
+    async def _timed(self, method, method_name: str, query: str, args, kwargs, wait: float):
+        label, normalized = describe_query(query)
+        started = time.perf_counter()
+        try:
+            sql = query.sql if isinstance(query, Statement) else query
+            result = await method(sql, *args, **kwargs)
+        except Exception:
+            QUERY_ERRORS.inc(self.scope, label)
+            self._record(label, time.perf_counter() - started, 0, error=True)
+            raise
+
+        elapsed = time.perf_counter() - started
+        rows = len(args[0]) if method_name == "executemany" else _row_count(method_name, result)
+        self._record(label, elapsed, rows)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            log.warning(
+                f"🐢 Slow query [{self.scope}] {label}: {elapsed * 1000:.0f} ms "
+                f"(+{wait * 1000:.0f} ms waiting for a connection), {rows} row(s): {normalized[:500]}"
+            )
+        return result
+
+    def _record(self, label: str, seconds: float, rows: int, error: bool = False):
+        QUERY_SECONDS.observe(seconds, self.scope, label)
+        if rows:
+            QUERY_ROWS.inc(self.scope, label, amount=rows)
+
+        statement_stats = self.stats.get((self.scope, label))
+        if statement_stats is None:
+            statement_stats = self.stats[(self.scope, label)] = {
+                "calls": 0, "errors": 0, "rows": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+            }
+        statement_stats["calls"] += 1
+        statement_stats["errors"] += error
+        statement_stats["rows"] += rows
+        statement_stats["total_seconds"] += seconds
+        statement_stats["max_seconds"] = max(statement_stats["max_seconds"], seconds)
+
+    @staticmethod
+    def format_stats(statement_stats: dict) -> str:
+        average_ms = 1000 * statement_stats["total_seconds"] / max(statement_stats["calls"], 1)
+        return (
+            f"{statement_stats['calls']} calls, {statement_stats['errors']} errors, "
+            f"{statement_stats['rows']} rows, avg {average_ms:.1f} ms, "
+            f"max {1000 * statement_stats['max_seconds']:.0f} ms"
+        )
@@ -0,0 +1,148 @@
+# Python_Files/feed_parser.py
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import asyncio
+import logging
+import multiprocessing
+
+log = logging.getLogger(__name__)
+
+# Compact, picklable parse results. Only these cross the process boundary,
+# never feedparser's own (large) result objects.
+VideoEntry = namedtuple("VideoEntry", "video_id title link author published")
+ParsedFeed = namedtuple("ParsedFeed", "title channel_id entries")
+
+PARSE_MODES = ("inline", "thread", "process")
+
+
+def parse_feed(raw: bytes) -> ParsedFeed:
+    """
+    Parses a YouTube Atom feed (or WebSub push) into a ParsedFeed.
+
+    `published` is a UTC POSIX timestamp. Entries without a video ID or a
+    parseable publish date are skipped.
+    """
+    import feedparser  # imported here so worker processes pay for it, not callers
+
+    feed = feedparser.parse(raw)
+    entries = []
+    for entry in feed.entries:
+        video_id = entry.get("yt_videoid")
+        published_str = entry.get("published")
+        if not video_id or not published_str:
+            continue
+        try:
+            published = datetime.strptime(
+                published_str, "%Y-%m-%dT%H:%M:%S%z"
+            ).timestamp()
+        except ValueError:
+            continue
+        entries.append(
+            VideoEntry(
+                video_id,
+                entry.get("title", "Untitled"),
+                entry.get("link", f"https://www.youtube.com/watch?v={video_id}"),
+                entry.get("author", "Unknown Channel"),
+                published,
+            )
+        )
+
+    channel_id = feed.feed.get("yt_channelid") or next(
+        (entry.get("yt_channelid") for entry in feed.entries if entry.get("yt_channelid")),
+        None,
+    )
+    return ParsedFeed(feed.feed.get("title"), channel_id, entries)
+
+
+def parse_feeds(raws: list) -> list:
+    """Parses a batch of feeds; the unit of work sent to a worker process."""
+    return [parse_feed(raw) for raw in raws]
+
+
+class FeedParser:
+    """
+    Runs parse_feed in one of three modes:
+
+    - inline:  on the event loop itself (lowest overhead, blocks the loop)
+    - thread:  in the loop's default thread pool (parses still share the GIL)
+    - process: in a ProcessPoolExecutor; concurrent requests are collected
+               into batches of up to `batch_size` feeds (or whatever arrived
+               within `batch_delay` seconds) so each worker round trip carries
+               many feeds and returns only compact tuples
+    """
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        workers: int = None,
+        batch_size: int = 32,
+        batch_delay: float = 0.005,
+    ):
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Unknown feed parse mode '{mode}', expected one of {PARSE_MODES}")
+        self.mode = mode
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.executor = None
+        if mode == "process":
+            # "spawn" so workers don't inherit the bot's event loop, sockets and locks.
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        self._pending = []  # [(raw, future)]
+        self._flush_handle = None
+
+    async def parse(self, raw: bytes) -> ParsedFeed:
+        if self.mode == "inline":
+            return parse_feed(raw)
+
+        loop = asyncio.get_running_loop()
+        if self.mode == "thread":
+            return await loop.run_in_executor(None, parse_feed, raw)
+
+        future = loop.create_future()
+        self._pending.append((raw, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush)
+        return await future
+
+    async def parse_many(self, raws: list) -> list:
+        return list(await asyncio.gather(*(self.parse(raw) for raw in raws)))
+
+    def depth(self) -> int:
+        """Feeds waiting for the next process-mode batch."""
+        return len(self._pending)
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        futures = [future for _, future in batch]
+        job = asyncio.get_running_loop().run_in_executor(
+            self.executor, parse_feeds, [raw for raw, _ in batch]
+        )
+
+        def deliver(job):
+            for index, future in enumerate(futures):
+                if future.done():
+                    continue  # the caller gave up waiting
+                if job.cancelled():
+                    future.cancel()
+                elif job.exception():
+                    future.set_exception(job.exception())
+                else:
+                    future.set_result(job.result()[index])
+
+        job.add_done_callback(deliver)
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -6,6 +6,9 @@ from discord.ext import commands, tasks
 from datetime import datetime, timezone, timedelta
 import asyncpg
 import logging
+import member_cache
+import metrics
+import queries
 
 log = logging.getLogger(__name__)
 IST = timezone(timedelta(hours=5, minutes=30))
@@ -32,38 +35,40 @@ class LevelManager:
 
     # --- Database Utilities ---
 
-    async def get_user(self, guild_id: int, user_id: int) -> dict:
+    async def get_user(self, guild_id: int, user_id: int, user_name: str = None) -> dict:
         key = (guild_id, user_id)
         if user_data := self.user_cache.get(key):
             return user_data
 
         async with self.pool.acquire() as conn:
             user_record = await conn.fetchrow(
-                "SELECT * FROM public.users WHERE guild_id = $1 AND user_id = $2",
-                str(guild_id),
-                str(user_id),
+                queries.USER_GET,
+                guild_id,
+                user_id,
             )
 
         if user_record:
             user_dict = dict(user_record)
             self.user_cache[key] = user_dict
             return user_dict
-        return await self.create_user(guild_id, user_id)
+        return await self.create_user(guild_id, user_id, user_name)
 
-    async def create_user(self, guild_id: int, user_id: int) -> dict:
+    async def create_user(self, guild_id: int, user_id: int, user_name: str = None) -> dict:
         guild = self.bot.get_guild(guild_id)
-        member = guild.get_member(user_id) if guild else None
         guild_name = guild.name if guild else "Unknown Guild"
-        user_name = member.name if member else "Unknown User"
+        if user_name is None:
+            # Callers with the member at hand pass the name, so this only
+            # finds someone when the member cache is on.
+            member = guild.get_member(user_id) if guild else None
+            user_name = member.name if member else "Unknown User"
 
-        query = "INSERT INTO public.users (guild_id, user_id, guild_name, username) VALUES ($1, $2, $3, $4) ON CONFLICT (guild_id, user_id) DO UPDATE SET guild_name = $3, username = $4"
         await self.pool.execute(
-            query, str(guild_id), str(user_id), guild_name, user_name
+            queries.USER_UPSERT, guild_id, user_id, guild_name, user_name
         )
 
         new_user = {
-            "guild_id": str(guild_id),
-            "user_id": str(user_id),
+            "guild_id": guild_id,
+            "user_id": user_id,
             "xp": 0,
             "level": 0,
             "voice_xp_earned": 0,
@@ -81,9 +86,8 @@ class LevelManager:
         new_level = new_xp // 1000
         new_voice_xp = user.get("voice_xp_earned", 0) + voice_xp_gain
 
-        query = "UPDATE public.users SET xp = $3, level = $4, voice_xp_earned = $5 WHERE guild_id = $1 AND user_id = $2"
         await self.pool.execute(
-            query, str(guild_id), str(user_id), new_xp, new_level, new_voice_xp
+            queries.USER_SET_XP, guild_id, user_id, new_xp, new_level, new_voice_xp
         )
 
         user.update(xp=new_xp, level=new_level, voice_xp_earned=new_voice_xp)
@@ -111,7 +115,9 @@ class LevelManager:
             )
             else 10
         )
-        user_data = await self.get_user(message.guild.id, message.author.id)
+        user_data = await self.get_user(
+            message.guild.id, message.author.id, message.author.name
+        )
         old_level = user_data.get("level", 0)
         new_level = await self.update_user_xp(
             message.guild.id, message.author.id, amount
@@ -144,7 +150,7 @@ class LevelManager:
     # --- Core Leveling & Role Logic ---
 
     async def _award_voice_xp(self, member: discord.Member, start_time: datetime):
-        user = await self.get_user(member.guild.id, member.id)
+        user = await self.get_user(member.guild.id, member.id, member.name)
         if user.get("voice_xp_earned", 0) >= VOICE_XP_LIMIT:
             return
 
@@ -167,9 +173,9 @@ class LevelManager:
     async def _check_and_handle_level_up(self, member: discord.Member, new_level: int):
         last_notified = (
             await self.pool.fetchval(
-                "SELECT level FROM public.last_notified_level WHERE guild_id = $1 AND user_id = $2",
-                str(member.guild.id),
-                str(member.id),
+                queries.LAST_NOTIFIED_GET,
+                member.guild.id,
+                member.id,
             )
             or 0
         )
@@ -182,11 +188,11 @@ class LevelManager:
         earned_role_id = await self.upgrade_user_roles(member, new_level)
         earned_role = member.guild.get_role(earned_role_id) if earned_role_id else None
 
-        channel_id_str = await self.pool.fetchval(
-            "SELECT channel_id FROM public.level_notify_channel WHERE guild_id = $1",
-            str(member.guild.id),
+        channel_id = await self.pool.fetchval(
+            queries.LEVEL_NOTIFY_CHANNEL_GET,
+            member.guild.id,
         )
-        if channel_id_str and (channel := self.bot.get_channel(int(channel_id_str))):
+        if channel_id and (channel := self.bot.get_channel(channel_id)):
             msg = f"🚀 Congrats {member.mention}! You've reached **Level {new_level}**!"
             if earned_role:
                 msg = f"🎉 Congrats {member.mention}! You've reached **Level {new_level}** and earned the **{earned_role.name}** role!"
@@ -197,11 +203,10 @@ class LevelManager:
                     f"Failed to send level-up message to channel {channel.id}: {e}"
                 )
 
-        query = "INSERT INTO public.last_notified_level (guild_id, user_id, level, guild_name, username) VALUES ($1, $2, $3, $4, $5) ON CONFLICT (guild_id, user_id) DO UPDATE SET level = $3, username = $5"
         await self.pool.execute(
-            query,
-            str(member.guild.id),
-            str(member.id),
+            queries.LAST_NOTIFIED_UPSERT,
+            member.guild.id,
+            member.id,
             new_level,
             member.guild.name,
             member.name,
@@ -211,16 +216,16 @@ class LevelManager:
         self, member: discord.Member, new_level: int
     ) -> int | None:
         roles = await self.pool.fetch(
-            "SELECT role_id, level FROM public.level_roles WHERE guild_id = $1 ORDER BY level DESC",
-            str(member.guild.id),
+            queries.LEVEL_ROLES_BY_LEVEL,
+            member.guild.id,
         )
         if not roles:
             return None
 
         target_role_id = next(
-            (int(r["role_id"]) for r in roles if new_level >= r["level"]), None
+            (r["role_id"] for r in roles if new_level >= r["level"]), None
         )
-        all_level_role_ids = {int(r["role_id"]) for r in roles}
+        all_level_role_ids = {r["role_id"] for r in roles}
         current_user_role_ids = {r.id for r in member.roles}
 
         roles_to_add_ids = (
@@ -265,11 +270,11 @@ class LevelManager:
         roles_removed, users_affected = 0, 0
 
         reward_roles = await self.pool.fetch(
-            "SELECT role_id FROM public.level_roles WHERE guild_id = $1", str(guild.id)
+            queries.LEVEL_ROLE_IDS, guild.id
         )
         if reward_roles:
-            reward_role_ids = {int(r["role_id"]) for r in reward_roles}
-            for member in guild.members:
+            reward_role_ids = {r["role_id"] for r in reward_roles}
+            for member in await member_cache.all_members(guild):
                 if member.bot:
                     continue
                 roles_to_strip = [r for r in member.roles if r.id in reward_role_ids]
@@ -284,12 +289,12 @@ class LevelManager:
                         )
 
         await self.pool.execute(
-            "UPDATE public.users SET xp = 0, level = 0, voice_xp_earned = 0 WHERE guild_id = $1",
-            str(guild.id),
+            queries.USER_RESET_GUILD,
+            guild.id,
         )
         await self.pool.execute(
-            "UPDATE public.last_notified_level SET level = 0 WHERE guild_id = $1",
-            str(guild.id),
+            queries.LAST_NOTIFIED_RESET_GUILD,
+            guild.id,
         )
 
         for key in [k for k in self.user_cache if k[0] == guild.id]:
@@ -298,20 +303,21 @@ class LevelManager:
 
     async def check_and_run_auto_reset(self):
         now_utc = datetime.now(timezone.utc)
-        configs = await self.pool.fetch("SELECT * FROM public.auto_reset")
+        configs = await self.pool.fetch(queries.AUTO_RESET_ALL)
         for row in configs:
             if (now_utc - row["last_reset"]).days >= row["days"]:
-                if guild := self.bot.get_guild(int(row["guild_id"])):
+                if guild := self.bot.get_guild(row["guild_id"]):
                     log.info(
                         f"Auto-reset triggered for guild {guild.name} ({guild.id})"
                     )
                     await self._perform_full_reset(guild)
                     await self.pool.execute(
-                        "UPDATE public.auto_reset SET last_reset = NOW() WHERE guild_id = $1",
-                        str(guild.id),
+                        queries.AUTO_RESET_MARK_DONE,
+                        guild.id,
                     )
 
     @tasks.loop(hours=1)
+    @metrics.timed_loop("reset_loop")
     async def reset_loop(self):
         await self.check_and_run_auto_reset()
 
@@ -330,7 +336,7 @@ class LevelManager:
             interaction: discord.Interaction, member: discord.Member = None
         ):
             target = member or interaction.user
-            user_data = await self.get_user(interaction.guild.id, target.id)
+            user_data = await self.get_user(interaction.guild.id, target.id, target.name)
             embed = discord.Embed(
                 title=f"📊 Level Info for {target.display_name}", color=0x3498DB
             )
@@ -351,8 +357,8 @@ class LevelManager:
         async def leaderboard(interaction: discord.Interaction):
             await interaction.response.defer()
             data = await self.pool.fetch(
-                "SELECT * FROM public.users WHERE guild_id = $1 ORDER BY xp DESC LIMIT 10",
-                str(interaction.guild.id),
+                queries.USER_LEADERBOARD,
+                interaction.guild.id,
             )
             embed = discord.Embed(
                 title=f"🏆 Leaderboard - {interaction.guild.name}", color=0xF1C40F
@@ -360,13 +366,15 @@ class LevelManager:
             if not data:
                 embed.description = "No one has earned any XP yet!"
             for i, row in enumerate(data, 1):
-                try:
-                    user_obj = interaction.guild.get_member(
-                        int(row["user_id"])
-                    ) or await self.bot.fetch_user(int(row["user_id"]))
-                    name = user_obj.display_name
-                except discord.NotFound:
-                    name = row.get("username", "Unknown User")
+                # Cached members show their server nickname; otherwise the
+                # stored username saves a REST call per row.
+                member = interaction.guild.get_member(row["user_id"])
+                name = member.display_name if member else row.get("username")
+                if not name or name == "Unknown User":
+                    try:
+                        name = (await self.bot.fetch_user(row["user_id"])).display_name
+                    except discord.NotFound:
+                        name = "Unknown User"
                 embed.add_field(
                     name=f"#{i} {name}",
                     value=f"Lvl {row['level']} ({row['xp']} XP)",
@@ -383,12 +391,11 @@ class LevelManager:
             interaction: discord.Interaction, level: int, role: discord.Role
         ):
             await interaction.response.defer(ephemeral=True)
-            query = "INSERT INTO public.level_roles (guild_id, level, role_id, guild_name, role_name) VALUES ($1, $2, $3, $4, $5) ON CONFLICT (guild_id, level) DO UPDATE SET role_id = $3, role_name = $5"
             await self.pool.execute(
-                query,
-                str(interaction.guild.id),
+                queries.LEVEL_ROLE_UPSERT,
+                interaction.guild.id,
                 level,
-                str(role.id),
+                role.id,
                 interaction.guild.name,
                 role.name,
             )
@@ -405,8 +412,8 @@ class LevelManager:
         async def level_reward_show(interaction: discord.Interaction):
             await interaction.response.defer(ephemeral=True)
             rewards = await self.pool.fetch(
-                "SELECT level, role_id, role_name FROM public.level_roles WHERE guild_id = $1 ORDER BY level DESC",
-                str(interaction.guild.id),
+                queries.LEVEL_ROLES_SHOW,
+                interaction.guild.id,
             )
             if not rewards:
                 await interaction.followup.send(
@@ -417,7 +424,7 @@ class LevelManager:
 
             description = "Here are the role rewards for reaching specific levels:\n"
             for row in rewards:
-                role = interaction.guild.get_role(int(row["role_id"]))
+                role = interaction.guild.get_role(row["role_id"])
                 #description += f"\n**Level {row['level']}** → {role.mention if role else f"`{row['role_name']}` (Deleted)"}"
                 level_info = f"\n**Level {row['level']}** → "
                 if role:
@@ -442,11 +449,10 @@ class LevelManager:
             interaction: discord.Interaction, channel: discord.TextChannel
         ):
             await interaction.response.defer(ephemeral=True)
-            query = "INSERT INTO public.level_notify_channel (guild_id, channel_id, guild_name, channel_name) VALUES ($1, $2, $3, $4) ON CONFLICT (guild_id) DO UPDATE SET channel_id = $2, channel_name = $4"
             await self.pool.execute(
-                query,
-                str(interaction.guild.id),
-                str(channel.id),
+                queries.LEVEL_NOTIFY_CHANNEL_UPSERT,
+                interaction.guild.id,
+                channel.id,
                 interaction.guild.name,
                 channel.name,
             )
@@ -464,9 +470,8 @@ class LevelManager:
             interaction: discord.Interaction, days: app_commands.Range[int, 1, 365]
         ):
             await interaction.response.defer(ephemeral=True)
-            query = "INSERT INTO public.auto_reset (guild_id, days, last_reset, guild_name) VALUES ($1, $2, NOW(), $3) ON CONFLICT (guild_id) DO UPDATE SET days = $2, last_reset = NOW()"
             await self.pool.execute(
-                query, str(interaction.guild.id), days, interaction.guild.name
+                queries.AUTO_RESET_UPSERT, interaction.guild.id, days, interaction.guild.name
             )
             next_reset = discord.utils.format_dt(
                 datetime.now(timezone.utc) + timedelta(days=days), "F"
@@ -484,8 +489,8 @@ class LevelManager:
         async def show_auto_reset(interaction: discord.Interaction):
             await interaction.response.defer(ephemeral=True)
             config = await self.pool.fetchrow(
-                "SELECT * FROM public.auto_reset WHERE guild_id = $1",
-                str(interaction.guild.id),
+                queries.AUTO_RESET_GET,
+                interaction.guild.id,
             )
             if not config:
                 await interaction.followup.send(
@@ -517,8 +522,8 @@ class LevelManager:
         async def stop_auto_reset(interaction: discord.Interaction):
             await interaction.response.defer(ephemeral=True)
             result = await self.pool.execute(
-                "DELETE FROM public.auto_reset WHERE guild_id = $1",
-                str(interaction.guild.id),
+                queries.AUTO_RESET_DELETE,
+                interaction.guild.id,
             )
             if result == "DELETE 1":
                 await interaction.followup.send(
@@ -551,8 +556,8 @@ class LevelManager:
         async def upgrade_all_roles(interaction: discord.Interaction):
             await interaction.response.defer(thinking=True, ephemeral=True)
             users_data = await self.pool.fetch(
-                "SELECT user_id, level FROM public.users WHERE guild_id = $1",
-                str(interaction.guild.id),
+                queries.USER_LEVELS,
+                interaction.guild.id,
             )
             if not users_data:
                 await interaction.followup.send(
@@ -560,9 +565,13 @@ class LevelManager:
                 )
                 return
 
+            members = {
+                member.id: member
+                for member in await member_cache.all_members(interaction.guild)
+            }
             changed_count = 0
             for user in users_data:
-                member = interaction.guild.get_member(int(user["user_id"]))
+                member = members.get(user["user_id"])
                 if member:
                     if await self.upgrade_user_roles(member, user["level"]):
                         changed_count += 1
@@ -7,6 +7,8 @@ import re
 import asyncio
 import asyncpg
 import logging
+import member_cache
+import queries
 
 log = logging.getLogger(__name__)
 
@@ -37,70 +39,69 @@ class NoTextManager:
 
         async with self.pool.acquire() as conn:
             bypass_roles = await conn.fetch(
-                "SELECT role_id FROM public.bypass_roles WHERE guild_id = $1",
-                str(member.guild.id),
+                queries.BYPASS_ROLE_IDS,
+                member.guild.id,
             )
 
         if not bypass_roles:
             return False
 
-        bypass_role_ids = {int(r["role_id"]) for r in bypass_roles}
+        bypass_role_ids = {r["role_id"] for r in bypass_roles}
         member_role_ids = {r.id for r in member.roles}
 
         return not bypass_role_ids.isdisjoint(member_role_ids)
 
     async def on_message(self, message: discord.Message):
         """The core message handler that enforces all channel restrictions."""
-        if (
-            message.author.bot
-            or not message.guild
-            or await self.is_bypass(message.author)
-        ):
+        if message.author.bot or not message.guild:
             return
 
-        guild_id = str(message.guild.id)
-        channel_id = str(message.channel.id)
+        guild_id = message.guild.id
+        channel_id = message.channel.id
 
         async with self.pool.acquire() as conn:
             is_no_links = await conn.fetchval(
-                "SELECT 1 FROM public.no_links_channels WHERE guild_id = $1 AND channel_id = $2",
+                queries.NO_LINKS_CHECK,
                 guild_id,
                 channel_id,
             )
             is_no_discord_links = await conn.fetchval(
-                "SELECT 1 FROM public.no_discord_links_channels WHERE guild_id = $1 AND channel_id = $2",
+                queries.NO_DISCORD_LINKS_CHECK,
                 guild_id,
                 channel_id,
             )
             no_text_config = await conn.fetchrow(
-                "SELECT redirect_channel_id FROM public.no_text_channels WHERE guild_id = $1 AND channel_id = $2",
+                queries.NO_TEXT_GET,
                 guild_id,
                 channel_id,
             )
 
-        try:
-            # 1. Check for "No Links" (most restrictive)
-            if is_no_links and self.url_pattern.search(message.content):
-                await message.delete()
-                return
+        # 1. "No Links" (most restrictive), 2. "No Discord Links", 3. "Media-Only"
+        is_media = (
+            message.attachments
+            or self.url_pattern.search(message.content)
+            or message.embeds
+        )
+        if is_no_links and self.url_pattern.search(message.content):
+            rule = "no_links"
+        elif is_no_discord_links and self.discord_link_pattern.search(message.content):
+            rule = "no_discord_links"
+        elif no_text_config and not is_media:
+            rule = "no_text"
+        else:
+            return
 
-            # 2. Check for "No Discord Links"
-            if is_no_discord_links and self.discord_link_pattern.search(
-                message.content
-            ):
-                await message.delete()
+        try:
+            # The bypass check (and, without a member cache, the member
+            # lookup it needs) only runs for messages that break a rule.
+            member = await member_cache.resolve_member(message.guild, message.author)
+            if member is not None and await self.is_bypass(member):
                 return
 
-            # 3. Check for "Media-Only" (No Text)
-            is_media = (
-                message.attachments
-                or self.url_pattern.search(message.content)
-                or message.embeds
-            )
-            if no_text_config and not is_media:
-                await message.delete()
+            await message.delete()
+            if rule == "no_text":
                 redirect_channel = self.bot.get_channel(
-                    int(no_text_config["redirect_channel_id"])
+                    no_text_config["redirect_channel_id"]
                 )
                 if redirect_channel:
                     warn_msg = await message.channel.send(
@@ -108,7 +109,6 @@ class NoTextManager:
                     )
                     await asyncio.sleep(15)
                     await warn_msg.delete()
-                return
 
         except discord.Forbidden:
             log.warning(
@@ -133,14 +133,13 @@ class NoTextManager:
             redirect_channel: discord.TextChannel,
         ):
             await interaction.response.defer(ephemeral=True)
-            query = "INSERT INTO public.no_text_channels (guild_id, channel_id, guild_name, channel_name, redirect_channel_id) VALUES ($1, $2, $3, $4, $5) ON CONFLICT (guild_id, channel_id) DO UPDATE SET redirect_channel_id = $5"
             await self.pool.execute(
-                query,
-                str(interaction.guild.id),
-                str(channel.id),
+                queries.NO_TEXT_UPSERT,
+                interaction.guild.id,
+                channel.id,
                 interaction.guild.name,
                 channel.name,
-                str(redirect_channel.id),
+                redirect_channel.id,
             )
             await interaction.followup.send(
                 f"✅ Media-only rule has been set for {channel.mention}. Text-only messages will be redirected to {redirect_channel.mention}.",
@@ -157,9 +156,9 @@ class NoTextManager:
         ):
             await interaction.response.defer(ephemeral=True)
             result = await self.pool.execute(
-                "DELETE FROM public.no_text_channels WHERE guild_id = $1 AND channel_id = $2",
-                str(interaction.guild.id),
-                str(channel.id),
+                queries.NO_TEXT_DELETE,
+                interaction.guild.id,
+                channel.id,
             )
             if result == "DELETE 1":
                 await interaction.followup.send(
@@ -180,11 +179,10 @@ class NoTextManager:
         @app_commands.checks.has_permissions(manage_roles=True)
         async def bypass_no_text(interaction: discord.Interaction, role: discord.Role):
             await interaction.response.defer(ephemeral=True)
-            query = "INSERT INTO public.bypass_roles (guild_id, role_id, guild_name, role_name) VALUES ($1, $2, $3, $4) ON CONFLICT (guild_id, role_id) DO NOTHING"
             await self.pool.execute(
-                query,
-                str(interaction.guild.id),
-                str(role.id),
+                queries.BYPASS_ROLE_ADD,
+                interaction.guild.id,
+                role.id,
                 interaction.guild.name,
                 role.name,
             )
@@ -202,8 +200,8 @@ class NoTextManager:
         async def show_bypass_roles(interaction: discord.Interaction):
             await interaction.response.defer(ephemeral=True)
             roles = await self.pool.fetch(
-                "SELECT role_id, role_name FROM public.bypass_roles WHERE guild_id = $1",
-                str(interaction.guild.id),
+                queries.BYPASS_ROLES_SHOW,
+                interaction.guild.id,
             )
             if not roles:
                 await interaction.followup.send(
@@ -215,10 +213,10 @@ class NoTextManager:
                 "Users with these roles can ignore all channel message restrictions:\n"
             )
             for record in roles:
-                role = interaction.guild.get_role(int(record["role_id"]))
+                role = interaction.guild.get_role(record["role_id"])
                 #description += f"\n• {role.mention if role else f"`{record['role_name']}` (Deleted Role)"}"
                 for record in roles:
-                    role = interaction.guild.get_role(int(record["role_id"]))
+                    role = interaction.guild.get_role(record["role_id"])
                     if role:
                         description += f"\n• {role.mention}"
                     else:
@@ -242,9 +240,9 @@ class NoTextManager:
         ):
             await interaction.response.defer(ephemeral=True)
             result = await self.pool.execute(
-                "DELETE FROM public.bypass_roles WHERE guild_id = $1 AND role_id = $2",
-                str(interaction.guild.id),
-                str(role.id),
+                queries.BYPASS_ROLE_DELETE,
+                interaction.guild.id,
+                role.id,
             )
             if result == "DELETE 1":
                 await interaction.followup.send(
@@ -267,11 +265,10 @@ class NoTextManager:
             interaction: discord.Interaction, channel: discord.TextChannel
         ):
             await interaction.response.defer(ephemeral=True)
-            query = "INSERT INTO public.no_discord_links_channels (guild_id, channel_id, guild_name, channel_name) VALUES ($1, $2, $3, $4) ON CONFLICT (guild_id, channel_id) DO NOTHING"
             await self.pool.execute(
-                query,
-                str(interaction.guild.id),
-                str(channel.id),
+                queries.NO_DISCORD_LINKS_ADD,
+                interaction.guild.id,
+                channel.id,
                 interaction.guild.name,
                 channel.name,
             )
@@ -289,11 +286,10 @@ class NoTextManager:
             interaction: discord.Interaction, channel: discord.TextChannel
         ):
             await interaction.response.defer(ephemeral=True)
-            query = "INSERT INTO public.no_links_channels (guild_id, channel_id, guild_name, channel_name) VALUES ($1, $2, $3, $4) ON CONFLICT (guild_id, channel_id) DO NOTHING"
             await self.pool.execute(
-                query,
-                str(interaction.guild.id),
-                str(channel.id),
+                queries.NO_LINKS_ADD,
+                interaction.guild.id,
+                channel.id,
                 interaction.guild.name,
                 channel.name,
             )
@@ -313,9 +309,9 @@ class NoTextManager:
         ):
             await interaction.response.defer(ephemeral=True)
             result = await self.pool.execute(
-                "DELETE FROM public.no_discord_links_channels WHERE guild_id = $1 AND channel_id = $2",
-                str(interaction.guild.id),
-                str(channel.id),
+                queries.NO_DISCORD_LINKS_DELETE,
+                interaction.guild.id,
+                channel.id,
             )
             if result == "DELETE 1":
                 await interaction.followup.send(
@@ -339,9 +335,9 @@ class NoTextManager:
         ):
             await interaction.response.defer(ephemeral=True)
             result = await self.pool.execute(
-                "DELETE FROM public.no_links_channels WHERE guild_id = $1 AND channel_id = $2",
-                str(interaction.guild.id),
-                str(channel.id),
+                queries.NO_LINKS_DELETE,
+                interaction.guild.id,
+                channel.id,
             )
             if result == "DELETE 1":
                 await interaction.followup.send(
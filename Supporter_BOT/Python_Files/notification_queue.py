@@ -0,0 +1,92 @@
+# Python_Files/notification_queue.py
+
+import discord
+import asyncio
+import aiohttp
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class NotificationQueue:
+    """
+    Delivers outgoing messages with one worker per destination channel.
+
+    Discord rate-limits message sends per channel, so messages for the same
+    channel are sent one after another (discord.py waits out that channel's
+    bucket), while different channels are served in parallel. Workers exit
+    after being idle for a while and are recreated on demand.
+    """
+
+    def __init__(self, max_retries: int = 3, idle_timeout: float = 60):
+        self.max_retries = max_retries
+        self.idle_timeout = idle_timeout
+        self.queues = {}  # channel_id -> asyncio.Queue
+        self.workers = {}  # channel_id -> asyncio.Task
+
+    def enqueue(self, channel: discord.abc.Messageable, content: str, label: str = ""):
+        """Queues a message for a channel and makes sure a worker is running for it."""
+        if channel.id not in self.queues:
+            self.queues[channel.id] = asyncio.Queue()
+            self.workers[channel.id] = asyncio.create_task(self._worker(channel.id))
+        self.queues[channel.id].put_nowait((channel, content, label))
+
+    def depth(self) -> int:
+        """Total number of messages waiting across all channels."""
+        return sum(queue.qsize() for queue in self.queues.values())
+
+    async def close(self):
+        for worker in list(self.workers.values()):
+            worker.cancel()
+        await asyncio.gather(*self.workers.values(), return_exceptions=True)
+
+    async def _worker(self, channel_id: int):
+        queue = self.queues[channel_id]
+        try:
+            while True:
+                try:
+                    channel, content, label = await asyncio.wait_for(
+                        queue.get(), timeout=self.idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    break
+                await self._deliver(channel, content, label)
+        finally:
+            # No await between the idle timeout and here, so nothing can be
+            # enqueued onto a queue that is being torn down.
+            del self.queues[channel_id]
+            del self.workers[channel_id]
+
+    async def _deliver(self, channel, content: str, label: str):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await channel.send(content)
+                log.info(f"✅ Sent {label or 'message'} to channel {channel.id}")
+                return
+            except discord.Forbidden:
+                log.warning(
+                    f"Missing permissions to send {label or 'message'} in channel {channel.id}"
+                )
+                return
+            except discord.NotFound:
+                log.warning(f"Channel {channel.id} no longer exists; dropping {label or 'message'}.")
+                return
+            except (discord.HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # 429s are already waited out by discord.py; what is left here
+                # are 5xx responses and network errors, which are worth a retry.
+                if isinstance(e, discord.HTTPException) and e.status < 500:
+                    log.error(f"Failed to send {label or 'message'} to channel {channel.id}: {e}")
+                    return
+                if attempt == self.max_retries:
+                    log.error(
+                        f"Giving up on {label or 'message'} for channel {channel.id} after {attempt} attempts: {e}"
+                    )
+                    return
+                delay = 2**attempt
+                log.warning(
+                    f"Transient error sending {label or 'message'} to channel {channel.id} (attempt {attempt}), retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+            except Exception as e:
+                log.error(f"Failed to send {label or 'message'} to channel {channel.id}: {e}")
+                return
@@ -5,28 +5,226 @@ from discord import app_commands
 from discord.ext import commands
 from datetime import datetime, timezone
 import asyncpg
+import asyncio
 import logging
+from guild_index import GuildIndex, GuildListView, GuildSummary
+from shard_bridge import chunked
+import queries
+import sharding
 
 log = logging.getLogger(__name__)
 
+# --- Shard Process Configuration ---
+# With several shard processes, /g3 lists the guilds of every process,
+# /g4 and /g5 leave a guild from the process that runs it, and /g5 and /g6
+# update every process's ban list, over the shard bridge (shard_bridge.py)
+# on these channels.
+GUILD_LIST_CHANNEL = "owner_guild_list"
+LEAVE_GUILD_CHANNEL = "owner_leave_guild"
+BAN_CHANGED_CHANNEL = "owner_ban_changed"
+SHARD_REPLY_TIMEOUT = 5  # seconds to wait for the other processes' answers
+
+
 class OwnerActionsManager:
     """Manages owner-exclusive actions like leaving or banning guilds."""
 
     def __init__(self, bot: commands.Bot, pool: asyncpg.Pool):
         self.bot = bot
         self.pool = pool
+        self.banned_guilds = set()  # guild IDs (int), loaded at startup
+        self.swept = False
+        self.guild_index = GuildIndex()
         log.info("Owner Actions system has been initialized.")
 
-    async def is_guild_banned(self, guild_id: int) -> bool:
-        """Checks if a guild ID is in the banned_guilds table."""
+    async def start(self):
+        """Loads the ban list and schedules the sweep of already-joined guilds."""
+        rows = await self.pool.fetch(queries.BANNED_GUILDS_ALL)
+        self.banned_guilds = {row["guild_id"] for row in rows}
+        log.info(f"Loaded {len(self.banned_guilds)} banned guild(s).")
+        self.bot.add_listener(self.on_ready, "on_ready")
+        self.bot.add_listener(self.on_guild_join, "on_guild_join")
+        self.bot.add_listener(self.on_guild_remove, "on_guild_remove")
+        self.bot.add_listener(self.on_guild_update, "on_guild_update")
+        if sharding.SHARD_COUNT:
+            self.bot.shard_bridge.on(GUILD_LIST_CHANNEL, self.on_guild_list_request)
+            self.bot.shard_bridge.on(LEAVE_GUILD_CHANNEL, self.on_leave_request)
+            self.bot.shard_bridge.on(BAN_CHANGED_CHANNEL, self.on_ban_changed)
+
+    def is_guild_banned(self, guild_id: int) -> bool:
+        """Checks if a guild ID is on the ban list."""
+        return guild_id in self.banned_guilds
+
+    async def check_guild_banned(self, guild_id: int) -> bool:
+        """
+        Like is_guild_banned, but asks the database when the in-memory list
+        says no, so a ban this process missed (added in the database or while
+        its shard bridge was reconnecting) still counts when a guild joins.
+        """
+        if guild_id in self.banned_guilds:
+            return True
+        if await self.pool.fetch(queries.BANNED_GUILDS_AMONG, [guild_id]):
+            self.banned_guilds.add(guild_id)
+            return True
+        return False
+
+    async def set_guild_banned(self, guild_id: int, banned: bool):
+        """Updates the ban list of this process and, when sharded, of every other one."""
+        if banned:
+            self.banned_guilds.add(guild_id)
+        else:
+            self.banned_guilds.discard(guild_id)
+        if sharding.SHARD_COUNT:
+            await self.bot.shard_bridge.notify(
+                BAN_CHANGED_CHANNEL, {"guild_id": guild_id, "banned": banned}
+            )
+
+    async def on_ready(self):
+        self.guild_index.rebuild(self.bot.guilds)
+        if self.swept:
+            return  # on_ready also fires after reconnects
+        self.swept = True
+        await self.sweep_banned_guilds()
+
+    # --- Guild Index ---
+
+    async def on_guild_join(self, guild: discord.Guild):
+        self.guild_index.add(guild)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.guild_index.remove(guild.id)
+
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
+        if before.name != after.name:
+            self.guild_index.add(after)
+
+    async def sweep_banned_guilds(self):
+        """Leaves every banned guild the bot is already in (e.g. banned while offline)."""
+        guild_ids = [guild.id for guild in self.bot.guilds]
+        try:
+            # One round trip for all current guilds, which also picks up bans
+            # added directly in the database since startup.
+            rows = await self.pool.fetch(
+                queries.BANNED_GUILDS_AMONG,
+                guild_ids,
+            )
+        except Exception as e:
+            log.error(f"Error sweeping banned guilds: {e}")
+            return
+
+        banned = [self.bot.get_guild(row["guild_id"]) for row in rows]
+        banned = [guild for guild in banned if guild]
+        self.banned_guilds.update(guild.id for guild in banned)
+        if not banned:
+            log.info(f"🧹 Ban sweep: none of {len(guild_ids)} server(s) are banned.")
+            return
+
+        await asyncio.gather(*(self.leave_banned_guild(guild) for guild in banned))
+        log.warning(f"🧹 Ban sweep: left {len(banned)} banned server(s).")
+
+    async def leave_banned_guild(self, guild: discord.Guild):
+        log.warning(f"🚫 Bot is in banned server {guild.name} ({guild.id}). Leaving immediately.")
+        try:
+            if guild.owner:
+                await guild.owner.send(
+                    "This bot is not permitted in this server and has been removed."
+                )
+        except discord.HTTPException:
+            log.warning("Could not notify server owner about the ban.")
         try:
-            query = "SELECT 1 FROM public.banned_guilds WHERE guild_id = $1"
-            # fetchval returns the value of the first column of the first row, or None.
-            is_banned = await self.pool.fetchval(query, str(guild_id))
-            return is_banned is not None
+            await guild.leave()
         except Exception as e:
-            log.error(f"Error checking if guild {guild_id} is banned: {e}")
-            return False  # Fail safe: if DB check fails, don't assume it's banned.
+            log.error(f"Error leaving banned server {guild.id}: {e}")
+
+    # --- Shard Processes ---
+
+    async def leave_guild(self, guild_id: int) -> dict:
+        """Leaves a guild this process runs; `left` is False if the bot is not in it."""
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return {"left": False, "name": None}
+        await guild.leave()
+        return {"left": True, "name": guild.name}
+
+    async def leave_guild_anywhere(self, guild_id: int):
+        """Leaves a guild from whichever shard process runs it; None if that process doesn't answer."""
+        if not sharding.SHARD_COUNT:
+            return await self.leave_guild(guild_id)
+        replies = await self.bot.shard_bridge.request(
+            LEAVE_GUILD_CHANNEL, {"guild_id": guild_id}, SHARD_REPLY_TIMEOUT
+        )
+        return replies[0] if replies else None
+
+    async def list_guilds(self, name_prefix: str, min_members: int, max_members: int) -> tuple:
+        """
+        Returns (index, matching guild IDs, total guild count, shards that did
+        not answer) over every shard process.
+        """
+        if not sharding.SHARD_COUNT:
+            guild_ids = self.guild_index.select(name_prefix, min_members, max_members)
+            return self.guild_index, guild_ids, len(self.guild_index), []
+
+        all_shards = set(range(sharding.SHARD_COUNT))
+
+        def answered(replies: list) -> dict:
+            by_process = {}
+            for reply in replies:
+                by_process.setdefault(tuple(reply["shards"]), []).append(reply)
+            return by_process
+
+        def done(replies: list) -> bool:
+            by_process = answered(replies)
+            covered = {shard for shards in by_process for shard in shards}
+            return covered >= all_shards and all(
+                len(parts) == parts[0]["parts"] for parts in by_process.values()
+            )
+
+        replies = await self.bot.shard_bridge.request(
+            GUILD_LIST_CHANNEL,
+            {"name_prefix": name_prefix, "min_members": min_members, "max_members": max_members},
+            SHARD_REPLY_TIMEOUT,
+            done,
+        )
+        by_process = answered(replies)
+        index = GuildIndex()
+        index.rebuild(
+            GuildSummary(*guild) for reply in replies for guild in reply["guilds"]
+        )
+        total = sum(parts[0]["total"] for parts in by_process.values())
+        missing = sorted(all_shards - {shard for shards in by_process for shard in shards})
+        return index, index.select(), total, missing
+
+    async def on_guild_list_request(self, payload: dict) -> list:
+        """Shard bridge handler: this process's guilds that match a /g3 filter."""
+        guild_ids = self.guild_index.select(
+            payload["name_prefix"], payload["min_members"], payload["max_members"]
+        )
+        guilds = [
+            [guild.id, guild.name, guild.member_count or 0]
+            for guild in map(self.guild_index.get, guild_ids)
+        ]
+        return chunked(
+            guilds, "guilds", {"shards": sharding.SHARD_IDS, "total": len(self.guild_index)}
+        )
+
+    async def on_leave_request(self, payload: dict):
+        """Shard bridge handler: /g4 or /g5 for a guild, answered by the process that runs it."""
+        if not sharding.owns_guild(payload["guild_id"]):
+            return None
+        try:
+            return [await self.leave_guild(payload["guild_id"])]
+        except Exception as e:
+            log.error(f"Error leaving server {payload['guild_id']}: {e}")
+            return [{"left": False, "name": None, "error": str(e)}]
+
+    async def on_ban_changed(self, payload: dict):
+        """Shard bridge handler: /g5 or /g6 ran in some process; leaves the guild if it is still here."""
+        guild_id = payload["guild_id"]
+        if not payload["banned"]:
+            self.banned_guilds.discard(guild_id)
+            return
+        self.banned_guilds.add(guild_id)
+        if guild := self.bot.get_guild(guild_id):
+            await self.leave_banned_guild(guild)
 
     def register_commands(self):
         """Registers all owner-only slash commands."""
@@ -40,19 +238,36 @@ class OwnerActionsManager:
             description="Lists all servers the bot is in (Bot Owner only).",
         )
         @app_commands.check(is_bot_owner)
-        async def serverlist(interaction: discord.Interaction):
+        @app_commands.describe(
+            name_prefix="Only show servers whose name starts with this.",
+            min_members="Only show servers with at least this many members.",
+            max_members="Only show servers with at most this many members.",
+        )
+        async def serverlist(
+            interaction: discord.Interaction,
+            name_prefix: str = None,
+            min_members: app_commands.Range[int, 0] = None,
+            max_members: app_commands.Range[int, 0] = None,
+        ):
             await interaction.response.defer(ephemeral=True)
 
-            description = ""
-            for guild in sorted(self.bot.guilds, key=lambda g: g.name):
-                description += f"- **{guild.name}** (ID: `{guild.id}`)\n"
+            index, guild_ids, total, missing = await self.list_guilds(
+                name_prefix, min_members, max_members
+            )
+            title = f"🔎 Bot is in {total} Servers"
+            if name_prefix or min_members is not None or max_members is not None:
+                title += f" ({len(guild_ids)} matching)"
+            warning = (
+                f"⚠️ No answer from the process running shard(s) {', '.join(map(str, missing))}; "
+                f"their servers are not listed."
+                if missing
+                else None
+            )
 
-            embed = discord.Embed(
-                title=f"🔎 Bot is in {len(self.bot.guilds)} Servers",
-                description=description,
-                color=discord.Color.blurple(),
+            view = GuildListView(index, guild_ids, title, interaction.user.id)
+            view.message = await interaction.followup.send(
+                warning, embed=view.build_embed(), view=view, wait=True
             )
-            await interaction.followup.send(embed=embed)
 
         @self.bot.tree.command(
             name="g4-leaveserver",
@@ -63,17 +278,23 @@ class OwnerActionsManager:
         async def leaveserver(interaction: discord.Interaction, guild_id: str):
             await interaction.response.defer(ephemeral=True)
             try:
-                guild = self.bot.get_guild(int(guild_id))
-                if not guild:
+                result = await self.leave_guild_anywhere(int(guild_id))
+                if result is None:
+                    await interaction.followup.send(
+                        "❌ The shard process that runs this server did not answer. Please try again later."
+                    )
+                    return
+                if result.get("error"):
+                    raise RuntimeError(result["error"])
+                if not result["left"]:
                     await interaction.followup.send(
                         f"❌ I am not a member of a server with the ID `{guild_id}`."
                     )
                     return
 
-                await guild.leave()
-                log.info(f"Owner forced bot to leave server: {guild.name} ({guild.id})")
+                log.info(f"Owner forced bot to leave server: {result['name']} ({guild_id})")
                 await interaction.followup.send(
-                    f"✅ Successfully left the server: **{guild.name}** (`{guild.id}`)."
+                    f"✅ Successfully left the server: **{result['name']}** (`{guild_id}`)."
                 )
             except ValueError:
                 await interaction.followup.send(
@@ -95,24 +316,27 @@ class OwnerActionsManager:
             await interaction.response.defer(ephemeral=True)
             try:
                 # Use an UPSERT query to add/update the ban record
-                query = """
-                    INSERT INTO public.banned_guilds (guild_id, banned_at, banned_by)
-                    VALUES ($1, NOW(), $2)
-                    ON CONFLICT (guild_id) DO UPDATE SET
-                      banned_at = NOW(),
-                      banned_by = $2;
-                """
-                await self.pool.execute(query, guild_id, str(interaction.user.id))
-
-                # If the bot is currently in the server, leave it.
-                guild = self.bot.get_guild(int(guild_id))
-                if guild:
-                    await guild.leave()
+                guild_id_int = int(guild_id)
+                await self.pool.execute(queries.BANNED_GUILD_UPSERT, guild_id_int, interaction.user.id)
+
+                # If the bot is currently in the server, leave it; then
+                # every process learns about the ban.
+                result = await self.leave_guild_anywhere(guild_id_int)
+                await self.set_guild_banned(guild_id_int, True)
+                if result is None:
+                    log.warning(f"Owner BANNED server ID: {guild_id} (its shard process did not answer)")
+                    await interaction.followup.send(
+                        f"✅ Server ID `{guild_id}` has been added to the ban list, but the shard process "
+                        f"that runs it did not answer. It will leave the server when that process gets the ban or next starts."
+                    )
+                elif result.get("error"):
+                    raise RuntimeError(result["error"])
+                elif result["left"]:
                     log.warning(
-                        f"Owner BANNED and left server: {guild.name} ({guild.id})"
+                        f"Owner BANNED and left server: {result['name']} ({guild_id})"
                     )
                     await interaction.followup.send(
-                        f"✅ Server **{guild.name}** (`{guild_id}`) has been banned and I have left."
+                        f"✅ Server **{result['name']}** (`{guild_id}`) has been banned and I have left."
                     )
                 else:
                     log.warning(
@@ -139,11 +363,17 @@ class OwnerActionsManager:
         @app_commands.describe(guild_id="The ID of the server to unban.")
         async def unbanguild(interaction: discord.Interaction, guild_id: str):
             await interaction.response.defer(ephemeral=True)
+            if not guild_id.isdigit():
+                await interaction.followup.send(
+                    "❌ Invalid Guild ID format. Please provide a numeric ID."
+                )
+                return
             try:
                 # The execute function returns a status string like 'DELETE 1' on success
                 result = await self.pool.execute(
-                    "DELETE FROM public.banned_guilds WHERE guild_id = $1", guild_id
+                    queries.BANNED_GUILD_DELETE, int(guild_id)
                 )
+                await self.set_guild_banned(int(guild_id), False)
 
                 if result == "DELETE 1":
                     log.info(f"Owner UNBANNED server ID: {guild_id}")
@@ -0,0 +1,392 @@
+# Python_Files/queries.py
+
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+# asyncpg's per-connection LRU cache of implicitly prepared statements: each
+# statement is prepared on a connection the first time it runs there and
+# reused after that. Set to 0 behind a transaction-mode pooler (e.g.
+# PgBouncer / Supabase port 6543), which cannot keep prepared statements.
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+
+class Statement(str):
+    """
+    A SQL string with a registry name. InstrumentedPool uses the name as the
+    metrics label and hands asyncpg `sql`, the same text as a plain str:
+    asyncpg's protocol rejects str subclasses.
+    """
+
+    def __new__(cls, name: str, sql: str):
+        sql = " ".join(sql.split())
+        statement = super().__new__(cls, sql)
+        statement.name = name
+        statement.sql = sql
+        return statement
+
+
+STATEMENTS = {}  # name -> Statement
+
+
+def _statement(name: str, sql: str) -> Statement:
+    statement = STATEMENTS[name] = Statement(name, sql)
+    return statement
+
+
+# --- Leveling (level.py) ---
+
+USER_GET = _statement(
+    "level.user_get",
+    "SELECT * FROM public.users WHERE guild_id = $1 AND user_id = $2",
+)
+USER_UPSERT = _statement(
+    "level.user_upsert",
+    """
+    INSERT INTO public.users (guild_id, user_id, guild_name, username) VALUES ($1, $2, $3, $4)
+    ON CONFLICT (guild_id, user_id) DO UPDATE SET guild_name = $3, username = $4
+    """,
+)
+USER_SET_XP = _statement(
+    "level.user_set_xp",
+    "UPDATE public.users SET xp = $3, level = $4, voice_xp_earned = $5 WHERE guild_id = $1 AND user_id = $2",
+)
+USER_LEADERBOARD = _statement(
+    "level.leaderboard",
+    "SELECT * FROM public.users WHERE guild_id = $1 ORDER BY xp DESC LIMIT 10",
+)
+USER_LEVELS = _statement(
+    "level.user_levels",
+    "SELECT user_id, level FROM public.users WHERE guild_id = $1",
+)
+USER_RESET_GUILD = _statement(
+    "level.users_reset",
+    "UPDATE public.users SET xp = 0, level = 0, voice_xp_earned = 0 WHERE guild_id = $1",
+)
+LAST_NOTIFIED_GET = _statement(
+    "level.last_notified_get",
+    "SELECT level FROM public.last_notified_level WHERE guild_id = $1 AND user_id = $2",
+)
+LAST_NOTIFIED_UPSERT = _statement(
+    "level.last_notified_upsert",
+    """
+    INSERT INTO public.last_notified_level (guild_id, user_id, level, guild_name, username) VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (guild_id, user_id) DO UPDATE SET level = $3, username = $5
+    """,
+)
+LAST_NOTIFIED_RESET_GUILD = _statement(
+    "level.last_notified_reset",
+    "UPDATE public.last_notified_level SET level = 0 WHERE guild_id = $1",
+)
+LEVEL_NOTIFY_CHANNEL_GET = _statement(
+    "level.notify_channel_get",
+    "SELECT channel_id FROM public.level_notify_channel WHERE guild_id = $1",
+)
+LEVEL_NOTIFY_CHANNEL_UPSERT = _statement(
+    "level.notify_channel_upsert",
+    """
+    INSERT INTO public.level_notify_channel (guild_id, channel_id, guild_name, channel_name) VALUES ($1, $2, $3, $4)
+    ON CONFLICT (guild_id) DO UPDATE SET channel_id = $2, channel_name = $4
+    """,
+)
+LEVEL_ROLES_BY_LEVEL = _statement(
+    "level.roles_by_level",
+    "SELECT role_id, level FROM public.level_roles WHERE guild_id = $1 ORDER BY level DESC",
+)
+LEVEL_ROLE_IDS = _statement(
+    "level.role_ids",
+    "SELECT role_id FROM public.level_roles WHERE guild_id = $1",
+)
+LEVEL_ROLES_SHOW = _statement(
+    "level.roles_show",
+    "SELECT level, role_id, role_name FROM public.level_roles WHERE guild_id = $1 ORDER BY level DESC",
+)
+LEVEL_ROLE_UPSERT = _statement(
+    "level.role_upsert",
+    """
+    INSERT INTO public.level_roles (guild_id, level, role_id, guild_name, role_name) VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (guild_id, level) DO UPDATE SET role_id = $3, role_name = $5
+    """,
+)
+LEVEL_ROLE_COUNT = _statement(
+    "level.role_count",
+    "SELECT COUNT(*) FROM public.level_roles WHERE guild_id = $1",
+)
+AUTO_RESET_ALL = _statement(
+    "level.auto_reset_all",
+    "SELECT * FROM public.auto_reset",
+)
+AUTO_RESET_GET = _statement(
+    "level.auto_reset_get",
+    "SELECT * FROM public.auto_reset WHERE guild_id = $1",
+)
+AUTO_RESET_DAYS = _statement(
+    "level.auto_reset_days",
+    "SELECT days FROM public.auto_reset WHERE guild_id = $1",
+)
+AUTO_RESET_UPSERT = _statement(
+    "level.auto_reset_upsert",
+    """
+    INSERT INTO public.auto_reset (guild_id, days, last_reset, guild_name) VALUES ($1, $2, NOW(), $3)
+    ON CONFLICT (guild_id) DO UPDATE SET days = $2, last_reset = NOW()
+    """,
+)
+AUTO_RESET_MARK_DONE = _statement(
+    "level.auto_reset_mark_done",
+    "UPDATE public.auto_reset SET last_reset = NOW() WHERE guild_id = $1",
+)
+AUTO_RESET_DELETE = _statement(
+    "level.auto_reset_delete",
+    "DELETE FROM public.auto_reset WHERE guild_id = $1",
+)
+
+# --- Channel Restrictions (no_text.py) ---
+
+BYPASS_ROLE_IDS = _statement(
+    "no_text.bypass_role_ids",
+    "SELECT role_id FROM public.bypass_roles WHERE guild_id = $1",
+)
+BYPASS_ROLES_SHOW = _statement(
+    "no_text.bypass_roles_show",
+    "SELECT role_id, role_name FROM public.bypass_roles WHERE guild_id = $1",
+)
+BYPASS_ROLE_COUNT = _statement(
+    "no_text.bypass_role_count",
+    "SELECT COUNT(*) FROM public.bypass_roles WHERE guild_id = $1",
+)
+BYPASS_ROLE_ADD = _statement(
+    "no_text.bypass_role_add",
+    """
+    INSERT INTO public.bypass_roles (guild_id, role_id, guild_name, role_name) VALUES ($1, $2, $3, $4)
+    ON CONFLICT (guild_id, role_id) DO NOTHING
+    """,
+)
+BYPASS_ROLE_DELETE = _statement(
+    "no_text.bypass_role_delete",
+    "DELETE FROM public.bypass_roles WHERE guild_id = $1 AND role_id = $2",
+)
+NO_LINKS_CHECK = _statement(
+    "no_text.no_links_check",
+    "SELECT 1 FROM public.no_links_channels WHERE guild_id = $1 AND channel_id = $2",
+)
+NO_LINKS_CHANNELS = _statement(
+    "no_text.no_links_channels",
+    "SELECT channel_id FROM public.no_links_channels WHERE guild_id = $1",
+)
+NO_LINKS_ADD = _statement(
+    "no_text.no_links_add",
+    """
+    INSERT INTO public.no_links_channels (guild_id, channel_id, guild_name, channel_name) VALUES ($1, $2, $3, $4)
+    ON CONFLICT (guild_id, channel_id) DO NOTHING
+    """,
+)
+NO_LINKS_DELETE = _statement(
+    "no_text.no_links_delete",
+    "DELETE FROM public.no_links_channels WHERE guild_id = $1 AND channel_id = $2",
+)
+NO_DISCORD_LINKS_CHECK = _statement(
+    "no_text.no_discord_links_check",
+    "SELECT 1 FROM public.no_discord_links_channels WHERE guild_id = $1 AND channel_id = $2",
+)
+NO_DISCORD_LINKS_CHANNELS = _statement(
+    "no_text.no_discord_links_channels",
+    "SELECT channel_id FROM public.no_discord_links_channels WHERE guild_id = $1",
+)
+NO_DISCORD_LINKS_ADD = _statement(
+    "no_text.no_discord_links_add",
+    """
+    INSERT INTO public.no_discord_links_channels (guild_id, channel_id, guild_name, channel_name) VALUES ($1, $2, $3, $4)
+    ON CONFLICT (guild_id, channel_id) DO NOTHING
+    """,
+)
+NO_DISCORD_LINKS_DELETE = _statement(
+    "no_text.no_discord_links_delete",
+    "DELETE FROM public.no_discord_links_channels WHERE guild_id = $1 AND channel_id = $2",
+)
+NO_TEXT_GET = _statement(
+    "no_text.no_text_get",
+    "SELECT redirect_channel_id FROM public.no_text_channels WHERE guild_id = $1 AND channel_id = $2",
+)
+NO_TEXT_CHANNELS = _statement(
+    "no_text.no_text_channels",
+    "SELECT channel_id FROM public.no_text_channels WHERE guild_id = $1",
+)
+NO_TEXT_UPSERT = _statement(
+    "no_text.no_text_upsert",
+    """
+    INSERT INTO public.no_text_channels (guild_id, channel_id, guild_name, channel_name, redirect_channel_id) VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (guild_id, channel_id) DO UPDATE SET redirect_channel_id = $5
+    """,
+)
+NO_TEXT_DELETE = _statement(
+    "no_text.no_text_delete",
+    "DELETE FROM public.no_text_channels WHERE guild_id = $1 AND channel_id = $2",
+)
+
+# --- YouTube Notifications (youtube_notification.py, websub.py) ---
+
+YT_CONFIGS_ENABLED = _statement(
+    "youtube.configs_enabled",
+    "SELECT * FROM public.youtube_notification_config WHERE is_enabled = TRUE",
+)
+YT_CONFIGS_FOR_CHANNEL = _statement(
+    "youtube.configs_for_channel",
+    "SELECT * FROM public.youtube_notification_config WHERE yt_channel_id = $1 AND is_enabled = TRUE",
+)
+YT_ENABLED_CHANNEL_IDS = _statement(
+    "youtube.enabled_channel_ids",
+    "SELECT DISTINCT yt_channel_id FROM public.youtube_notification_config WHERE is_enabled = TRUE",
+)
+YT_CHANNEL_FOLLOWED = _statement(
+    "youtube.channel_followed",
+    "SELECT 1 FROM public.youtube_notification_config WHERE yt_channel_id = $1",
+)
+YT_GUILD_CHANNELS = _statement(
+    "youtube.guild_channels",
+    "SELECT yt_channel_id, yt_channel_name FROM public.youtube_notification_config WHERE guild_id = $1",
+)
+YT_GUILD_TARGETS = _statement(
+    "youtube.guild_targets",
+    "SELECT yt_channel_name, target_channel_id FROM public.youtube_notification_config WHERE guild_id = $1",
+)
+YT_CONFIG_UPSERT = _statement(
+    "youtube.config_upsert",
+    """
+    INSERT INTO public.youtube_notification_config (guild_id, yt_channel_id, target_channel_id, mention_role_id, guild_name, yt_channel_name, target_channel_name, mention_role_name)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+    ON CONFLICT (guild_id, yt_channel_id) DO UPDATE SET
+      target_channel_id = $3, mention_role_id = $4, updated_at = NOW(),
+      yt_channel_name = $6, target_channel_name = $7, mention_role_name = $8
+    """,
+)
+YT_CONFIG_DELETE = _statement(
+    "youtube.config_delete",
+    "DELETE FROM public.youtube_notification_config WHERE guild_id = $1 AND yt_channel_id = $2",
+)
+YT_LOG_LOCK = _statement(
+    "youtube.log_lock",
+    # Held until the end of the transaction; keyed by (guild, channel) so
+    # writers for other channels never wait on each other.
+    "SELECT pg_advisory_xact_lock(hashtext('youtube_notification_logs'), hashtext($1::bigint::text || '/' || $2))",
+)
+YT_LOG_VIDEOS = _statement(
+    "youtube.log_videos",
+    """
+    INSERT INTO public.youtube_notification_logs (guild_id, yt_channel_id, video_id, video_status, notified_at)
+    SELECT $1, $2, v.video_id, 'none', NOW() - make_interval(days => $4)
+    FROM unnest($3::text[]) AS v(video_id)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM public.youtube_notification_logs l
+        WHERE l.guild_id = $1 AND l.yt_channel_id = $2 AND l.video_id = v.video_id
+    )
+    RETURNING video_id
+    """,
+)
+YT_LOG_CONTAINS = _statement(
+    "youtube.log_contains",
+    "SELECT 1 FROM public.youtube_notification_logs WHERE guild_id = $1 AND yt_channel_id = $2 AND video_id = $3",
+)
+YT_LOG_PARTITIONS = _statement(
+    "youtube.log_partitions",
+    """
+    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = 'public.youtube_notification_logs'::regclass
+    """,
+)
+YT_HANDLE_CACHE_GET = _statement(
+    "youtube.handle_cache_get",
+    "SELECT yt_channel_id FROM public.youtube_handle_cache WHERE handle = $1 AND resolved_at > NOW() - make_interval(days => $2)",
+)
+YT_HANDLE_CACHE_PUT = _statement(
+    "youtube.handle_cache_put",
+    """
+    INSERT INTO public.youtube_handle_cache (handle, yt_channel_id, resolved_at)
+    VALUES ($1, $2, NOW())
+    ON CONFLICT (handle) DO UPDATE SET yt_channel_id = $2, resolved_at = NOW()
+    """,
+)
+
+# --- Clock Channels (date_and_time.py) ---
+
+CLOCKS_ALL = _statement(
+    "clocks.all",
+    "SELECT guild_id, channel_id, timezone, name_format FROM public.time_channel_clocks",
+)
+CLOCKS_FOR_GUILD = _statement(
+    "clocks.for_guild",
+    "SELECT channel_id, timezone FROM public.time_channel_clocks WHERE guild_id = $1",
+)
+CLOCK_UPSERT = _statement(
+    "clocks.upsert",
+    """
+    INSERT INTO public.time_channel_clocks (channel_id, guild_id, timezone, name_format, updated_at)
+    VALUES ($1, $2, $3, $4, NOW())
+    ON CONFLICT (channel_id) DO UPDATE SET
+      timezone = EXCLUDED.timezone,
+      name_format = EXCLUDED.name_format,
+      updated_at = NOW()
+    """,
+)
+CLOCK_DELETE = _statement(
+    "clocks.delete",
+    "DELETE FROM public.time_channel_clocks WHERE guild_id = $1 AND channel_id = $2",
+)
+
+# --- Owner Actions (owner_actions.py) ---
+
+BANNED_GUILDS_ALL = _statement(
+    "owner.banned_all",
+    "SELECT guild_id FROM public.banned_guilds",
+)
+BANNED_GUILDS_AMONG = _statement(
+    "owner.banned_among",
+    "SELECT guild_id FROM public.banned_guilds WHERE guild_id = ANY($1::bigint[])",
+)
+BANNED_GUILD_UPSERT = _statement(
+    "owner.ban",
+    """
+    INSERT INTO public.banned_guilds (guild_id, banned_at, banned_by)
+    VALUES ($1, NOW(), $2)
+    ON CONFLICT (guild_id) DO UPDATE SET
+      banned_at = NOW(),
+      banned_by = $2
+    """,
+)
+BANNED_GUILD_DELETE = _statement(
+    "owner.unban",
+    "DELETE FROM public.banned_guilds WHERE guild_id = $1",
+)
+
+# --- Command Sync (command_sync.py) ---
+
+COMMAND_SYNC_HASH_GET = _statement(
+    "command_sync.hash_get",
+    "SELECT tree_hash FROM public.command_sync_state WHERE application_id = $1 AND scope = $2",
+)
+COMMAND_SYNC_HASH_UPSERT = _statement(
+    "command_sync.hash_upsert",
+    """
+    INSERT INTO public.command_sync_state (application_id, scope, tree_hash, synced_at)
+    VALUES ($1, $2, $3, NOW())
+    ON CONFLICT (application_id, scope) DO UPDATE SET
+      tree_hash = EXCLUDED.tree_hash,
+      synced_at = NOW()
+    """,
+)
+
+# --- Shard Processes (shard_bridge.py) ---
+
+SHARD_NOTIFY = _statement(
+    "shard.notify",
+    "SELECT pg_notify($1, $2)",
+)
+
+
+# --- Connection Setup ---
+
+
+def pool_options() -> dict:
+    """Keyword arguments for asyncpg.create_pool."""
+    return {"statement_cache_size": STATEMENT_CACHE_SIZE}
@@ -0,0 +1,174 @@
+# Python_Files/rename_scheduler.py
+
+import discord
+import asyncio
+import time
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows `capacity` actions per `period` seconds, refilling continuously."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def drain(self):
+        """Empties the bucket, e.g. after Discord told us we are rate limited."""
+        self._refill()
+        self.tokens = 0.0
+
+
+class RenameScheduler:
+    """
+    Renames channels without letting one rate-limited guild hold up the rest.
+
+    How it works:
+    - `request()` records the wanted name per channel; a newer request for
+      the same channel replaces the older one, so only the newest is sent
+    - Each channel has a token bucket matching Discord's rename limit
+      (2 per 10 minutes by default); a channel without a token stays
+      pending until a later flush instead of blocking in discord.py
+    - `flush()` works through the pending renames guild by guild, with at
+      most `max_parallel` guilds in flight, and returns a per-flush report;
+      `flush(guild_id=...)` sends only that guild's renames
+    - A channel whose edit is still in flight is skipped by other flushes,
+      so overlapping flushes never rename it twice
+    """
+
+    def __init__(
+        self,
+        renames_per_window: int = 2,
+        window_seconds: float = 600,
+        max_parallel: int = 5,
+        edit_timeout: float = 30,
+    ):
+        self.renames_per_window = renames_per_window
+        self.window_seconds = window_seconds
+        self.max_parallel = max_parallel
+        self.edit_timeout = edit_timeout
+        self.pending = {}  # channel_id -> (channel, name)
+        self.buckets = {}  # channel_id -> TokenBucket
+        self.in_flight = set()  # channel_ids being edited right now
+        self.coalesced = 0
+        self.last_report = None
+
+    def request(self, channel: discord.abc.GuildChannel, name: str):
+        """Queues a rename, replacing any rename still pending for the channel."""
+        if channel.id in self.pending:
+            self.coalesced += 1
+        self.pending[channel.id] = (channel, name)
+
+    def forget(self, channel_id: int):
+        self.pending.pop(channel_id, None)
+        self.buckets.pop(channel_id, None)
+
+    async def flush(self, guild_id: int = None) -> dict:
+        """Sends the pending renames (of one guild, if given) that the channels' buckets allow."""
+        started = time.perf_counter()
+        report = {
+            "renamed": 0,
+            "unchanged": 0,
+            "deferred": 0,
+            "failed": 0,
+            "coalesced": 0,
+            "guilds": 0,
+            "seconds": 0.0,
+        }
+        if guild_id is None:
+            report["coalesced"], self.coalesced = self.coalesced, 0
+
+        by_guild = {}
+        for channel_id, (channel, name) in list(self.pending.items()):
+            if guild_id is None or channel.guild.id == guild_id:
+                by_guild.setdefault(channel.guild.id, []).append(channel_id)
+        report["guilds"] = len(by_guild)
+
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def run_guild(guild_id: int, channel_ids: list):
+            async with semaphore:
+                for channel_id in channel_ids:
+                    await self._rename(channel_id, report)
+
+        await asyncio.gather(
+            *(run_guild(guild_id, channel_ids) for guild_id, channel_ids in by_guild.items())
+        )
+
+        report["seconds"] = time.perf_counter() - started
+        if guild_id is None:
+            self.last_report = report
+        return report
+
+    async def _rename(self, channel_id: int, report: dict):
+        entry = self.pending.get(channel_id)
+        if entry is None or channel_id in self.in_flight:
+            return
+        channel, name = entry
+
+        if channel.name == name:
+            del self.pending[channel_id]
+            report["unchanged"] += 1
+            return
+
+        bucket = self.buckets.get(channel_id)
+        if bucket is None:
+            bucket = self.buckets[channel_id] = TokenBucket(
+                self.renames_per_window, self.window_seconds
+            )
+        if not bucket.try_acquire():
+            report["deferred"] += 1
+            return
+
+        self.in_flight.add(channel_id)
+        try:
+            await asyncio.wait_for(channel.edit(name=name), timeout=self.edit_timeout)
+            report["renamed"] += 1
+        except asyncio.TimeoutError:
+            # discord.py was most likely sleeping out a 429; give the channel a rest.
+            bucket.drain()
+            report["deferred"] += 1
+            log.warning(f"Renaming channel {channel_id} timed out; will retry later.")
+            return
+        except discord.Forbidden:
+            report["failed"] += 1
+            log.warning(
+                f"No permission to rename channel {channel_id} in guild {channel.guild.id}."
+            )
+        except discord.NotFound:
+            report["failed"] += 1
+            self.buckets.pop(channel_id, None)
+        except Exception as e:
+            report["failed"] += 1
+            log.error(f"Error renaming channel {channel_id} in guild {channel.guild.id}: {e}")
+        finally:
+            self.in_flight.discard(channel_id)
+
+        # Only clear the entry if no newer name was requested while we were editing.
+        if self.pending.get(channel_id) == entry:
+            del self.pending[channel_id]
+
+    @staticmethod
+    def format_report(report: dict) -> str:
+        return (
+            f"{report['renamed']} renamed, {report['unchanged']} unchanged, "
+            f"{report['deferred']} deferred, {report['failed']} failed, "
+            f"{report['coalesced']} coalesced across {report['guilds']} guild(s) "
+            f"in {report['seconds']:.2f}s"
+        )
@@ -0,0 +1,54 @@
+# Python_Files/sharding.py
+
+import os
+
+
+def parse_shard_ids(spec: str) -> list:
+    """Parses "0-3", "4,5,6" or "0-1,8" into a sorted list of shard IDs."""
+    shard_ids = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        shard_ids.update(range(int(first), int(last or first) + 1))
+    return sorted(shard_ids)
+
+
+# --- Sharding Configuration ---
+# SHARD_COUNT unset (or 0) runs the classic single-shard bot. With a count,
+# the bot is an AutoShardedBot running SHARD_IDS of SHARD_COUNT shards, so
+# several processes (see run_sharded.py) can split the gateway between them.
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+SHARD_IDS = parse_shard_ids(os.getenv("SHARD_IDS", "")) or list(range(SHARD_COUNT))
+_owned_shards = frozenset(SHARD_IDS)
+# Global jobs (YouTube polling and WebSub, log partitions, command sync) run
+# only in the primary process: by default the one running shard 0.
+PRIMARY = os.getenv("SHARD_PRIMARY", "1" if not SHARD_COUNT or 0 in _owned_shards else "0") == "1"
+
+
+def bot_options() -> dict:
+    """Keyword arguments for AutoShardedBot; empty when sharding is off."""
+    if not SHARD_COUNT:
+        return {}
+    return {"shard_count": SHARD_COUNT, "shard_ids": SHARD_IDS}
+
+
+def shard_for(guild_id: int, shard_count: int = SHARD_COUNT) -> int:
+    """The shard Discord routes a guild's events to."""
+    return (guild_id >> 22) % shard_count if shard_count else 0
+
+
+def owns_guild(guild_id: int) -> bool:
+    """True when this process runs the shard that has the guild."""
+    return not SHARD_COUNT or shard_for(guild_id) in _owned_shards
+
+
+def is_primary() -> bool:
+    return PRIMARY
+
+
+def describe() -> str:
+    if not SHARD_COUNT:
+        return "unsharded"
+    role = "primary" if PRIMARY else "secondary"
+    return f"shards {','.join(map(str, SHARD_IDS))} of {SHARD_COUNT} ({role})"
@@ -0,0 +1,220 @@
+# Python_Files/websub.py
+
+from discord.ext import tasks
+from datetime import datetime, timezone, timedelta
+from typing import TYPE_CHECKING
+import asyncio
+import hashlib
+import hmac
+import logging
+from http_client import HUB_TIMEOUT
+import metrics
+import queries
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HUB_URL = "https://pubsubhubbub.appspot.com/subscribe"
+TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={}"
+# A request the hub accepted but never verified (lost callback, callback URL
+# unreachable at the time) is given up after this and sent again.
+VERIFY_TIMEOUT = timedelta(minutes=10)
+PUSH_DRAIN_SECONDS = 5
+
+
+class WebSubReceiver:
+    """
+    Receives YouTube upload pushes through WebSub (PubSubHubbub).
+
+    How it works:
+    - We ask the hub to subscribe our callback URL to each channel's topic
+    - The hub verifies the subscription with a GET carrying `hub.challenge`
+    - On every upload the hub POSTs the Atom entry, signed with our secret
+    - Pushed entries go through YouTubeManager.process_entries, exactly like
+      polled ones, so the notification logs keep both paths de-duplicated
+    """
+
+    def __init__(
+        self,
+        youtube_manager,
+        callback_url: str,
+        secret: str,
+        hub_url: str = DEFAULT_HUB_URL,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        lease_seconds: int = 432000,
+        verify_timeout: timedelta = VERIFY_TIMEOUT,
+    ):
+        self.youtube = youtube_manager
+        self.callback_url = callback_url
+        self.secret = secret.encode()
+        self.hub_url = hub_url
+        self.host = host
+        self.port = port
+        self.lease_seconds = lease_seconds
+        self.verify_timeout = verify_timeout
+        self.runner = None
+        self.leases = {}  # yt_channel_id -> lease expiry (UTC)
+        # yt_channel_id -> ("subscribe" / "unsubscribe", request time (UTC))
+        self.pending = {}
+        self.push_tasks = set()  # pushes being processed; kept so they are not garbage-collected
+        log.info("YouTube WebSub receiver has been initialized.")
+
+    async def start(self):
+        """Starts the callback web server and the subscription renewal loop."""
+        from aiohttp import web  # only loaded when WebSub is enabled
+
+        app = web.Application()
+        app.router.add_get("/websub/youtube", self.handle_verification)
+        app.router.add_post("/websub/youtube", self.handle_notification)
+
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        log.info(f"🌐 WebSub callback listening on {self.host}:{self.port}")
+
+        self.renew_subscriptions.start()
+
+    async def close(self):
+        self.renew_subscriptions.cancel()
+        if self.runner:
+            await self.runner.cleanup()
+        # Pushes already acknowledged get a few seconds to finish; the rest are cancelled.
+        if self.push_tasks:
+            _, unfinished = await asyncio.wait(self.push_tasks, timeout=PUSH_DRAIN_SECONDS)
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+    # --- Hub Requests ---
+
+    async def subscribe(self, yt_channel_id: str, mode: str = "subscribe") -> bool:
+        """Sends a (un)subscribe request to the hub. Verification happens asynchronously."""
+        self.pending[yt_channel_id] = (mode, datetime.now(timezone.utc))
+        data = {
+            "hub.callback": self.callback_url,
+            "hub.mode": mode,
+            "hub.topic": TOPIC_URL.format(yt_channel_id),
+            "hub.verify": "async",
+            "hub.secret": self.secret.decode(),
+            "hub.lease_seconds": str(self.lease_seconds),
+        }
+        try:
+            async with self.youtube.http.post(
+                self.hub_url, data=data, timeout=HUB_TIMEOUT
+            ) as response:
+                if response.status not in (202, 204):
+                    log.error(
+                        f"WebSub hub rejected {mode} for channel {yt_channel_id}: HTTP {response.status}"
+                    )
+                    self.pending.pop(yt_channel_id, None)
+                    return False
+                return True
+        except Exception as e:
+            log.error(f"Error sending WebSub {mode} for channel {yt_channel_id}: {e}")
+            self.pending.pop(yt_channel_id, None)
+            return False
+
+    async def unsubscribe(self, yt_channel_id: str) -> bool:
+        self.leases.pop(yt_channel_id, None)
+        return await self.subscribe(yt_channel_id, mode="unsubscribe")
+
+    @tasks.loop(minutes=30)
+    @metrics.timed_loop("renew_subscriptions")
+    async def renew_subscriptions(self):
+        """Subscribes new channels and renews leases well before they expire."""
+        rows = await self.youtube.pool.fetch(queries.YT_ENABLED_CHANNEL_IDS)
+        now = datetime.now(timezone.utc)
+        # Renew once less than a fifth of the lease is left (1 day for the 5-day default)
+        renew_before = now + timedelta(seconds=self.lease_seconds // 5)
+
+        renewed = 0
+        for row in rows:
+            yt_channel_id = row["yt_channel_id"]
+            if yt_channel_id in self.pending:
+                mode, requested_at = self.pending[yt_channel_id]
+                if now - requested_at < self.verify_timeout:
+                    continue
+                log.warning(
+                    f"WebSub {mode} for channel {yt_channel_id} was not verified within "
+                    f"{self.verify_timeout.total_seconds() / 60:.0f} minutes; dropping it."
+                )
+                del self.pending[yt_channel_id]
+            expires_at = self.leases.get(yt_channel_id)
+            if expires_at and expires_at > renew_before:
+                continue
+            if await self.subscribe(yt_channel_id):
+                renewed += 1
+
+        if renewed:
+            log.info(f"🔁 Requested WebSub (re)subscription for {renewed} channel(s).")
+
+    @renew_subscriptions.before_loop
+    async def before_renew_subscriptions(self):
+        await self.youtube.bot.wait_until_ready()
+
+    # --- Callback Handlers ---
+
+    async def handle_verification(self, request: "web.Request") -> "web.Response":
+        """Answers the hub's intent verification by echoing `hub.challenge`."""
+        from aiohttp import web
+
+        mode = request.query.get("hub.mode")
+        topic = request.query.get("hub.topic", "")
+        challenge = request.query.get("hub.challenge")
+        yt_channel_id = topic.rpartition("channel_id=")[2]
+
+        pending_mode = self.pending.get(yt_channel_id, (None, None))[0]
+        if not challenge or pending_mode != mode:
+            log.warning(f"Refusing unexpected WebSub {mode} verification for {topic}")
+            return web.Response(status=404)
+
+        if mode == "subscribe":
+            lease = request.query.get("hub.lease_seconds", self.lease_seconds)
+            try:
+                expires_at = datetime.now(timezone.utc) + timedelta(seconds=int(lease))
+            except (ValueError, OverflowError):
+                log.warning(f"Malformed WebSub lease {lease!r} for {topic}; assuming {self.lease_seconds}s.")
+                lease = self.lease_seconds
+                expires_at = datetime.now(timezone.utc) + timedelta(seconds=lease)
+            self.leases[yt_channel_id] = expires_at
+            log.debug(f"WebSub subscription verified for {yt_channel_id} ({lease}s)")
+        del self.pending[yt_channel_id]
+        return web.Response(text=challenge)
+
+    async def handle_notification(self, request: "web.Request") -> "web.Response":
+        """Verifies the HMAC signature and hands pushed entries to the YouTube manager."""
+        from aiohttp import web
+
+        body = await request.read()
+
+        algorithm, _, signature = request.headers.get("X-Hub-Signature", "").partition("=")
+        if algorithm not in ("sha1", "sha256", "sha384", "sha512"):
+            log.warning("Dropping WebSub push without a usable signature.")
+            return web.Response(status=202)
+        expected = hmac.new(self.secret, body, getattr(hashlib, algorithm)).hexdigest()
+        if not hmac.compare_digest(expected, signature):
+            # Per the spec we still acknowledge, but ignore the content.
+            log.warning("Dropping WebSub push with an invalid signature.")
+            return web.Response(status=202)
+
+        # Reply to the hub right away, process in the background.
+        task = asyncio.create_task(self._process_push(body))
+        self.push_tasks.add(task)
+        task.add_done_callback(self.push_tasks.discard)
+        return web.Response(status=204)
+
+    async def _process_push(self, body: bytes):
+        try:
+            feed = await self.youtube.parser.parse(body)
+            if not feed.channel_id or not feed.entries:
+                return  # e.g. a deleted-entry notice
+
+            log.info(
+                f"📨 WebSub push for channel {feed.channel_id} ({len(feed.entries)} entries)"
+            )
+            await self.youtube.handle_pushed_entries(feed.channel_id, feed.entries)
+        except Exception as e:
+            log.error(f"Error processing WebSub push: {e}", exc_info=True)
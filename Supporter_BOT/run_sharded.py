@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Runs Supporter Bot as several processes that split the gateway shards.
+
+Each process runs run_supporter.py with SHARD_COUNT, its own SHARD_IDS
+range and, when METRICS_PORT is set, its own metrics port (METRICS_PORT +
+process index). The first process is the primary and runs the global jobs.
+A process that exits is restarted after a short delay.
+
+Usage:
+    python run_sharded.py --shards 8 --processes 4
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+RUN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_supporter.py")
+RESTART_DELAY_SECONDS = 10
+
+
+def shard_ranges(shards: int, processes: int) -> list:
+    """Splits shards 0..shards-1 into `processes` contiguous, near-equal ranges."""
+    per_process, extra = divmod(shards, processes)
+    ranges, first = [], 0
+    for index in range(processes):
+        size = per_process + (index < extra)
+        ranges.append(range(first, first + size))
+        first += size
+    return ranges
+
+
+def child_env(shards: int, shard_range: range, index: int) -> dict:
+    env = dict(os.environ)
+    env["SHARD_COUNT"] = str(shards)
+    env["SHARD_IDS"] = f"{shard_range.start}-{shard_range.stop - 1}"
+    env["SHARD_PRIMARY"] = "1" if index == 0 else "0"
+    if int(env.get("METRICS_PORT", "0")):
+        env["METRICS_PORT"] = str(int(env["METRICS_PORT"]) + index)
+    return env
+
+
+def spawn(shards: int, shard_range: range, index: int) -> subprocess.Popen:
+    print(f"🚀 Starting process {index} with shards {shard_range.start}-{shard_range.stop - 1}")
+    return subprocess.Popen([sys.executable, RUN_SCRIPT], env=child_env(shards, shard_range, index))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--shards", type=int, default=int(os.getenv("SHARD_COUNT", "0")))
+    arg_parser.add_argument("--processes", type=int, default=int(os.getenv("SHARD_PROCESSES", "2")))
+    args = arg_parser.parse_args()
+    if args.shards < 1 or not 1 <= args.processes <= args.shards:
+        arg_parser.error("need --shards >= 1 and 1 <= --processes <= --shards")
+
+    ranges = shard_ranges(args.shards, args.processes)
+    children = [spawn(args.shards, shard_range, index) for index, shard_range in enumerate(ranges)]
+    restart_at = {}  # process index -> monotonic time of its scheduled restart
+    try:
+        while True:
+            time.sleep(1)
+            now = time.monotonic()
+            for index, child in enumerate(children):
+                if index in restart_at:
+                    if now >= restart_at[index]:
+                        del restart_at[index]
+                        children[index] = spawn(args.shards, ranges[index], index)
+                elif child.poll() is not None:
+                    print(f"⚠️ Process {index} exited with code {child.returncode}; restarting in {RESTART_DELAY_SECONDS}s")
+                    restart_at[index] = now + RESTART_DELAY_SECONDS
+    except KeyboardInterrupt:
+        print("Stopping all shard processes...")
+    finally:
+        for child in children:
+            child.terminate()
+        for child in children:
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,11 @@ import os
 python_files_dir = os.path.join(os.path.dirname(__file__), "Python_Files")
 sys.path.insert(0, python_files_dir)
 
-# Import and run the supporter bot
-from supporter import run_bot
-
 if __name__ == "__main__":
+    # Imported here, not at module level: feed parse worker processes
+    # ("process" mode) re-import this script as __mp_main__ and must not
+    # load the whole bot.
+    from supporter import run_bot
+
     print("🚀 Starting Supporter Bot...")
     run_bot()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Drives synthetic messages and voice-state changes through the leveling and
+no-text event handlers, without a Discord connection.
+
+Each message goes to both LevelManager.on_message and NoTextManager.on_message,
+and each voice event goes to LevelManager.on_voice_state_update. Like
+discord.py, the benchmark runs every handler call as its own task. It reports
+throughput, p50/p99 latency per handler, and database round trips per event,
+broken down by statement. With the in-memory database it first counts the
+round trips of each handler path on a single event.
+
+The database is an in-memory stand-in by default. Pass --dsn to use a local
+Postgres instead: use a scratch database with the bot's schema, because
+synthetic guilds, users and channel settings are written to it.
+
+Usage:
+    python Benchmarks/bench_event_handlers.py [--events 20000] [--rate 0]
+        [--guilds 50] [--users 200] [--voice-share 0.2] [--skew 1.0] [--dsn URL]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Python_Files"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import asyncpg
+import queries
+from database import InstrumentedPool
+from level import LevelManager
+from no_text import NoTextManager
+from fake_discord import FakeMessage, FakeVoiceState, World, next_id
+from fake_pool import FakePool
+
+
+async def seed(pool, world: World, max_xp: int):
+    """Writes each guild's settings and members through the bot's own statements."""
+    for guild in world.guilds:
+        g = guild.id
+        level_roles = guild.roles[:3]
+        for level, role in zip((5, 10, 20), level_roles):
+            await pool.execute(queries.LEVEL_ROLE_UPSERT, g, level, role.id, guild.name, role.name)
+        bypass = guild.roles[3]
+        await pool.execute(queries.BYPASS_ROLE_ADD, g, bypass.id, guild.name, bypass.name)
+
+        notify, no_links, no_discord_links, media_only = guild.text_channels[:4]
+        await pool.execute(
+            queries.LEVEL_NOTIFY_CHANNEL_UPSERT, g, notify.id, guild.name, notify.name
+        )
+        await pool.execute(queries.NO_LINKS_ADD, g, no_links.id, guild.name, no_links.name)
+        await pool.execute(
+            queries.NO_DISCORD_LINKS_ADD, g, no_discord_links.id, guild.name, no_discord_links.name
+        )
+        # The redirect channel is deliberately not in the fake cache: otherwise the
+        # handler would post a warning and then sleep 15 s before deleting it.
+        await pool.execute(
+            queries.NO_TEXT_UPSERT, g, media_only.id, guild.name, media_only.name, next_id()
+        )
+
+        for member in guild.members:
+            xp = world.random.randrange(max_xp)
+            await pool.execute(queries.USER_UPSERT, g, member.id, guild.name, member.name)
+            await pool.execute(queries.USER_SET_XP, g, member.id, xp, xp // 1000, 0)
+            if world.random.random() < 0.05:
+                member.roles.append(bypass)
+
+
+def build_events(world: World, count: int, voice_share: float, skew: float) -> list:
+    events = []
+    for _ in range(count):
+        if world.random.random() < voice_share:
+            events.append(("voice", world.voice(skew)))
+        else:
+            events.append(("message", world.message(skew)))
+    return events
+
+
+class Runner:
+    def __init__(self, level: LevelManager, notext: NoTextManager, world: World):
+        self.level = level
+        self.notext = notext
+        self.world = world
+        self.latencies = {"level.on_message": [], "no_text.on_message": [], "level.on_voice_state_update": []}
+        self.errors = {name: 0 for name in self.latencies}
+        self.tasks = set()
+
+    async def _timed(self, name: str, coro):
+        started = time.perf_counter()
+        try:
+            await coro
+        except Exception as e:
+            if not self.errors[name]:
+                print(f"{name} raised {e!r}; further errors are only counted")
+            self.errors[name] += 1
+        finally:
+            self.latencies[name].append(time.perf_counter() - started)
+
+    def _spawn(self, name: str, coro):
+        task = asyncio.create_task(self._timed(name, coro))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def dispatch(self, kind: str, payload):
+        if kind == "message":
+            self._spawn("level.on_message", self.level.on_message(payload))
+            self._spawn("no_text.on_message", self.notext.on_message(payload))
+            return
+        member, before, after = payload
+        session = self.level.voice_sessions.get((member.guild.id, member.id))
+        if session and after.channel is None:
+            # Pretend the member stayed connected for a while, so leaving awards voice XP.
+            self.level.voice_sessions[(member.guild.id, member.id)] = session - timedelta(
+                minutes=self.world.random.randint(1, 60)
+            )
+        self._spawn("level.on_voice_state_update", self.level.on_voice_state_update(member, before, after))
+
+    async def run(self, events: list, rate: float, concurrency: int) -> float:
+        started = time.perf_counter()
+        for i, (kind, payload) in enumerate(events):
+            if rate > 0:
+                delay = started + i / rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                while len(self.tasks) >= concurrency:
+                    await asyncio.sleep(0)
+            self.dispatch(kind, payload)
+        while self.tasks:
+            await asyncio.gather(*list(self.tasks))
+        return time.perf_counter() - started
+
+
+async def probe_round_trips(fake: FakePool, world: World):
+    """Counts the statements each handler path makes for one event, on fresh managers."""
+    level = LevelManager(world.bot, fake)
+    notext = NoTextManager(world.bot, fake)
+    guild = world.guilds[0]
+    member = guild.members[-1]
+    channel = guild.text_channels[-1]  # no restrictions configured
+    voice = guild.voice_channels[0]
+    message = FakeMessage(member, channel, "hello")
+
+    async def leave_after_ten_minutes():
+        level.voice_sessions[(guild.id, member.id)] -= timedelta(minutes=10)
+        await level.on_voice_state_update(member, FakeVoiceState(voice), FakeVoiceState())
+
+    print(f"\n{'handler path':<44} {'round trips':>11}")
+    for name, call in (
+        ("level.on_message (uncached user)", lambda: level.on_message(message)),
+        ("level.on_message (within cooldown)", lambda: level.on_message(message)),
+        ("no_text.on_message (unrestricted channel)", lambda: notext.on_message(message)),
+        ("level.on_voice_state_update (join)", lambda: level.on_voice_state_update(
+            member, FakeVoiceState(), FakeVoiceState(voice)
+        )),
+        ("level.on_voice_state_update (leave)", leave_after_ten_minutes),
+    ):
+        fake.reset_counts()
+        await call()
+        statements = ", ".join(f"{label} x{count}" for label, count in fake.calls.items()) or "-"
+        print(f"{name:<44} {fake.round_trips:>11}  {statements}")
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def report(runner: Runner, pool: InstrumentedPool, events: list, elapsed: float):
+    messages = sum(1 for kind, _ in events if kind == "message")
+    voice = len(events) - messages
+    print(
+        f"\n{len(events)} events ({messages} messages, {voice} voice) in {elapsed:.2f} s: "
+        f"{len(events) / elapsed:.0f} events/s, {messages / elapsed:.0f} messages/s"
+    )
+
+    print(f"\n{'handler':<30} {'calls':>7} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, values in runner.latencies.items():
+        values.sort()
+        print(
+            f"{name:<30} {len(values):>7} {runner.errors[name]:>7} "
+            f"{percentile(values, 0.5) * 1000:>8.2f} {percentile(values, 0.99) * 1000:>8.2f} "
+            f"{(values[-1] if values else 0) * 1000:>8.2f}"
+        )
+
+    statements = {
+        (scope, label): stats
+        for (scope, label), stats in pool.stats.items()
+        if scope in ("level", "no_text")
+    }
+    total = sum(stats["calls"] for stats in statements.values())
+    print(f"\nDB round trips: {total} total, {total / len(events):.2f} per event")
+    print(f"{'statement':<36} {'calls':>7} {'per event':>10} {'avg ms':>8}")
+    for (scope, label), stats in sorted(statements.items(), key=lambda item: -item[1]["calls"]):
+        print(
+            f"{label:<36} {stats['calls']:>7} {stats['calls'] / len(events):>10.3f} "
+            f"{1000 * stats['total_seconds'] / stats['calls']:>8.3f}"
+        )
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--events", type=int, default=20000)
+    arg_parser.add_argument("--rate", type=float, default=0, help="events per second; 0 = as fast as possible")
+    arg_parser.add_argument("--concurrency", type=int, default=200, help="handler tasks in flight when --rate is 0")
+    arg_parser.add_argument("--guilds", type=int, default=50)
+    arg_parser.add_argument("--users", type=int, default=200, help="members per guild")
+    arg_parser.add_argument("--voice-share", type=float, default=0.2, help="share of events that are voice updates")
+    arg_parser.add_argument("--skew", type=float, default=1.0, help="0 = every member equally active")
+    arg_parser.add_argument("--max-xp", type=int, default=25000, help="members start with 0..max-xp XP")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--dsn", default=None, help="Postgres URL (scratch database); default in-memory")
+    arg_parser.add_argument("--pool-size", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    world = World(args.guilds, args.users, seed=args.seed)
+    if args.dsn:
+        raw_pool = await asyncpg.create_pool(args.dsn, max_size=args.pool_size, **queries.pool_options())
+    else:
+        raw_pool = FakePool()
+    pool = InstrumentedPool(raw_pool)
+
+    try:
+        started = time.perf_counter()
+        await seed(pool.scoped("seed"), world, args.max_xp)
+        print(
+            f"Seeded {args.guilds} guilds x {args.users} members "
+            f"({'Postgres' if args.dsn else 'in-memory'}) in {time.perf_counter() - started:.1f} s"
+        )
+
+        if isinstance(raw_pool, FakePool):
+            await probe_round_trips(raw_pool, world)
+
+        level = LevelManager(world.bot, pool.scoped("level"))
+        notext = NoTextManager(world.bot, pool.scoped("no_text"))
+        events = build_events(world, args.events, args.voice_share, args.skew)
+        runner = Runner(level, notext, world)
+        elapsed = await runner.run(events, args.rate, args.concurrency)
+        report(runner, pool, events, elapsed)
+    finally:
+        await raw_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
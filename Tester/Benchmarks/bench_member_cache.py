@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Measures what the member cache costs at startup, by feeding synthetic
+GUILD_CREATE and member-chunk payloads through discord.py's own cache code.
+
+Each mode runs in a fresh process and reports the resident memory the guilds
+add, the members left in the cache, the time spent building them, and the
+member chunk requests the bot would send before it is ready. Discord allows
+about 120 gateway commands a minute per shard, so the last column is the
+least time those requests add to startup, before any download time.
+
+Modes (member cache flags / chunking at startup):
+    default  all / on   (discord.py's default, the bot's MEMBER_CACHE_FLAGS=all)
+    voice    voice / off (MEMBER_CACHE_FLAGS=voice CHUNK_GUILDS_AT_STARTUP=false)
+    none     none / off
+
+Usage:
+    python Benchmarks/bench_member_cache.py [--guilds 200] [--members 5000]
+        [--voice-share 0.01] [--modes default voice none]
+"""
+
+import argparse
+import gc
+import json
+import math
+import random
+import subprocess
+import sys
+import time
+
+MODES = {
+    "default": ("all", True),
+    "voice": ("voice", False),
+    "none": ("none", False),
+}
+CHUNK_SIZE = 1000  # members per GUILD_MEMBERS_CHUNK event
+GATEWAY_COMMANDS_PER_MINUTE = 120
+BOT_USER_ID = 1_200_000_000_000_000_000
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def user_payload(user_id: int, name: str) -> dict:
+    return {"id": str(user_id), "username": name, "discriminator": "0", "global_name": name, "avatar": None}
+
+
+def member_payload(user_id: int, role_ids: list) -> dict:
+    return {
+        "user": user_payload(user_id, f"user{user_id % 10**8}"),
+        "roles": [str(role_id) for role_id in role_ids],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "nick": None,
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def guild_payloads(index: int, members: int, voice_share: float, rng: random.Random) -> tuple:
+    """A GUILD_CREATE as sent with the members intent (bot and voice members only) plus the member chunks."""
+    guild_id = 1_100_000_000_000_000_000 + index * 10**6
+    role_ids = [guild_id + r for r in range(1, 6)]
+    voice_channel_id = guild_id + 10
+    user_ids = [guild_id + 1000 + m for m in range(members)]
+    in_voice = [user_id for user_id in user_ids if rng.random() < voice_share]
+
+    def member(user_id):
+        return member_payload(user_id, rng.sample(role_ids, rng.randint(0, 2)))
+
+    guild = {
+        "id": str(guild_id),
+        "name": f"Guild {index}",
+        "owner_id": str(user_ids[0]),
+        "member_count": members + 1,
+        "large": members > 250,
+        "unavailable": False,
+        "roles": [
+            {"id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0,
+             "color": 0, "hoist": False, "managed": False, "mentionable": False}
+        ] + [
+            {"id": str(role_id), "name": f"Role {role_id % 10}", "permissions": "0", "position": n + 1,
+             "color": 0, "hoist": False, "managed": False, "mentionable": False}
+            for n, role_id in enumerate(role_ids)
+        ],
+        "channels": [
+            {"id": str(guild_id + 9), "type": 0, "name": "general", "position": 0, "permission_overwrites": []},
+            {"id": str(voice_channel_id), "type": 2, "name": "voice", "position": 1, "permission_overwrites": [],
+             "bitrate": 64000, "user_limit": 0},
+        ],
+        "voice_states": [
+            {"user_id": str(user_id), "channel_id": str(voice_channel_id), "session_id": "s",
+             "deaf": False, "mute": False, "self_deaf": False, "self_mute": False,
+             "self_video": False, "suppress": False}
+            for user_id in in_voice
+        ],
+        "members": [member_payload(BOT_USER_ID, [])] + [member(user_id) for user_id in in_voice],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "threads": [],
+        "stage_instances": [],
+        "guild_scheduled_events": [],
+    }
+    chunks = [
+        {"guild_id": str(guild_id), "members": [member(user_id) for user_id in user_ids[start:start + CHUNK_SIZE]]}
+        for start in range(0, members, CHUNK_SIZE)
+    ]
+    return guild, chunks
+
+
+def run_mode(mode: str, args) -> dict:
+    """Runs in a child process so every mode starts from the same memory baseline."""
+    import discord
+
+    flags, chunk_at_startup = MODES[mode]
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.voice_states = True
+    client = discord.Client(
+        intents=intents,
+        member_cache_flags=discord.MemberCacheFlags.all() if flags == "all"
+        else discord.MemberCacheFlags.none() if flags == "none"
+        else discord.MemberCacheFlags(voice=True),
+        chunk_guilds_at_startup=chunk_at_startup,
+    )
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(BOT_USER_ID, "Supporter"))
+
+    rng = random.Random(args.seed)
+    gc.collect()
+    baseline = rss_mb()
+    build_seconds = 0.0
+    requests = 0
+    for index in range(args.guilds):
+        # Payloads are built outside the timed part and dropped after use, as
+        # the gateway's decoded JSON would be.
+        guild_data, chunks = guild_payloads(index, args.members, args.voice_share, rng)
+        started = time.perf_counter()
+        guild = state._add_guild_from_data(guild_data)
+        if state._guild_needs_chunking(guild):
+            # What a chunk request with cache=True does with every chunk it receives.
+            requests += 1
+            for chunk in chunks:
+                for data in chunk["members"]:
+                    guild._add_member(discord.Member(data=data, guild=guild, state=state))
+        build_seconds += time.perf_counter() - started
+        del guild_data, chunks
+    gc.collect()
+
+    return {
+        "mode": mode,
+        "rss_mb": rss_mb() - baseline,
+        "cached_members": sum(len(guild._members) for guild in state._guilds.values()),
+        "build_seconds": build_seconds,
+        "chunk_requests": requests,
+        "chunk_events": requests * math.ceil(args.members / CHUNK_SIZE),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--guilds", type=int, default=200)
+    arg_parser.add_argument("--members", type=int, default=5000, help="members per guild")
+    arg_parser.add_argument("--voice-share", type=float, default=0.01, help="share of members in voice")
+    arg_parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_mode(args.child, args)))
+        return
+
+    print(
+        f"{args.guilds} guilds x {args.members} members, {args.voice_share:.1%} in voice\n\n"
+        f"{'mode':<8} {'RSS MB':>8} {'cached members':>15} {'build s':>8} "
+        f"{'chunk requests':>15} {'chunk events':>13} {'min wait s':>10}"
+    )
+    for mode in args.modes:
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--guilds", str(args.guilds),
+             "--members", str(args.members), "--voice-share", str(args.voice_share),
+             "--seed", str(args.seed)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        wait = result["chunk_requests"] / GATEWAY_COMMANDS_PER_MINUTE * 60
+        print(
+            f"{result['mode']:<8} {result['rss_mb']:>8.1f} {result['cached_members']:>15} "
+            f"{result['build_seconds']:>8.2f} {result['chunk_requests']:>15} "
+            f"{result['chunk_events']:>13} {wait:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Runs the bot's WebSub receiver end to end against the local stand-in hub.
+
+A YouTubeManager with WebSub enabled subscribes every configured channel at
+fake_websub_hub.py, which verifies each request through the receiver's
+callback. The hub drops the verification of the first --lost requests;
+after the receiver's verify timeout the renewal loop must send those again.
+The hub then publishes uploads: correctly signed pushes must produce exactly
+one notification per following guild, and a repeat of the same push, a push
+with a bad HMAC signature, and a push after unsubscribing must produce none.
+
+Each step prints its result and timing; the script exits with status 1 if
+any check fails. The database is the in-memory FakePool, and notifications
+go to fake channels.
+
+Usage:
+    python Benchmarks/bench_websub.py [--channels 200] [--lost 20] [--pushes 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import socket
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Python_Files"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import youtube_notification
+from http_client import HttpClient
+from youtube_notification import YouTubeManager
+from bench_youtube_poller import seed_configs
+from fake_discord import World
+from fake_feeds import channel_id_for
+from fake_pool import FakePool
+from fake_websub_hub import FakeHub
+
+
+class Checks:
+    def __init__(self):
+        self.failed = 0
+
+    def report(self, name: str, passed: bool, detail: str):
+        self.failed += not passed
+        print(f"{'PASS' if passed else 'FAIL':<5} {name:<34} {detail}")
+
+
+async def wait_for(condition, timeout: float) -> float:
+    """Seconds until `condition()` held, or -1 after `timeout`."""
+    started = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - started > timeout:
+            return -1.0
+        await asyncio.sleep(0.01)
+    return time.perf_counter() - started
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--channels", type=int, default=200)
+    arg_parser.add_argument("--guilds", type=int, default=50)
+    arg_parser.add_argument("--lost", type=int, default=20, help="subscriptions the hub never verifies")
+    arg_parser.add_argument("--pushes", type=int, default=50)
+    arg_parser.add_argument("--verify-delay-ms", type=float, default=20)
+    arg_parser.add_argument("--verify-timeout", type=float, default=1.0, help="receiver verify timeout, seconds")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--verbose", action="store_true", help="show the bot's log output")
+    args = arg_parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+    rng = random.Random(args.seed)
+    checks = Checks()
+
+    hub = FakeHub(verify_delay=args.verify_delay_ms / 1000, drop_verifications=args.lost, seed=args.seed)
+    await hub.start()
+
+    port = free_port()
+    youtube_notification.WEBSUB_CALLBACK_URL = f"http://127.0.0.1:{port}/websub/youtube"
+    youtube_notification.WEBSUB_SECRET = "bench-secret"
+    youtube_notification.WEBSUB_HUB_URL = hub.url
+    youtube_notification.WEBSUB_HOST = "127.0.0.1"
+    youtube_notification.WEBSUB_PORT = port
+
+    world = World(args.guilds, users_per_guild=1, seed=args.seed)
+    world.bot.http_client = HttpClient()
+    await world.bot.http_client.start()
+    pool = FakePool()
+    await seed_configs(pool, world, args.channels, guilds_per_channel=1)
+    manager = YouTubeManager(world.bot, pool)
+    receiver = manager.websub
+    receiver.verify_timeout = timedelta(seconds=args.verify_timeout)
+    targets = {
+        index: world.guilds[index % len(world.guilds)].text_channels[0] for index in range(args.channels)
+    }
+
+    def sent() -> int:
+        return sum(channel.sent for channel in set(targets.values()))
+
+    try:
+        # The renewal loop's first run subscribes every channel.
+        await receiver.start()
+        elapsed = await wait_for(
+            lambda: hub.stats["verified"] + hub.stats["dropped"] >= args.channels, timeout=30
+        )
+        verified = len(receiver.leases)
+        checks.report(
+            "subscribe + verify",
+            verified == args.channels - args.lost and len(receiver.pending) == args.lost,
+            f"{hub.stats['requests']} requests, {verified} verified, {len(receiver.pending)} unverified "
+            f"in {elapsed:.2f} s",
+        )
+
+        await asyncio.sleep(args.verify_timeout)
+        requests_before = hub.stats["requests"]
+        await receiver.renew_subscriptions()
+        elapsed = await wait_for(lambda: len(receiver.leases) == args.channels, timeout=30)
+        checks.report(
+            "lost verifications re-sent",
+            elapsed >= 0 and not receiver.pending,
+            f"{hub.stats['requests'] - requests_before} requests re-sent, "
+            f"{len(receiver.leases)}/{args.channels} verified",
+        )
+
+        latencies, missed = [], 0
+        pushed = rng.sample(range(args.channels), min(args.pushes, args.channels))
+        for index in pushed:
+            before = targets[index].sent
+            started = time.perf_counter()
+            await hub.publish(index)
+            if await wait_for(lambda: targets[index].sent == before + 1, timeout=5) < 0:
+                missed += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+        checks.report(
+            "signed push -> notification",
+            missed == 0,
+            f"{len(pushed) - missed}/{len(pushed)} notified, p50 {p50:.1f} ms, "
+            f"max {(latencies[-1] if latencies else 0) * 1000:.1f} ms",
+        )
+
+        index = pushed[0]
+        hub.videos[index] -= 1  # publish the previous video again
+        before = sent()
+        await hub.publish(index)
+        await asyncio.sleep(0.5)
+        checks.report("repeated push", sent() == before, f"{sent() - before} extra notifications")
+
+        before = sent()
+        delivered = await hub.publish(index, bad_signature=True)
+        await asyncio.sleep(0.5)
+        checks.report(
+            "bad signature ignored",
+            delivered == 1 and sent() == before,
+            f"push acknowledged: {delivered == 1}, {sent() - before} notifications",
+        )
+
+        await receiver.unsubscribe(channel_id_for(index))
+        await wait_for(lambda: hub.subscribers(index) == 0, timeout=5)
+        delivered = await hub.publish(index)
+        checks.report(
+            "unsubscribe", hub.subscribers(index) == 0 and delivered == 0, f"{delivered} deliveries after unsubscribing"
+        )
+    finally:
+        await manager.close()
+        await world.bot.http_client.close()
+        await hub.close()
+
+    sys.exit(1 if checks.failed else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
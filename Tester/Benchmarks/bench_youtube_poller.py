@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Runs full YouTubeManager.check_for_videos poll cycles against a local feed
+server, to see how polling scales with the number of subscriptions.
+
+The feeds come from fake_feed_server.py, which runs in a separate process by
+default so that serving them does not compete with the poller for the event
+loop. Every cycle forces every subscribed channel to be due and starts with
+an empty feed cache. Between cycles, a share of the channels uploads a new
+video. The first cycle only finds old videos, which are logged without a
+notification, as on a fresh deployment.
+
+Each cycle reports its duration, the requests the server saw (200 / 304 /
+errors), the feed bytes parsed, the videos logged and notifications
+delivered, the database round trips, and the worst event-loop lag.
+The database is the in-memory FakePool, and notifications go to fake channels.
+
+Usage:
+    python Benchmarks/bench_youtube_poller.py [--channels 1000 10000] [--cycles 3]
+        [--latency-ms 50] [--error-rate 0.01] [--upload-share 0.05] [--parse-mode thread]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import aiohttp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Python_Files"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import queries
+import youtube_notification
+from feed_parser import FeedParser, PARSE_MODES
+from http_client import HttpClient
+from youtube_notification import YouTubeManager
+from bench_feed_parsing import measure_loop_lag
+from fake_discord import World
+from fake_feed_server import FeedServer
+from fake_feeds import channel_id_for
+from fake_pool import FakePool
+
+
+class InProcessServer:
+    """A FeedServer on the benchmark's own event loop (--in-process)."""
+
+    def __init__(self, server_args: dict):
+        self.server = FeedServer(**server_args)
+
+    @property
+    def url(self) -> str:
+        return self.server.url
+
+    async def start(self):
+        await self.server.start()
+
+    async def stats(self) -> dict:
+        return dict(self.server.stats)
+
+    async def reset_stats(self):
+        self.server.reset_stats()
+
+    async def upload(self, share: float) -> int:
+        return self.server.upload_share(share)
+
+    async def close(self):
+        await self.server.close()
+
+
+class ServerProcess:
+    """fake_feed_server.py in a child process, controlled over its /admin routes."""
+
+    def __init__(self, server_args: dict):
+        self.server_args = server_args
+        self.port = None
+        self.process = None
+        self.session = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/feeds/videos.xml"
+
+    async def start(self):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        a = self.server_args
+        self.process = subprocess.Popen(
+            [
+                sys.executable, os.path.join(os.path.dirname(__file__), "fake_feed_server.py"),
+                "--channels", str(a["channels"]),
+                "--port", str(self.port),
+                "--latency-ms", str(a["latency"] * 1000),
+                "--jitter-ms", str(a["jitter"] * 1000),
+                "--error-rate", str(a["error_rate"]),
+                *([] if a["etags"] else ["--no-etags"]),
+            ],
+            stdout=subprocess.DEVNULL,
+        )
+        self.session = aiohttp.ClientSession(base_url=f"http://127.0.0.1:{self.port}")
+        for _ in range(100):
+            try:
+                await self.stats()
+                return
+            except aiohttp.ClientError:
+                await asyncio.sleep(0.1)
+        raise RuntimeError("fake_feed_server.py did not start")
+
+    async def stats(self) -> dict:
+        async with self.session.get("/admin/stats") as response:
+            return await response.json()
+
+    async def reset_stats(self):
+        async with self.session.post("/admin/reset-stats"):
+            pass
+
+    async def upload(self, share: float) -> int:
+        async with self.session.post("/admin/upload", params={"share": str(share)}) as response:
+            return (await response.json())["uploaded"]
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+        if self.process:
+            self.process.terminate()
+            self.process.wait()
+
+
+async def seed_configs(pool: FakePool, world: World, channels: int, guilds_per_channel: int):
+    for index in range(channels):
+        yt_channel_id = channel_id_for(index)
+        for k in range(guilds_per_channel):
+            guild = world.guilds[(index * guilds_per_channel + k) % len(world.guilds)]
+            target = guild.text_channels[0]
+            await pool.execute(
+                queries.YT_CONFIG_UPSERT, guild.id, yt_channel_id, target.id, None,
+                guild.name, f"Benchmark Channel {index}", target.name, None,
+            )
+
+
+async def run_cycles(args, channels: int):
+    server_args = dict(
+        channels=channels,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        etags=not args.no_etags,
+    )
+    server = InProcessServer(server_args) if args.in_process else ServerProcess(server_args)
+    await server.start()
+
+    world = World(args.guilds, users_per_guild=1, seed=args.seed)
+    world.bot.http_client = HttpClient()
+    await world.bot.http_client.start()
+    youtube_notification.RSS_FEED_URL = f"{server.url}?channel_id={{}}"
+    youtube_notification.POLL_CONCURRENCY = args.concurrency
+
+    pool = FakePool()
+    await seed_configs(pool, world, channels, args.guilds_per_channel)
+    manager = YouTubeManager(world.bot, pool)
+    manager.parser.close()
+    manager.parser = FeedParser(args.parse_mode, workers=args.workers)
+    channel_ids = [channel_id_for(index) for index in range(channels)]
+    targets = [guild.text_channels[0] for guild in world.guilds]
+
+    try:
+        for cycle in range(1, args.cycles + 1):
+            uploaded = await server.upload(args.upload_share) if cycle > 1 else 0
+            manager.feed_cache.entries.clear()
+            now = datetime.now(timezone.utc)
+            for yt_channel_id in channel_ids:
+                manager.scheduler.next_due[yt_channel_id] = now
+
+            await server.reset_stats()
+            pool.reset_counts()
+            logged_before = len(pool.tables["youtube_notification_logs"])
+            sent_before = sum(target.sent for target in targets)
+
+            stop = asyncio.Event()
+            lag_task = asyncio.create_task(measure_loop_lag(stop))
+            started = time.perf_counter()
+            await manager.check_for_videos()
+            elapsed = time.perf_counter() - started
+            while manager.notifications.depth():
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0)
+            stop.set()
+            worst_lag = await lag_task
+
+            stats = await server.stats()
+            print(
+                f"{channels:>8} {cycle:>5} {uploaded:>8} {elapsed:>8.2f} {stats['requests']:>8} "
+                f"{stats['ok']:>6} {stats['not_modified']:>5} {stats['errors']:>6} "
+                f"{stats['bytes'] / 1e6:>8.1f} {len(pool.tables['youtube_notification_logs']) - logged_before:>8} "
+                f"{sum(target.sent for target in targets) - sent_before:>8} {pool.round_trips:>8} "
+                f"{worst_lag * 1000:>8.1f}"
+            )
+    finally:
+        await manager.close()
+        await world.bot.http_client.close()
+        await server.close()
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--channels", type=int, nargs="+", default=[1000])
+    arg_parser.add_argument("--cycles", type=int, default=3)
+    arg_parser.add_argument("--guilds", type=int, default=200)
+    arg_parser.add_argument("--guilds-per-channel", type=int, default=1)
+    arg_parser.add_argument("--upload-share", type=float, default=0.05, help="channels uploading between cycles")
+    arg_parser.add_argument("--latency-ms", type=float, default=50)
+    arg_parser.add_argument("--jitter-ms", type=float, default=20)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--no-etags", action="store_true")
+    arg_parser.add_argument("--concurrency", type=int, default=youtube_notification.POLL_CONCURRENCY)
+    arg_parser.add_argument("--parse-mode", choices=PARSE_MODES, default=youtube_notification.FEED_PARSE_MODE)
+    arg_parser.add_argument("--workers", type=int, default=None)
+    arg_parser.add_argument("--in-process", action="store_true", help="serve feeds from this process")
+    arg_parser.add_argument("--seed", type=int, default=1)
+    arg_parser.add_argument("--verbose", action="store_true", help="show the bot's log output")
+    args = arg_parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.CRITICAL)
+
+    print(
+        f"{'channels':>8} {'cycle':>5} {'uploads':>8} {'wall s':>8} {'requests':>8} "
+        f"{'200':>6} {'304':>5} {'errors':>6} {'MB parsed':>8} {'logged':>8} "
+        f"{'notified':>8} {'db trips':>8} {'lag ms':>8}"
+    )
+    for channels in args.channels:
+        await run_cycles(args, channels)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
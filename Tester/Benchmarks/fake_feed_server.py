@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for YouTube's RSS endpoint, serving generated Atom feeds
+for N channels at /feeds/videos.xml?channel_id=UC...
+
+Latency, error rate, ETag support (If-None-Match -> 304) and the upload
+rate are configurable. Channel IDs come from fake_feeds.channel_id_for, so
+channel i is UC followed by i as 22 digits.
+
+A benchmark that runs the server as a separate process controls it over
+/admin: GET /admin/stats, POST /admin/reset-stats and
+POST /admin/upload?share=0.05 (one new video on 5% of the channels).
+
+Usage:
+    python Benchmarks/fake_feed_server.py [--channels 1000] [--port 8089]
+        [--latency-ms 50] [--error-rate 0.01] [--uploads-per-minute 10]
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+from fake_feeds import render_feed
+
+FEED_PATH = "/feeds/videos.xml"
+
+
+class FeedServer:
+    """
+    Every channel starts with `entries` uploads spaced a day apart, the newest
+    `history_age` ago, so a first poll only finds old videos. `upload()` adds
+    a video published now; the feed always shows the latest `entries`.
+    """
+
+    def __init__(
+        self,
+        channels: int,
+        entries: int = 15,
+        history_age: timedelta = timedelta(days=3),
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        etags: bool = True,
+        uploads_per_minute: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 1,
+    ):
+        self.channels = channels
+        self.entries = entries
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.etags = etags
+        self.uploads_per_minute = uploads_per_minute
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+
+        newest = datetime.now(timezone.utc) - history_age
+        self.history = {}  # channel index -> [(video_number, published)], oldest first
+        self.base_history = [
+            (number, newest - timedelta(days=entries - 1 - number)) for number in range(entries)
+        ]
+        self.rendered = {}  # channel index -> (etag, body)
+        self.versions = {}  # channel index -> uploads since start
+        self.runner = None
+        self.uploader = None
+        self.reset_stats()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{FEED_PATH}"
+
+    def reset_stats(self):
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "not_found": 0, "bytes": 0}
+
+    # --- Uploads ---
+
+    def upload(self, channel_index: int):
+        videos = self.history.setdefault(channel_index, list(self.base_history))
+        videos.append((videos[-1][0] + 1, datetime.now(timezone.utc)))
+        del videos[: -self.entries]
+        self.versions[channel_index] = self.versions.get(channel_index, 0) + 1
+        self.rendered.pop(channel_index, None)
+
+    def upload_share(self, share: float) -> int:
+        """Gives a random `share` of the channels one new upload each; returns how many."""
+        count = round(self.channels * share)
+        for channel_index in self.random.sample(range(self.channels), count):
+            self.upload(channel_index)
+        return count
+
+    async def _upload_continuously(self):
+        while True:
+            await asyncio.sleep(1)
+            expected = self.uploads_per_minute / 60
+            count = int(expected) + (self.random.random() < expected % 1)
+            for _ in range(count):
+                self.upload(self.random.randrange(self.channels))
+
+    # --- HTTP ---
+
+    def _feed(self, channel_index: int) -> tuple:
+        if channel_index not in self.rendered:
+            videos = self.history.get(channel_index, self.base_history)
+            body = render_feed(channel_index, list(reversed(videos)))
+            etag = f'"{channel_index}-{self.versions.get(channel_index, 0)}"'
+            self.rendered[channel_index] = (etag, body)
+        return self.rendered[channel_index]
+
+    async def handle_feed(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+        if self.random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.Response(status=500, text="Internal Server Error")
+
+        channel_id = request.query.get("channel_id", "")
+        index = channel_id[2:]
+        if not (channel_id.startswith("UC") and index.isdigit() and int(index) < self.channels):
+            self.stats["not_found"] += 1
+            return web.Response(status=404, text="Not Found")
+
+        etag, body = self._feed(int(index))
+        if self.etags and request.headers.get("If-None-Match") == etag:
+            self.stats["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": etag})
+
+        self.stats["ok"] += 1
+        self.stats["bytes"] += len(body)
+        headers = {"ETag": etag} if self.etags else {}
+        return web.Response(body=body, content_type="text/xml", charset="UTF-8", headers=headers)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+    async def handle_reset_stats(self, request: web.Request) -> web.Response:
+        self.reset_stats()
+        return web.json_response(self.stats)
+
+    async def handle_upload(self, request: web.Request) -> web.Response:
+        uploaded = self.upload_share(float(request.query.get("share", "0")))
+        return web.json_response({"uploaded": uploaded})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get(FEED_PATH, self.handle_feed)
+        app.router.add_get("/admin/stats", self.handle_stats)
+        app.router.add_post("/admin/reset-stats", self.handle_reset_stats)
+        app.router.add_post("/admin/upload", self.handle_upload)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.port = self.runner.addresses[0][1]  # the real port when 0 was asked for
+        if self.uploads_per_minute:
+            self.uploader = asyncio.create_task(self._upload_continuously())
+
+    async def close(self):
+        if self.uploader:
+            self.uploader.cancel()
+        if self.runner:
+            await self.runner.cleanup()
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--channels", type=int, default=1000)
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8089)
+    arg_parser.add_argument("--latency-ms", type=float, default=0)
+    arg_parser.add_argument("--jitter-ms", type=float, default=0)
+    arg_parser.add_argument("--error-rate", type=float, default=0)
+    arg_parser.add_argument("--no-etags", action="store_true")
+    arg_parser.add_argument("--uploads-per-minute", type=float, default=0)
+    args = arg_parser.parse_args()
+
+    server = FeedServer(
+        args.channels,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        etags=not args.no_etags,
+        uploads_per_minute=args.uploads_per_minute,
+        host=args.host,
+        port=args.port,
+    )
+    await server.start()
+    print(f"Serving {args.channels} feeds at {server.url}?channel_id=UC{0:022d}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,35 @@
+-- Data_Files/Migrations/003_time_channel_clocks.sql
+-- Replaces the fixed date/India/Japan columns of public.time_channel_config
+-- with one row per clock channel, so a server can show any timezones and
+-- date formats (/t2-add-clock, /t3-remove-clock, /t4-list-clocks).
+--
+-- Existing setups are carried over with the formats the bot used before.
+-- Run while the bot is stopped.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.time_channel_clocks (
+    channel_id  TEXT PRIMARY KEY,
+    guild_id    TEXT NOT NULL,
+    timezone    TEXT NOT NULL,               -- IANA name, e.g. 'Asia/Kolkata'
+    name_format TEXT NOT NULL,               -- strftime pattern for the channel name
+    updated_at  TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS time_channel_clocks_guild_idx
+    ON public.time_channel_clocks (guild_id);
+
+INSERT INTO public.time_channel_clocks (channel_id, guild_id, timezone, name_format)
+SELECT date_channel_id, guild_id, 'Asia/Kolkata', '📅 %d %B, %Y'
+  FROM public.time_channel_config WHERE date_channel_id IS NOT NULL
+UNION ALL
+SELECT india_channel_id, guild_id, 'Asia/Kolkata', '🇮🇳 IST %H:%M'
+  FROM public.time_channel_config WHERE india_channel_id IS NOT NULL
+UNION ALL
+SELECT japan_channel_id, guild_id, 'Asia/Tokyo', '🇯🇵 JST %H:%M'
+  FROM public.time_channel_config WHERE japan_channel_id IS NOT NULL
+ON CONFLICT (channel_id) DO NOTHING;
+
+DROP TABLE public.time_channel_config;
+
+COMMIT;
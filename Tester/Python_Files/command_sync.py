@@ -0,0 +1,148 @@
+# Python_Files/command_sync.py
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+import asyncpg
+import hashlib
+import json
+import logging
+import os
+import queries
+
+log = logging.getLogger(__name__)
+
+# Set to a server ID (e.g. the Tester deployment's test server) to sync the
+# commands to that one server only. Guild commands update instantly, while
+# global ones can take a while to reach every client.
+COMMAND_SYNC_GUILD_ID = os.getenv("COMMAND_SYNC_GUILD_ID")
+
+# tree_hash() of a tree without commands.
+EMPTY_TREE_HASH = hashlib.sha256(b"[]").hexdigest()
+
+
+def tree_hash(tree: app_commands.CommandTree, guild: discord.abc.Snowflake = None) -> str:
+    """
+    Hashes the command definitions as they would be sent to Discord, so any
+    change to a name, description, option or permission changes the hash.
+    """
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+        key=lambda command: (command.get("type", 1), command["name"]),
+    )
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class CommandSyncManager:
+    """
+    Pushes the slash commands to Discord only when they have changed.
+
+    The hash of the last synced command tree is stored per application and
+    scope ("global" or "guild:<id>"). On startup the current tree is hashed
+    and synced only if the hash differs, so restarts and reconnects do not
+    re-upload every command. Owners can force a sync with /g7-sync-commands.
+
+    In guild mode the global commands are cleared once, so a server does not
+    show every command twice after an earlier global sync; the empty global
+    tree is then remembered under the "global" scope.
+    """
+
+    def __init__(self, bot: commands.Bot, pool: asyncpg.Pool, guild_id: str = COMMAND_SYNC_GUILD_ID):
+        self.bot = bot
+        self.pool = pool
+        self.guild = discord.Object(id=int(guild_id)) if guild_id else None
+        self.checked = False
+        log.info(
+            f"Command sync initialized ({f'guild {guild_id} only' if self.guild else 'global'})."
+        )
+
+    @property
+    def scope(self) -> str:
+        return f"guild:{self.guild.id}" if self.guild else "global"
+
+    async def _stored_hash(self, application_id: int, scope: str):
+        try:
+            return await self.pool.fetchval(
+                queries.COMMAND_SYNC_HASH_GET, application_id, scope
+            )
+        except asyncpg.PostgresError as e:
+            # e.g. 004_command_sync_state.sql not applied yet: sync every time
+            log.warning(f"Could not read the stored command hash: {e}")
+            return None
+
+    async def _store_hash(self, application_id: int, scope: str, tree_hash: str):
+        try:
+            await self.pool.execute(
+                queries.COMMAND_SYNC_HASH_UPSERT, application_id, scope, tree_hash
+            )
+        except asyncpg.PostgresError as e:
+            log.warning(f"Could not store the command hash: {e}")
+
+    async def _clear_global_commands(self, application_id: int):
+        """Guild mode: removes global commands left by an earlier global sync, once."""
+        if await self._stored_hash(application_id, "global") == EMPTY_TREE_HASH:
+            return
+        # The guild already holds copies of these (copy_global_to).
+        self.bot.tree.clear_commands(guild=None)
+        await self.bot.tree.sync()
+        log.info("🧹 Cleared the global slash commands; they are synced to the guild only.")
+        await self._store_hash(application_id, "global", EMPTY_TREE_HASH)
+
+    async def sync(self, force: bool = False) -> int:
+        """
+        Syncs the command tree if it changed since the last sync (or `force`).
+        Returns the number of commands pushed, or -1 when nothing had changed.
+        """
+        application_id = self.bot.application_id
+        if self.guild:
+            self.bot.tree.copy_global_to(guild=self.guild)
+            await self._clear_global_commands(application_id)
+        current = tree_hash(self.bot.tree, self.guild)
+
+        if not force and await self._stored_hash(application_id, self.scope) == current:
+            log.info(f"✅ Slash commands unchanged ({self.scope}); skipping sync.")
+            return -1
+
+        synced = await self.bot.tree.sync(guild=self.guild)
+        log.info(f"✅ Synced {len(synced)} slash commands ({self.scope}).")
+        await self._store_hash(application_id, self.scope, current)
+        return len(synced)
+
+    async def sync_on_ready(self):
+        """
+        Checks the tree once per process; on_ready also fires after reconnects.
+        A failed sync is tried again on the next ready event.
+        """
+        if self.checked:
+            return
+        try:
+            await self.sync()
+            self.checked = True
+        except Exception as e:
+            log.error(f"❌ Failed to sync slash commands (retrying on the next ready event): {e}")
+
+    def register_commands(self):
+        """Registers the owner-only command to force a sync."""
+
+        async def is_bot_owner(interaction: discord.Interaction) -> bool:
+            return await self.bot.is_owner(interaction.user)
+
+        @self.bot.tree.command(
+            name="g7-sync-commands",
+            description="Re-uploads all slash commands to Discord (Bot Owner only).",
+        )
+        @app_commands.check(is_bot_owner)
+        async def sync_commands(interaction: discord.Interaction):
+            await interaction.response.defer(ephemeral=True)
+            try:
+                count = await self.sync(force=True)
+                await interaction.followup.send(
+                    f"✅ Synced {count} slash commands ({self.scope})."
+                )
+            except discord.HTTPException as e:
+                log.error(f"Error during /sync-commands: {e}")
+                await interaction.followup.send(f"❌ Sync failed: {e}")
+
+        log.info("🔄 Command sync command registered.")
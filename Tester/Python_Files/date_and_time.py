@@ -1,119 +1,156 @@
 # Python_Files/date_and_time.py
 
 import discord
+from discord import app_commands
 from discord.ext import tasks, commands
-import pytz
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import asyncpg
 import logging
 import asyncio
+import os
+from rename_scheduler import RenameScheduler
+import metrics
+import queries
+import sharding
 
 log = logging.getLogger(__name__)
 
+# At most this many guilds are renamed in parallel on each tick.
+RENAME_CONCURRENCY = int(os.getenv("TIME_RENAME_CONCURRENCY", "5"))
+MAX_CLOCKS_PER_GUILD = 10
+
+# The channels created by /t1-setup-time-channels.
+DATE_FORMAT = "📅 %d %B, %Y"
+PRESET_TIMEZONE_DATE = "Asia/Kolkata"
+PRESET_CLOCKS = {
+    "india": ("Asia/Kolkata", "🇮🇳 IST %H:%M"),
+    "japan": ("Asia/Tokyo", "🇯🇵 JST %H:%M"),
+}
+
 
 class DateTimeManager:
+    """
+    Keeps clock channels named after the current time or date in their zone.
+
+    Every clock is a channel with a timezone and a strftime name format, so a
+    date channel is just a clock whose format has no time in it. Clocks that
+    share a (timezone, format) pair are grouped, and each tick formats every
+    group's name once, however many guilds use it.
+    """
+
     def __init__(self, bot: commands.Bot, pool: asyncpg.Pool):
         self.bot = bot
         self.pool = pool
-        self.server_configs = {}
+        self.clocks = {}  # channel_id -> (guild_id, timezone, name_format)
+        self.clock_groups = {}  # (timezone, name_format) -> {channel_id, ...}
+        self.timezones = {}  # timezone name -> pytz timezone, filled on first use
+        self.renamer = RenameScheduler(max_parallel=RENAME_CONCURRENCY)
+        metrics.QUEUE_DEPTH.track(lambda: len(self.renamer.pending), "channel_renames")
         log.info("Date and Time system initialized.")
         self.bot.add_listener(self.on_ready, "on_ready")
 
     async def _load_configs_from_db(self):
         async with self.pool.acquire() as conn:
-            rows = await conn.fetch("SELECT * FROM public.time_channel_config;")
-            for row in rows:
-                self.server_configs[int(row["guild_id"])] = {
-                    "date": int(row["date_channel_id"]),
-                    "india": int(row["india_channel_id"]),
-                    "japan": int(row["japan_channel_id"]),
-                }
-        log.info(f"Loaded {len(self.server_configs)} time configurations.")
+            rows = await conn.fetch(queries.CLOCKS_ALL)
+        for row in rows:
+            if not sharding.owns_guild(row["guild_id"]):
+                continue  # renamed by the process running that guild's shard
+            # Saved timezones were validated by /t2-add-clock, so loading skips
+            # the check and pytz is not imported until the first clock update.
+            self._add_clock(
+                row["guild_id"],
+                row["channel_id"],
+                row["timezone"],
+                row["name_format"],
+                validate=False,
+            )
+        log.info(
+            f"Loaded {len(self.clocks)} clock channels in {len(self.clock_groups)} distinct formats."
+        )
 
     async def start(self):
         await self._load_configs_from_db()
         self.update_time_channels.start()
-        self.update_date_daily.start()
 
     async def on_ready(self):
         await asyncio.sleep(2)  # give cache time
-        await self.update_date_channel()
-
-    # -------------------- DATE MANAGEMENT --------------------
-
-    async def update_date_channel(self):
-        tz_india = pytz.timezone("Asia/Kolkata")
-        date_str = datetime.now(tz_india).strftime("%d %B, %Y")
-        new_name = f"📅 {date_str}"
+        await self.update_clock_channels()
+
+    # -------------------- CLOCK REGISTRY --------------------
+
+    def _get_timezone(self, tz_name: str):
+        tz = self.timezones.get(tz_name)
+        if tz is None:
+            import pytz  # deferred: loading it is only needed once a clock is formatted
+
+            tz = self.timezones[tz_name] = pytz.timezone(tz_name)
+        return tz
+
+    def _add_clock(
+        self, guild_id: int, channel_id: int, tz_name: str, name_format: str, validate: bool = True
+    ):
+        if validate:
+            self._get_timezone(tz_name)  # raises UnknownTimeZoneError for bad names
+        self._remove_clock(channel_id)
+        self.clocks[channel_id] = (guild_id, tz_name, name_format)
+        self.clock_groups.setdefault((tz_name, name_format), set()).add(channel_id)
+
+    def _remove_clock(self, channel_id: int):
+        clock = self.clocks.pop(channel_id, None)
+        if clock is None:
+            return
+        _, tz_name, name_format = clock
+        group = self.clock_groups[(tz_name, name_format)]
+        group.discard(channel_id)
+        if not group:
+            del self.clock_groups[(tz_name, name_format)]
+
+    def format_name(self, tz_name: str, name_format: str, now: datetime = None) -> str:
+        now = now or datetime.now(timezone.utc)
+        return now.astimezone(self._get_timezone(tz_name)).strftime(name_format)
 
-        log.info(f"Updating date channels to {new_name}")
+    # -------------------- TIME MANAGEMENT --------------------
 
-        for guild_id, config in self.server_configs.items():
+    async def update_clock_channels(self):
+        now = datetime.now(timezone.utc)
+        for (tz_name, name_format), channel_ids in list(self.clock_groups.items()):
             try:
-                channel = self.bot.get_channel(config["date"])
-                if channel and channel.name != new_name:
-                    await channel.edit(name=new_name)
-            except discord.Forbidden:
-                log.warning(f"No permission to edit date channel in guild {guild_id}.")
-            except Exception as e:
-                log.error(f"Error updating date channel for guild {guild_id}: {e}")
-
-    @tasks.loop(hours=24)
-    async def update_date_daily(self):
-        await self.update_date_channel()
-
-    @update_date_daily.before_loop
-    async def before_update_date_daily(self):
-        await self.bot.wait_until_ready()
-
-        tz_india = pytz.timezone("Asia/Kolkata")
-        now = datetime.now(tz_india)
-
-        # Calculate next midnight
-        next_midnight = (now + timedelta(days=1)).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        seconds_to_wait = (next_midnight - now).total_seconds()
-
+                name = self.format_name(tz_name, name_format, now)
+            except KeyError:  # pytz.UnknownTimeZoneError
+                log.warning(
+                    f"Skipping {len(channel_ids)} clock channel(s) with unknown timezone {tz_name}."
+                )
+                for channel_id in list(channel_ids):
+                    self._remove_clock(channel_id)
+                continue
+            for channel_id in channel_ids:
+                channel = self.bot.get_channel(channel_id)
+                if channel:
+                    self.renamer.request(channel, name)
+
+        report = await self.renamer.flush()
         log.info(
-            f"Aligning date updates. Waiting {seconds_to_wait} seconds "
-            f"until first run at {next_midnight.strftime('%Y-%m-%d %H:%M:%S')} IST"
+            f"⏱️ Clock channel update ({len(self.clock_groups)} distinct names): "
+            f"{self.renamer.format_report(report)}"
         )
 
-        await asyncio.sleep(seconds_to_wait)
-        log.info("Date alignment complete. Starting daily date loop.")
-
-    # -------------------- TIME MANAGEMENT --------------------
+    async def update_guild_clocks(self, guild_id: int) -> dict:
+        """Renames one guild's clock channels right away, e.g. after /t1."""
+        now = datetime.now(timezone.utc)
+        for channel_id, (_, tz_name, name_format) in self.guild_clocks(guild_id).items():
+            channel = self.bot.get_channel(channel_id)
+            if channel:
+                self.renamer.request(channel, self.format_name(tz_name, name_format, now))
+        return await self.renamer.flush(guild_id=guild_id)
 
     @tasks.loop(minutes=10)
+    @metrics.timed_loop("update_time_channels")
     async def update_time_channels(self):
-        log.info("Updating time channels...")
-
-        tz_india = pytz.timezone("Asia/Kolkata")
-        tz_japan = pytz.timezone("Asia/Tokyo")
-
-        india_time = datetime.now(tz_india).strftime("%H:%M")
-        japan_time = datetime.now(tz_japan).strftime("%H:%M")
-
-        india_name = f"🇮🇳 IST {india_time}"
-        japan_name = f"🇯🇵 JST {japan_time}"
-
-        for guild_id, config in self.server_configs.items():
-            try:
-                # India
-                india_channel = self.bot.get_channel(config["india"])
-                if india_channel and india_channel.name != india_name:
-                    await india_channel.edit(name=india_name)
-
-                # Japan
-                japan_channel = self.bot.get_channel(config["japan"])
-                if japan_channel and japan_channel.name != japan_name:
-                    await japan_channel.edit(name=japan_name)
-
-            except discord.Forbidden:
-                log.warning(f"No permission to edit time channels in guild {guild_id}.")
-            except Exception as e:
-                log.error(f"Error updating time channels for guild {guild_id}: {e}")
+        log.info("Updating clock channels...")
+        try:
+            await self.update_clock_channels()
+        except Exception as e:
+            log.error(f"Error updating clock channels: {e}", exc_info=True)
 
     @update_time_channels.before_loop
     async def before_update_time_channels(self):
@@ -132,16 +169,44 @@ class DateTimeManager:
         await asyncio.sleep(seconds_to_wait)
         log.info("Time alignment complete. Starting 10-minute loop.")
 
-    # -------------------- SLASH COMMAND --------------------
+    # -------------------- DATABASE --------------------
+
+    async def save_clock(
+        self, guild: discord.Guild, channel_id: int, tz_name: str, name_format: str
+    ):
+        async with self.pool.acquire() as conn:
+            await conn.execute(queries.CLOCK_UPSERT, channel_id, guild.id, tz_name, name_format)
+        self._add_clock(guild.id, channel_id, tz_name, name_format)
+
+    def guild_clocks(self, guild_id: int) -> dict:
+        return {
+            channel_id: clock
+            for channel_id, clock in self.clocks.items()
+            if clock[0] == guild_id
+        }
+
+    # -------------------- SLASH COMMANDS --------------------
 
     def register_commands(self):
 
+        async def timezone_autocomplete(
+            interaction: discord.Interaction, current: str
+        ) -> list:
+            import pytz
+
+            current = current.lower()
+            return [
+                app_commands.Choice(name=tz_name, value=tz_name)
+                for tz_name in pytz.common_timezones
+                if current in tz_name.lower()
+            ][:25]
+
         @self.bot.tree.command(
             name="t1-setup-time-channels",
             description="Set up date, India time, and Japan time channels.",
         )
-        @discord.app_commands.checks.has_permissions(manage_channels=True)
-        @discord.app_commands.describe(
+        @app_commands.checks.has_permissions(manage_channels=True)
+        @app_commands.describe(
             date_channel="Voice channel for current date.",
             india_channel="Voice channel for India time (IST).",
             japan_channel="Voice channel for Japan time (JST).",
@@ -153,37 +218,13 @@ class DateTimeManager:
             japan_channel: discord.VoiceChannel,
         ):
             await interaction.response.defer(ephemeral=True)
-            guild_id = interaction.guild_id
-
-            query = """
-                INSERT INTO public.time_channel_config 
-                  (guild_id, guild_name, date_channel_id, india_channel_id, japan_channel_id, updated_at)
-                VALUES ($1, $2, $3, $4, $5, NOW())
-                ON CONFLICT (guild_id) DO UPDATE SET
-                  guild_name = EXCLUDED.guild_name,
-                  date_channel_id = EXCLUDED.date_channel_id,
-                  india_channel_id = EXCLUDED.india_channel_id,
-                  japan_channel_id = EXCLUDED.japan_channel_id,
-                  updated_at = NOW();
-            """
-
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    query,
-                    str(guild_id),
-                    interaction.guild.name,
-                    str(date_channel.id),
-                    str(india_channel.id),
-                    str(japan_channel.id),
-                )
+            guild = interaction.guild
 
-            self.server_configs[guild_id] = {
-                "date": date_channel.id,
-                "india": india_channel.id,
-                "japan": japan_channel.id,
-            }
+            await self.save_clock(guild, date_channel.id, PRESET_TIMEZONE_DATE, DATE_FORMAT)
+            await self.save_clock(guild, india_channel.id, *PRESET_CLOCKS["india"])
+            await self.save_clock(guild, japan_channel.id, *PRESET_CLOCKS["japan"])
 
-            await self.update_date_channel()
+            await self.update_guild_clocks(guild.id)
 
             await interaction.followup.send(
                 f"✅ Time channels configured!\n"
@@ -193,4 +234,116 @@ class DateTimeManager:
                 ephemeral=True,
             )
 
+        @self.bot.tree.command(
+            name="t2-add-clock",
+            description="Show the time or date of any timezone in a channel's name.",
+        )
+        @app_commands.checks.has_permissions(manage_channels=True)
+        @app_commands.describe(
+            channel="Voice channel to rename every 10 minutes.",
+            timezone="IANA timezone, e.g. Europe/London or America/New_York.",
+            name_format="Channel name with strftime codes, e.g. '🇬🇧 London %H:%M' or '📅 %d %B, %Y'.",
+        )
+        @app_commands.autocomplete(timezone=timezone_autocomplete)
+        async def add_clock(
+            interaction: discord.Interaction,
+            channel: discord.VoiceChannel,
+            timezone: str,
+            name_format: str = "🕒 %H:%M",
+        ):
+            await interaction.response.defer(ephemeral=True)
+            guild = interaction.guild
+
+            import pytz
+
+            if timezone not in pytz.all_timezones_set:
+                await interaction.followup.send(
+                    f"❌ Unknown timezone `{timezone}`. Pick one from the suggestions.",
+                    ephemeral=True,
+                )
+                return
+
+            if (
+                channel.id not in self.clocks
+                and len(self.guild_clocks(guild.id)) >= MAX_CLOCKS_PER_GUILD
+            ):
+                await interaction.followup.send(
+                    f"❌ This server already has {MAX_CLOCKS_PER_GUILD} clock channels. Remove one with `/t3-remove-clock` first.",
+                    ephemeral=True,
+                )
+                return
+
+            try:
+                preview = self.format_name(timezone, name_format)
+            except ValueError:
+                preview = ""
+            if not preview.strip() or len(preview) > 100:
+                await interaction.followup.send(
+                    "❌ That format gives an empty or too long (over 100 characters) channel name.",
+                    ephemeral=True,
+                )
+                return
+
+            await self.save_clock(guild, channel.id, timezone, name_format)
+            self.renamer.request(channel, preview)
+            await self.renamer.flush(guild_id=guild.id)
+
+            await interaction.followup.send(
+                f"✅ {channel.mention} now shows `{timezone}` as **{preview}**.",
+                ephemeral=True,
+            )
+
+        @self.bot.tree.command(
+            name="t3-remove-clock",
+            description="Stop updating a clock or date channel.",
+        )
+        @app_commands.checks.has_permissions(manage_channels=True)
+        @app_commands.describe(channel="The clock channel to stop updating.")
+        async def remove_clock(
+            interaction: discord.Interaction, channel: discord.VoiceChannel
+        ):
+            await interaction.response.defer(ephemeral=True)
+
+            async with self.pool.acquire() as conn:
+                result = await conn.execute(
+                    queries.CLOCK_DELETE,
+                    interaction.guild_id,
+                    channel.id,
+                )
+            self._remove_clock(channel.id)
+            self.renamer.forget(channel.id)
+
+            if result == "DELETE 0":
+                await interaction.followup.send(
+                    f"⚠️ {channel.mention} is not a clock channel.", ephemeral=True
+                )
+            else:
+                await interaction.followup.send(
+                    f"✅ {channel.mention} will no longer be updated.", ephemeral=True
+                )
+
+        @self.bot.tree.command(
+            name="t4-list-clocks",
+            description="List this server's clock and date channels.",
+        )
+        async def list_clocks(interaction: discord.Interaction):
+            clocks = self.guild_clocks(interaction.guild_id)
+            if not clocks:
+                await interaction.response.send_message(
+                    "ℹ️ No clock channels configured. Use `/t2-add-clock` to add one.",
+                    ephemeral=True,
+                )
+                return
+
+            lines = [
+                f"<#{channel_id}> → `{tz_name}` · **{self.format_name(tz_name, name_format)}**"
+                for channel_id, (_, tz_name, name_format) in clocks.items()
+            ]
+            embed = discord.Embed(
+                title="⏰ Clock Channels",
+                description="\n".join(lines),
+                color=discord.Color.blue(),
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
         log.info("Date & Time commands registered.")
@@ -0,0 +1,66 @@
+# Python_Files/feed_cache.py
+
+from collections import OrderedDict
+import asyncio
+import time
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """
+    A size-bounded TTL cache of parsed feeds, shared by the poller and the
+    slash commands.
+
+    - Entries expire `ttl` seconds after they were fetched
+    - Once `max_entries` is reached, the least recently used entry is evicted
+    - Concurrent requests for the same key share a single in-flight fetch
+
+    Loaders return `(feed, error)`; only successful results (no error) are
+    cached, so a failed fetch is retried by the next caller.
+    """
+
+    def __init__(self, ttl: float = 120, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (fetched_at, feed)
+        self.in_flight = {}  # key -> asyncio.Task
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, loader):
+        """Returns `(feed, error)` for a key, calling `loader()` only on a miss."""
+        if entry := self.entries.get(key):
+            fetched_at, feed = entry
+            if time.monotonic() - fetched_at < self.ttl:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return feed, None
+            del self.entries[key]
+
+        task = self.in_flight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(loader())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda t: self._store(key, t))
+        else:
+            self.hits += 1
+
+        # Shield the shared fetch so one cancelled caller doesn't cancel it for the others.
+        return await asyncio.shield(task)
+
+    def _store(self, key: str, task: asyncio.Task):
+        self.in_flight.pop(key, None)
+        if task.cancelled() or task.exception():
+            return
+        feed, error = task.result()
+        if error is None and feed is not None:
+            self.entries[key] = (time.monotonic(), feed)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key: str):
+        self.entries.pop(key, None)
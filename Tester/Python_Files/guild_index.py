@@ -0,0 +1,149 @@
+# Python_Files/guild_index.py
+
+import discord
+from bisect import bisect_left, insort
+from collections import namedtuple
+import math
+import logging
+
+log = logging.getLogger(__name__)
+
+# A guild run by another shard process, as listed for /g3-serverlist.
+GuildSummary = namedtuple("GuildSummary", "id name member_count")
+
+
+class GuildIndex:
+    """
+    The bot's guilds, kept sorted by name as they join, leave or get renamed.
+
+    Keys are `(casefolded name, guild ID)` in a sorted list maintained with
+    bisect, so updates are O(log n) searches instead of a full re-sort and a
+    name prefix maps to one contiguous slice of the list.
+    """
+
+    def __init__(self):
+        self.keys = []  # sorted [(casefolded name, guild_id)]
+        self.guilds = {}  # guild_id -> (key, guild)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @staticmethod
+    def _key(guild: discord.Guild) -> tuple:
+        return (guild.name.casefold(), guild.id)
+
+    def rebuild(self, guilds):
+        self.guilds = {guild.id: (self._key(guild), guild) for guild in guilds}
+        self.keys = sorted(key for key, _ in self.guilds.values())
+
+    def add(self, guild: discord.Guild):
+        self.remove(guild.id)
+        key = self._key(guild)
+        self.guilds[guild.id] = (key, guild)
+        insort(self.keys, key)
+
+    def remove(self, guild_id: int):
+        entry = self.guilds.pop(guild_id, None)
+        if entry is None:
+            return
+        index = bisect_left(self.keys, entry[0])
+        if index < len(self.keys) and self.keys[index] == entry[0]:
+            del self.keys[index]
+
+    def select(
+        self, name_prefix: str = None, min_members: int = None, max_members: int = None
+    ) -> list:
+        """Returns the IDs of matching guilds in name order."""
+        start, end = 0, len(self.keys)
+        if name_prefix:
+            prefix = name_prefix.casefold()
+            start = bisect_left(self.keys, (prefix,))
+            end = bisect_left(self.keys, (prefix + "\U0010ffff",), lo=start)
+
+        ids = [guild_id for _, guild_id in self.keys[start:end]]
+        if min_members is None and max_members is None:
+            return ids
+
+        low = min_members if min_members is not None else 0
+        high = max_members if max_members is not None else math.inf
+        return [
+            guild_id
+            for guild_id in ids
+            if low <= (self.guilds[guild_id][1].member_count or 0) <= high
+        ]
+
+    def get(self, guild_id: int):
+        entry = self.guilds.get(guild_id)
+        return entry[1] if entry else None
+
+
+class GuildListView(discord.ui.View):
+    """Pages through a pre-selected list of guild IDs, building one page at a time."""
+
+    PAGE_SIZE = 20
+
+    def __init__(self, index: GuildIndex, guild_ids: list, title: str, owner_id: int):
+        super().__init__(timeout=300)
+        self.index = index
+        self.guild_ids = guild_ids
+        self.title = title
+        self.owner_id = owner_id
+        self.page = 0
+        self.pages = max(1, math.ceil(len(guild_ids) / self.PAGE_SIZE))
+        self.message = None
+        self._update_buttons()
+
+    def build_embed(self) -> discord.Embed:
+        start = self.page * self.PAGE_SIZE
+        lines = []
+        for guild_id in self.guild_ids[start : start + self.PAGE_SIZE]:
+            guild = self.index.get(guild_id)
+            if guild is None:
+                lines.append(f"- *(left)* (ID: `{guild_id}`)")
+            else:
+                lines.append(
+                    f"- **{guild.name}** (ID: `{guild.id}`) · {guild.member_count or 0} members"
+                )
+
+        embed = discord.Embed(
+            title=self.title,
+            description="\n".join(lines) or "No servers match these filters.",
+            color=discord.Color.blurple(),
+        )
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages}")
+        return embed
+
+    def _update_buttons(self):
+        self.first_page.disabled = self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.last_page.disabled = self.page >= self.pages - 1
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        self.page = max(0, min(page, self.pages - 1))
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.owner_id
+
+    async def on_timeout(self):
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(emoji="⏮️", style=discord.ButtonStyle.secondary)
+    async def first_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, 0)
+
+    @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.primary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary)
+    async def last_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.pages - 1)
@@ -54,7 +54,8 @@ class HelpManager:
                     "`/y2-setup-youtube-notifications` → Set up notifications for a YT channel.\n"
                     "`/y3-disable-youtube-notifications` → Stop notifications for a YT channel.\n"
                     "`/y4-bulk-seed-all-videos` → [ADMIN] Seed existing videos for a channel (bulk).\n"
-                    "`/y5-test-rss-feed` → [ADMIN] Test a channel's RSS feed and preview what would be processed."
+                    "`/y5-test-rss-feed` → [ADMIN] Test a channel's RSS feed and preview what would be processed.\n"
+                    "`/y6-feed-health` → Show polling intervals and feed health for this server's channels."
                 ),
                 inline=False,
             )
@@ -78,7 +79,10 @@ class HelpManager:
             embed.add_field(
                 name="⏰ Time & Date Channels",
                 value=(
-                    "`/t1-setup-time-channels` → Set up date, India, and Japan time channels."
+                    "`/t1-setup-time-channels` → Set up date, India, and Japan time channels.\n"
+                    "`/t2-add-clock` → Show any timezone's time or date in a channel name.\n"
+                    "`/t3-remove-clock` → Stop updating a clock channel.\n"
+                    "`/t4-list-clocks` → List this server's clock channels."
                 ),
                 inline=False,
             )
@@ -96,10 +100,11 @@ class HelpManager:
                 embed.add_field(
                     name="👑 Owner Commands",
                     value=(
-                        "`/g3-serverlist` → Lists all servers the bot is in.\n"
+                        "`/g3-serverlist` → Browse servers (filter by name prefix or member count).\n"
                         "`/g4-leaveserver` → Force the bot to leave a server.\n"
                         "`/g5-banguild` → Ban a server from using the bot.\n"
-                        "`/g6-unbanguild` → Unban a server."
+                        "`/g6-unbanguild` → Unban a server.\n"
+                        "`/g7-sync-commands` → Re-upload the slash commands to Discord."
                     ),
                     inline=False,
                 )
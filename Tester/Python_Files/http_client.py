@@ -0,0 +1,126 @@
+# Python_Files/http_client.py
+
+from types import SimpleNamespace
+import aiohttp
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+# --- Connection Pool Configuration ---
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_DNS_CACHE_SECONDS = int(os.getenv("HTTP_DNS_CACHE_SECONDS", "300"))
+HTTP_KEEPALIVE_SECONDS = int(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+
+# --- Timeouts ---
+# Each kind of request gets an explicit budget instead of a bare `timeout=10`.
+FEED_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5, sock_read=8)
+PAGE_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=3, sock_read=4)
+HUB_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5, sock_read=8)
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+
+# aiohttp only decodes brotli when a brotli package is installed.
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class HttpClient:
+    """
+    The one aiohttp client used for all of the bot's own outbound HTTP
+    (RSS feeds, YouTube pages, the WebSub hub). Discord traffic is handled
+    by discord.py and does not go through here.
+
+    - Pooled connections, capped overall and per host
+    - DNS results cached for HTTP_DNS_CACHE_SECONDS
+    - Idle connections kept alive for HTTP_KEEPALIVE_SECONDS
+    - gzip (and brotli, when available) accepted
+    - Per-host request timing collected through aiohttp tracing
+    """
+
+    def __init__(self):
+        self.session = None
+        # host -> {"requests", "errors", "total_seconds", "max_seconds"}
+        self.stats = {}
+
+    async def start(self):
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            use_dns_cache=True,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=DEFAULT_TIMEOUT,
+            headers={
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "User-Agent": "SupporterBot (+https://github.com/Shabdprakash-Thakkar/Discord_BOT)",
+            },
+            trace_configs=[trace],
+        )
+        log.info(
+            f"🌐 HTTP client ready (pool {HTTP_POOL_LIMIT}, {HTTP_POOL_LIMIT_PER_HOST}/host, encodings: {ACCEPT_ENCODING})."
+        )
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+            for host, host_stats in self.stats.items():
+                log.info(f"HTTP stats for {host}: {self.format_stats(host_stats)}")
+
+    def get(self, url: str, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.session.post(url, **kwargs)
+
+    @staticmethod
+    def format_stats(host_stats: dict) -> str:
+        average_ms = 1000 * host_stats["total_seconds"] / max(host_stats["requests"], 1)
+        return (
+            f"{host_stats['requests']} requests, {host_stats['errors']} errors, "
+            f"avg {average_ms:.0f} ms, max {1000 * host_stats['max_seconds']:.0f} ms"
+        )
+
+    # --- Request Timing ---
+
+    def _record(self, host: str, seconds: float, error: bool):
+        host_stats = self.stats.setdefault(
+            host, {"requests": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        )
+        host_stats["requests"] += 1
+        host_stats["errors"] += error
+        host_stats["total_seconds"] += seconds
+        host_stats["max_seconds"] = max(host_stats["max_seconds"], seconds)
+
+    async def _on_request_start(
+        self, session, context: SimpleNamespace, params: aiohttp.TraceRequestStartParams
+    ):
+        context.started_at = time.perf_counter()
+
+    async def _on_request_end(
+        self, session, context: SimpleNamespace, params: aiohttp.TraceRequestEndParams
+    ):
+        # Time to response headers; body streaming is up to the caller.
+        self._record(
+            params.url.host,
+            time.perf_counter() - context.started_at,
+            error=params.response.status >= 400,
+        )
+
+    async def _on_request_exception(
+        self, session, context: SimpleNamespace, params: aiohttp.TraceRequestExceptionParams
+    ):
+        self._record(params.url.host, time.perf_counter() - context.started_at, error=True)
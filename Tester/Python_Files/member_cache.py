@@ -0,0 +1,63 @@
+# Python_Files/member_cache.py
+
+import discord
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+# --- Member Cache Configuration ---
+# discord.py's default ("all", chunking on) keeps every member of every
+# server in memory and downloads them all before the bot is ready. For
+# large servers, "voice" with chunking off keeps only members in voice
+# channels, and handlers fetch a member when a role check needs one.
+# MEMBER_CACHE_FLAGS is "all", "none" or a comma list of flags: voice, joined.
+MEMBER_CACHE_FLAGS = os.getenv("MEMBER_CACHE_FLAGS", "all")
+CHUNK_GUILDS_AT_STARTUP = os.getenv("CHUNK_GUILDS_AT_STARTUP", "true").lower() == "true"
+
+
+def parse_cache_flags(spec: str) -> discord.MemberCacheFlags:
+    spec = spec.replace(" ", "").lower()
+    if spec == "all":
+        return discord.MemberCacheFlags.all()
+    if spec in ("", "none"):
+        return discord.MemberCacheFlags.none()
+    return discord.MemberCacheFlags(**{flag: True for flag in spec.split(",")})
+
+
+def bot_options() -> dict:
+    """Keyword arguments for the bot's member cache and startup chunking."""
+    return {
+        "member_cache_flags": parse_cache_flags(MEMBER_CACHE_FLAGS),
+        "chunk_guilds_at_startup": CHUNK_GUILDS_AT_STARTUP,
+    }
+
+
+def describe() -> str:
+    return f"member cache {MEMBER_CACHE_FLAGS}, chunking at startup {'on' if CHUNK_GUILDS_AT_STARTUP else 'off'}"
+
+
+async def resolve_member(guild: discord.Guild, user) -> discord.Member:
+    """
+    Returns `user` as a member of `guild`: as is when it already is one (a
+    message author or voice state member), else from the cache, else fetched
+    over REST. None if they are not in the server.
+    """
+    if isinstance(user, discord.Member):
+        return user
+    user_id = getattr(user, "id", user)
+    member = guild.get_member(user_id)
+    if member is not None:
+        return member
+    try:
+        return await guild.fetch_member(user_id)
+    except discord.NotFound:
+        return None
+
+
+async def all_members(guild: discord.Guild) -> list:
+    """Every member of `guild`, requesting them from the gateway when the cache is partial."""
+    if guild.chunked:
+        return guild.members
+    log.info(f"Requesting the member list of {guild.name} ({guild.id}) from Discord...")
+    return await guild.chunk(cache=False)
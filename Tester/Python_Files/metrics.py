@@ -0,0 +1,313 @@
+# Python_Files/metrics.py
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+import contextlib
+import functools
+import logging
+import os
+import time
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+# --- Metrics Endpoint Configuration ---
+# Metrics are always recorded; they are only served when METRICS_PORT is set.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Seconds; covers a fast cache hit through a slow full poll.
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+)
+
+REGISTRY = []
+
+
+class Metric:
+    """
+    Base for the three metric types, kept deliberately small: recording is a
+    dict lookup and an add, and all formatting happens at scrape time.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}  # label values tuple -> value
+        REGISTRY.append(self)
+
+    def _labels(self, labelvalues: tuple, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(str(value))}"'
+            for name, value in zip(self.labelnames, labelvalues)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self):
+        for labelvalues, value in self.values.items():
+            yield f"{self.name}{self._labels(labelvalues)} {_number(value)}"
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1):
+        self.values[labelvalues] = self.values.get(labelvalues, 0) + amount
+
+
+class Gauge(Metric):
+    """A gauge that is either set directly or read from callbacks at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self.callbacks = {}  # label values tuple -> callable returning a number
+
+    def set(self, value: float, *labelvalues):
+        self.values[labelvalues] = value
+
+    def track(self, callback, *labelvalues):
+        """Reads `callback()` on every scrape, e.g. a queue's current depth."""
+        self.callbacks[labelvalues] = callback
+
+    def samples(self):
+        for labelvalues, callback in list(self.callbacks.items()):
+            try:
+                self.values[labelvalues] = callback()
+            except Exception as e:
+                log.debug(f"Metric callback for {self.name}{labelvalues} failed: {e}")
+        yield from super().samples()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues):
+        series = self.values.get(labelvalues)
+        if series is None:
+            # [per-bucket counts (+Inf last), sum, count]
+            series = self.values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        for labelvalues, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                labels = self._labels(labelvalues, f'le="{le}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{self._labels(labelvalues)} {_number(total)}"
+            yield f"{self.name}_count{self._labels(labelvalues)} {count}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# --- The Bot's Metrics ---
+
+LISTENER_SECONDS = Histogram(
+    "supporter_listener_seconds", "Time spent in event listeners.", ("event",)
+)
+COMMAND_SECONDS = Histogram(
+    "supporter_command_seconds",
+    "Time from a slash command arriving to it finishing.",
+    ("command", "status"),
+)
+LOOP_SECONDS = Histogram(
+    "supporter_loop_seconds", "Duration of one background loop iteration.", ("loop",)
+)
+HANDLER_ERRORS = Counter(
+    "supporter_handler_errors_total",
+    "Exceptions escaping listeners and loop iterations.",
+    ("kind", "name"),
+)
+GATEWAY_EVENTS = Counter(
+    "supporter_events_total", "Events dispatched by discord.py.", ("event",)
+)
+POOL_ACQUIRE_SECONDS = Histogram(
+    "supporter_db_pool_acquire_seconds",
+    "Time spent waiting for a database connection.",
+    ("scope",),
+)
+POOL_CONNECTIONS = Gauge(
+    "supporter_db_pool_connections", "Database pool connections by state.", ("state",)
+)
+QUEUE_DEPTH = Gauge(
+    "supporter_queue_depth", "Items waiting in the bot's internal queues.", ("queue",)
+)
+STARTUP_SECONDS = Gauge(
+    "supporter_startup_seconds", "Duration of each phase of the last startup.", ("phase",)
+)
+
+
+# --- Instrumentation Helpers ---
+
+
+def instrument_listener(event: str, func):
+    """Wraps an event listener so each call is timed under `event`."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            HANDLER_ERRORS.inc("listener", event)
+            raise
+        finally:
+            LISTENER_SECONDS.observe(time.perf_counter() - started, event)
+
+    return wrapper
+
+
+def timed_loop(name: str):
+    """Decorator for `tasks.loop` bodies; place it below `@tasks.loop(...)`."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                HANDLER_ERRORS.inc("loop", name)
+                raise
+            finally:
+                LOOP_SECONDS.observe(time.perf_counter() - started, name)
+
+        return wrapper
+
+    return decorator
+
+
+def command_started(interaction):
+    interaction.extras["metrics_started_at"] = time.perf_counter()
+
+
+def command_finished(interaction, status: str):
+    started = interaction.extras.get("metrics_started_at")
+    if started is None or interaction.command is None:
+        return
+    COMMAND_SECONDS.observe(
+        time.perf_counter() - started, interaction.command.qualified_name, status
+    )
+
+
+class StartupTimer:
+    """
+    Times the phases of startup for STARTUP_SECONDS and one summary log line.
+
+    Phases may overlap: those started together with asyncio.gather are timed
+    separately, so they add up to more than the wall-clock total.
+    """
+
+    def __init__(self, started: float = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases = {}  # phase -> seconds, in completion order
+        self.running = {}  # phase -> perf_counter at its start
+
+    def begin(self, phase: str):
+        self.running[phase] = time.perf_counter()
+
+    def end(self, phase: str):
+        started = self.running.pop(phase, None)
+        if started is not None:
+            self.record(phase, time.perf_counter() - started)
+
+    def record(self, phase: str, seconds: float):
+        self.phases[phase] = seconds
+        STARTUP_SECONDS.set(seconds, phase)
+
+    @contextlib.contextmanager
+    def phase(self, phase: str):
+        self.begin(phase)
+        try:
+            yield
+        finally:
+            self.end(phase)
+
+    async def timed(self, phase: str, awaitable):
+        """Awaits `awaitable` as `phase`; for timing each coroutine of a gather."""
+        with self.phase(phase):
+            return await awaitable
+
+    def report(self) -> str:
+        total = time.perf_counter() - self.started
+        STARTUP_SECONDS.set(total, "total")
+        parts = ", ".join(
+            f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in self.phases.items()
+        )
+        return f"{total:.2f} s ({parts})"
+
+
+# --- HTTP Endpoint ---
+
+
+class MetricsServer:
+    """Serves the registry in Prometheus text format at /metrics."""
+
+    def __init__(self, host: str = METRICS_HOST, port: int = METRICS_PORT):
+        self.host = host
+        self.port = port
+        self.runner = None
+
+    async def start(self):
+        if not self.port:
+            log.info("Metrics endpoint disabled (set METRICS_PORT to enable).")
+            return
+        from aiohttp import web  # only loaded when the endpoint is enabled
+
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        log.info(f"📈 Metrics available at http://{self.host}:{self.port}/metrics")
+
+    async def close(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def handle_metrics(self, request: "web.Request") -> "web.Response":
+        from aiohttp import web
+
+        return web.Response(text=render(), content_type="text/plain", charset="utf-8")
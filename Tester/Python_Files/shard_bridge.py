@@ -0,0 +1,145 @@
+# Python_Files/shard_bridge.py
+
+import asyncio
+import json
+import logging
+import uuid
+import queries
+import sharding
+
+log = logging.getLogger(__name__)
+
+# NOTIFY payloads are limited to 8000 bytes; `chunked` keeps replies below this.
+MAX_PAYLOAD_BYTES = 7000
+LISTENER_RETRY_SECONDS = 30
+
+
+def chunked(items: list, key: str, base: dict) -> list:
+    """
+    Splits `items` over payloads `{**base, key: [...], "part": i, "parts": n}`
+    that each fit in one NOTIFY. Always returns at least one payload.
+    """
+    budget = MAX_PAYLOAD_BYTES - len(json.dumps(base, ensure_ascii=False).encode()) - 64
+    chunks, current, size = [], [], 0
+    for item in items:
+        item_size = len(json.dumps(item, ensure_ascii=False).encode()) + 2
+        if current and size + item_size > budget:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(item)
+        size += item_size
+    chunks.append(current)
+    return [
+        {**base, key: chunk, "part": index, "parts": len(chunks)}
+        for index, chunk in enumerate(chunks)
+    ]
+
+
+class ShardBridge:
+    """
+    Messages between the bot's shard processes over Postgres LISTEN/NOTIFY.
+
+    Managers register a handler per channel with `on()`. Each process holds
+    one pool connection that LISTENs on those channels, so a message sent
+    with `notify()` reaches every process, the sender included. A handler
+    gets the decoded payload and returns a list of reply payloads, or None.
+    `request()` sends a message with a one-off reply channel and collects
+    the replies until `done(replies)` holds or `timeout` passes.
+
+    Only used when the bot is sharded; unsharded, callers act locally.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.handlers = {}  # channel -> async handler(payload) -> list | None
+        self.messages = asyncio.Queue()
+        self.listener = None
+
+    def on(self, channel: str, handler):
+        self.handlers[channel] = handler
+
+    def start(self):
+        if sharding.SHARD_COUNT and self.handlers:
+            self.listener = asyncio.create_task(self.listen())
+
+    async def close(self):
+        if self.listener:
+            self.listener.cancel()
+            await asyncio.gather(self.listener, return_exceptions=True)
+
+    async def notify(self, channel: str, payload: dict):
+        await self.pool.execute(
+            queries.SHARD_NOTIFY, channel, json.dumps(payload, ensure_ascii=False)
+        )
+
+    async def request(
+        self, channel: str, payload: dict, timeout: float, done=bool
+    ) -> list:
+        """Sends `payload` on `channel` and returns the replies that came back in time."""
+        reply_channel = f"shard_reply_{uuid.uuid4().hex}"
+        replies = []
+        complete = asyncio.Event()
+
+        def on_reply(connection, pid, channel, raw):
+            replies.append(json.loads(raw))
+            if done(replies):
+                complete.set()
+
+        async with self.pool.acquire() as conn:
+            await conn.add_listener(reply_channel, on_reply)
+            try:
+                await conn.execute(
+                    queries.SHARD_NOTIFY,
+                    channel,
+                    json.dumps({**payload, "reply_to": reply_channel}, ensure_ascii=False),
+                )
+                await asyncio.wait_for(complete.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                await conn.remove_listener(reply_channel, on_reply)
+        return list(replies)
+
+    async def listen(self):
+        """Holds the LISTEN connection; reconnects after LISTENER_RETRY_SECONDS if it is lost."""
+        while True:
+            lost = asyncio.Event()
+
+            def on_lost(connection):
+                lost.set()
+                self.messages.put_nowait(None)
+
+            try:
+                async with self.pool.acquire() as conn:
+                    conn.add_termination_listener(on_lost)
+                    try:
+                        for channel in self.handlers:
+                            await conn.add_listener(channel, self._queue_message)
+                        log.info(f"Listening for {len(self.handlers)} shard message channel(s).")
+                        while (message := await self.messages.get()) is not None:
+                            await self.handle(*message)
+                    finally:
+                        # A lost connection is already back in the pool.
+                        if not lost.is_set():
+                            conn.remove_termination_listener(on_lost)
+                            for channel in self.handlers:
+                                await conn.remove_listener(channel, self._queue_message)
+                log.warning("Shard bridge connection was lost; reconnecting.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"Shard bridge listener failed: {e}")
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+    def _queue_message(self, connection, pid, channel, payload):
+        self.messages.put_nowait((channel, payload))
+
+    async def handle(self, channel: str, raw: str):
+        try:
+            payload = json.loads(raw)
+            replies = await self.handlers[channel](payload)
+            if replies and payload.get("reply_to"):
+                for reply in replies:
+                    await self.notify(payload["reply_to"], reply)
+        except Exception as e:
+            log.error(f"Error handling a {channel} message from a shard process: {e}")
@@ -1,11 +1,17 @@
 # Python_Files/supporter.py
 
+import time
+
+STARTED_AT = time.perf_counter()  # before the heavy imports, for the startup report
+
 import discord
+from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
 import os
 import logging
 import asyncpg
+import asyncio
 from datetime import datetime, timezone
 
 # --- Basic Setup ---
@@ -25,10 +31,23 @@ from help import HelpManager
 from owner_actions import OwnerActionsManager
 from level import LevelManager
 from youtube_notification import YouTubeManager
+from command_sync import CommandSyncManager
+import sharding
+import member_cache
+from http_client import HttpClient
+from database import InstrumentedPool
+from shard_bridge import ShardBridge
+import metrics
+import queries
+
+startup = metrics.StartupTimer(STARTED_AT)
+startup.record("imports", time.perf_counter() - STARTED_AT)
 
 # --- Bot Configuration ---
 TOKEN = os.getenv("DISCORD_TOKEN")
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Connections opened at startup; the pool grows to 20 on demand.
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -37,50 +56,149 @@ intents.members = True
 intents.voice_states = True
 
 
-class SupporterBot(commands.Bot):
-    """A custom bot class to hold our database connection and managers."""
+class SupporterTree(app_commands.CommandTree):
+    """Command tree that stamps each interaction's start time for the command metrics."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        metrics.command_started(interaction)
+        return True
+
+
+# With SHARD_COUNT set the same bot runs a range of shards (see sharding.py).
+BotBase = commands.AutoShardedBot if sharding.SHARD_COUNT else commands.Bot
+
+
+class SupporterBot(BotBase):
+    """A custom bot class to hold our database connection, HTTP client and managers."""
 
     def __init__(self):
-        super().__init__(command_prefix="!", intents=intents, help_command=None)
+        # (event name, listener) -> its timing wrappers, so remove_listener still finds them.
+        self.instrumented_listeners = {}
+        super().__init__(
+            command_prefix="!",
+            intents=intents,
+            help_command=None,
+            tree_cls=SupporterTree,
+            **sharding.bot_options(),
+            **member_cache.bot_options(),
+        )
         self.pool = None
+        self.http_client = HttpClient()
+        self.metrics_server = metrics.MetricsServer()
+
+    # --- Metrics Hooks ---
+
+    def dispatch(self, event_name: str, /, *args, **kwargs):
+        metrics.GATEWAY_EVENTS.inc(event_name)
+        super().dispatch(event_name, *args, **kwargs)
+
+    def add_listener(self, func, /, name: str = discord.utils.MISSING):
+        name = func.__name__ if name is discord.utils.MISSING else name
+        wrapper = metrics.instrument_listener(name, func)
+        self.instrumented_listeners.setdefault((name, func), []).append(wrapper)
+        super().add_listener(wrapper, name)
+
+    def remove_listener(self, func, /, name: str = discord.utils.MISSING):
+        name = func.__name__ if name is discord.utils.MISSING else name
+        wrappers = self.instrumented_listeners.get((name, func))
+        if not wrappers:
+            return super().remove_listener(func, name)
+        super().remove_listener(wrappers.pop(), name)
+        if not wrappers:
+            del self.instrumented_listeners[(name, func)]
+
+    def event(self, coro, /):
+        return super().event(metrics.instrument_listener(coro.__name__, coro))
 
     async def setup_hook(self):
         """This function is called once the bot is ready, before it connects to Discord."""
-        log.info("Bot is setting up...")
-
-        # 1. Connect to the PostgreSQL database
-        try:
-            self.pool = await asyncpg.create_pool(DATABASE_URL, max_size=20)
-            log.info("✅ Successfully connected to the PostgreSQL database.")
-        except Exception as e:
-            log.critical(f"❌ CRITICAL: Could not connect to the database: {e}")
+        log.info(f"Bot is setting up ({sharding.describe()}, {member_cache.describe()})...")
+
+        startup.end("login")
+
+        # 1. Connect to the database and open the HTTP client (RSS feeds, YouTube
+        # pages, WebSub) and the metrics endpoint, all at the same time
+        results = await asyncio.gather(
+            startup.timed(
+                "database",
+                asyncpg.create_pool(
+                    DATABASE_URL,
+                    min_size=DB_POOL_MIN_SIZE,
+                    max_size=20,
+                    **queries.pool_options(),
+                ),
+            ),
+            startup.timed("http_client", self.http_client.start()),
+            startup.timed("metrics_server", self.metrics_server.start()),
+            return_exceptions=True,
+        )
+        if isinstance(results[0], Exception):
+            log.critical(f"❌ CRITICAL: Could not connect to the database: {results[0]}")
             await self.close()
             return
-
-        # 2. Initialize and start all managers
+        self.pool = InstrumentedPool(results[0])
+        self.shard_bridge = ShardBridge(self.pool.scoped("shard_bridge"))
+        log.info("✅ Successfully connected to the PostgreSQL database.")
+        if isinstance(results[1], Exception):
+            raise results[1]
+        if isinstance(results[2], Exception):
+            log.error(f"❌ Could not start the metrics endpoint: {results[2]}")
+
+        # 2. Initialize all managers and register their slash commands
         log.info("Initializing feature managers...")
-        self.datetime_manager = DateTimeManager(self, self.pool)
-        self.notext_manager = NoTextManager(self, self.pool)
-        self.help_manager = HelpManager(self)
-        self.owner_manager = OwnerActionsManager(self, self.pool)
-        self.level_manager = LevelManager(self, self.pool)
-        self.youtube_manager = YouTubeManager(self, self.pool)
-
-        await self.datetime_manager.start()
-        await self.notext_manager.start()
-        await self.level_manager.start()
-        await self.youtube_manager.start()
-
-        # 3. Register slash commands from all managers
-        self.datetime_manager.register_commands()
-        self.notext_manager.register_commands()
-        self.help_manager.register_commands()
-        self.owner_manager.register_commands()
-        self.level_manager.register_commands()
-        self.youtube_manager.register_commands()
+        with startup.phase("managers"):
+            # Each manager gets its own scope so database stats show who ran what.
+            self.datetime_manager = DateTimeManager(self, self.pool.scoped("date_and_time"))
+            self.notext_manager = NoTextManager(self, self.pool.scoped("no_text"))
+            self.help_manager = HelpManager(self)
+            self.owner_manager = OwnerActionsManager(self, self.pool.scoped("owner_actions"))
+            self.level_manager = LevelManager(self, self.pool.scoped("level"))
+            self.youtube_manager = YouTubeManager(self, self.pool.scoped("youtube"))
+            self.command_sync = CommandSyncManager(self, self.pool.scoped("command_sync"))
+
+            self.datetime_manager.register_commands()
+            self.notext_manager.register_commands()
+            self.help_manager.register_commands()
+            self.owner_manager.register_commands()
+            self.level_manager.register_commands()
+            self.youtube_manager.register_commands()
+            self.command_sync.register_commands()
+
+        # 3. Start the managers. They do not depend on each other, so their
+        # startup queries run in parallel; one failing does not stop the rest.
+        managers = {
+            "owner_actions": self.owner_manager,
+            "date_and_time": self.datetime_manager,
+            "no_text": self.notext_manager,
+            "level": self.level_manager,
+            "youtube": self.youtube_manager,
+        }
+        results = await asyncio.gather(
+            *(startup.timed(f"start.{name}", manager.start()) for name, manager in managers.items()),
+            return_exceptions=True,
+        )
+        for name, result in zip(managers, results):
+            if isinstance(result, Exception):
+                log.error(f"❌ Failed to start the {name} manager: {result}", exc_info=result)
+        # Listens on the channels the managers registered while starting.
+        self.shard_bridge.start()
 
+        startup.begin("gateway")
         log.info("All managers have been initialized.")
 
+    async def close(self):
+        """Stops background work and releases the HTTP client and database pool on shutdown."""
+        log.info("Shutting down...")
+        if shard_bridge := getattr(self, "shard_bridge", None):
+            await shard_bridge.close()
+        if youtube_manager := getattr(self, "youtube_manager", None):
+            await youtube_manager.close()
+        await self.http_client.close()
+        await self.metrics_server.close()
+        if self.pool:
+            await self.pool.close()
+        await super().close()
+
 
 bot = SupporterBot()
 
@@ -90,12 +208,12 @@ async def on_ready():
     """Event that runs when the bot is fully connected and ready."""
     log.info("=" * 50)
     log.info(f"✅ Logged in as {bot.user} (ID: {bot.user.id})")
+    if "gateway" in startup.running:  # first READY only, not reconnects
+        startup.end("gateway")
+        log.info(f"⏱️ Startup took {startup.report()}")
 
-    try:
-        synced = await bot.tree.sync()
-        log.info(f"✅ Synced {len(synced)} slash commands globally.")
-    except Exception as e:
-        log.error(f"❌ Failed to sync slash commands: {e}")
+    if sharding.is_primary():  # commands are shared by all shards
+        await bot.command_sync.sync_on_ready()
 
     log.info(f"🚀 Bot is connected to {len(bot.guilds)} server(s):")
     for guild in bot.guilds:
@@ -107,17 +225,8 @@ async def on_ready():
 @bot.event
 async def on_guild_join(guild: discord.Guild):
     log.info(f"🔥 Joined a new server: {guild.name} (ID: {guild.id})")
-    if await bot.owner_manager.is_guild_banned(guild.id):
-        log.warning(f"🚫 Bot joined banned server {guild.name}. Leaving immediately.")
-        try:
-            if guild.owner:
-                await guild.owner.send(
-                    "This bot is not permitted in this server and has been removed."
-                )
-        except discord.Forbidden:
-            log.warning("Could not notify server owner about the ban.")
-        finally:
-            await guild.leave()
+    if await bot.owner_manager.check_guild_banned(guild.id):
+        await bot.owner_manager.leave_banned_guild(guild)
 
 
 # --- GENERAL COMMANDS ---
@@ -129,7 +238,7 @@ async def on_guild_join(guild: discord.Guild):
 async def show_config(interaction: discord.Interaction):
     """Displays a comprehensive summary of all bot configurations for the server."""
     await interaction.response.defer(ephemeral=True)
-    guild_id = str(interaction.guild.id)
+    guild_id = interaction.guild.id
 
     embed = discord.Embed(
         title=f"🤖 Bot Configuration for {interaction.guild.name}",
@@ -140,14 +249,14 @@ async def show_config(interaction: discord.Interaction):
     async with bot.pool.acquire() as conn:
         # 1. Leveling System Config
         level_notify_ch_id = await conn.fetchval(
-            "SELECT channel_id FROM public.level_notify_channel WHERE guild_id = $1",
+            queries.LEVEL_NOTIFY_CHANNEL_GET,
             guild_id,
         )
         level_reset_days = await conn.fetchval(
-            "SELECT days FROM public.auto_reset WHERE guild_id = $1", guild_id
+            queries.AUTO_RESET_DAYS, guild_id
         )
         level_rewards_count = await conn.fetchval(
-            "SELECT COUNT(*) FROM public.level_roles WHERE guild_id = $1", guild_id
+            queries.LEVEL_ROLE_COUNT, guild_id
         )
         level_value = (
             f"**Notifications:** {f'<#{level_notify_ch_id}>' if level_notify_ch_id else 'Not Set'}\n"
@@ -158,7 +267,7 @@ async def show_config(interaction: discord.Interaction):
 
         # 2. YouTube Notifications Config
         yt_configs = await conn.fetch(
-            "SELECT yt_channel_name, target_channel_id FROM public.youtube_notification_config WHERE guild_id = $1",
+            queries.YT_GUILD_TARGETS,
             guild_id,
         )
         if yt_configs:
@@ -174,19 +283,19 @@ async def show_config(interaction: discord.Interaction):
 
         # 3. Channel Restrictions Config
         no_text_ch = await conn.fetch(
-            "SELECT channel_id FROM public.no_text_channels WHERE guild_id = $1",
+            queries.NO_TEXT_CHANNELS,
             guild_id,
         )
         no_discord_ch = await conn.fetch(
-            "SELECT channel_id FROM public.no_discord_links_channels WHERE guild_id = $1",
+            queries.NO_DISCORD_LINKS_CHANNELS,
             guild_id,
         )
         no_links_ch = await conn.fetch(
-            "SELECT channel_id FROM public.no_links_channels WHERE guild_id = $1",
+            queries.NO_LINKS_CHANNELS,
             guild_id,
         )
         bypass_roles_count = await conn.fetchval(
-            "SELECT COUNT(*) FROM public.bypass_roles WHERE guild_id = $1", guild_id
+            queries.BYPASS_ROLE_COUNT, guild_id
         )
 
         restriction_value = ""
@@ -204,25 +313,31 @@ async def show_config(interaction: discord.Interaction):
         )
 
         # 4. Time Channels Config
-        time_cfg = await conn.fetchrow(
-            "SELECT date_channel_id, india_channel_id, japan_channel_id FROM public.time_channel_config WHERE guild_id = $1",
+        clocks = await conn.fetch(
+            queries.CLOCKS_FOR_GUILD,
             guild_id,
         )
-        if time_cfg:
-            time_value = (
-                f"📅 <#{time_cfg['date_channel_id']}> | "
-                f"🇮🇳 <#{time_cfg['india_channel_id']}> | "
-                f"🇯🇵 <#{time_cfg['japan_channel_id']}>"
+        if clocks:
+            time_value = "\n".join(
+                f"<#{clock['channel_id']}> `{clock['timezone']}`" for clock in clocks
             )
             embed.add_field(name="⏰ Time Channels", value=time_value, inline=False)
 
     await interaction.followup.send(embed=embed)
 
 
+@bot.event
+async def on_app_command_completion(
+    interaction: discord.Interaction, command: app_commands.Command
+):
+    metrics.command_finished(interaction, "ok")
+
+
 @bot.tree.error
 async def on_app_command_error(
     interaction: discord.Interaction, error: discord.app_commands.AppCommandError
 ):
+    metrics.command_finished(interaction, "error")
     log.error(f"Slash command error for '/{interaction.command.name}': {error}")
     message = "❌ An unexpected error occurred. Please try again later."
     if isinstance(error, discord.app_commands.MissingPermissions):
@@ -243,6 +358,7 @@ def run_bot():
     if not DATABASE_URL:
         log.critical("❌ Error: DATABASE_URL not found in .env file!")
         return
+    startup.begin("login")
     bot.run(TOKEN, log_handler=None)
 
 
@@ -7,12 +7,87 @@ from datetime import datetime, timezone, timedelta
 import asyncio
 import asyncpg
 import logging
-import aiohttp
-import feedparser
+import os
+import re
+from feed_parser import FeedParser
+from http_client import FEED_TIMEOUT, PAGE_TIMEOUT
+from websub import WebSubReceiver, DEFAULT_HUB_URL
+from youtube_scheduler import PollScheduler
+from notification_queue import NotificationQueue
+from feed_cache import FeedCache
+import metrics
+import queries
+import sharding
 
 log = logging.getLogger(__name__)
 IST = timezone(timedelta(hours=5, minutes=30))
 
+# Videos older than this are logged silently instead of being announced.
+NEW_VIDEO_MAX_AGE_DAYS = 2
+
+# --- Log Retention Configuration ---
+# Monthly partitions of youtube_notification_logs older than this are dropped.
+# A pruned video can only reappear in a feed as an old video (it was logged
+# more than the retention window ago), so it is re-logged without a
+# notification. That only holds while the window is far beyond
+# NEW_VIDEO_MAX_AGE_DAYS, hence the floor.
+LOG_RETENTION_MIN_DAYS = 30
+LOG_RETENTION_DAYS = max(
+    LOG_RETENTION_MIN_DAYS, int(os.getenv("YOUTUBE_LOG_RETENTION_DAYS", "180"))
+)
+LOG_PARTITIONS_AHEAD = 2
+LOG_PARTITION_PREFIX = "youtube_notification_logs_p"
+# The TO value of pg_get_expr(relpartbound), e.g. "... TO ('2025-02-01 00:00:00+00')".
+LOG_PARTITION_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+# --- Polling Configuration ---
+# Benchmarks point this at a local stand-in server (Benchmarks/fake_feed_server.py).
+RSS_FEED_URL = "https://www.youtube.com/feeds/videos.xml?channel_id={}"
+# Each channel is polled on its own interval, derived from its upload history.
+POLL_MIN_MINUTES = int(os.getenv("YOUTUBE_POLL_MIN_MINUTES", "5"))
+POLL_MAX_MINUTES = int(os.getenv("YOUTUBE_POLL_MAX_MINUTES", "120"))
+POLL_GAP_DIVISOR = float(os.getenv("YOUTUBE_POLL_GAP_DIVISOR", "24"))
+# Channels that upload regularly are never polled less often than this.
+POLL_BASELINE_MINUTES = int(os.getenv("YOUTUBE_POLL_BASELINE_MINUTES", "15"))
+# Feeds that fail this many times in a row are backed off exponentially.
+BREAKER_THRESHOLD = int(os.getenv("YOUTUBE_BREAKER_THRESHOLD", "3"))
+BREAKER_MAX_BACKOFF_HOURS = int(os.getenv("YOUTUBE_BREAKER_MAX_BACKOFF_HOURS", "24"))
+
+# --- Feed Parsing Configuration ---
+# "thread" (default), "process" for large subscription counts, or "inline".
+FEED_PARSE_MODE = os.getenv("YOUTUBE_FEED_PARSE_MODE", "thread")
+FEED_PARSE_WORKERS = int(os.getenv("YOUTUBE_FEED_PARSE_WORKERS", "0")) or None
+# How many due feeds are downloaded at the same time in one poll tick.
+POLL_CONCURRENCY = int(os.getenv("YOUTUBE_POLL_CONCURRENCY", "10"))
+
+# --- Feed Cache Configuration ---
+# Parsed feeds are shared by the poller and the /y commands for a short while.
+FEED_CACHE_TTL_SECONDS = int(os.getenv("YOUTUBE_FEED_CACHE_TTL_SECONDS", "120"))
+FEED_CACHE_SIZE = int(os.getenv("YOUTUBE_FEED_CACHE_SIZE", "1024"))
+
+# --- Handle Resolution Configuration ---
+# Resolved @handle → channel ID mappings are kept in Postgres for this long.
+HANDLE_CACHE_DAYS = int(os.getenv("YOUTUBE_HANDLE_CACHE_DAYS", "30"))
+CHANNEL_ID_MARKER = b'"channelId":"'
+
+# --- WebSub (push) Configuration ---
+# Push mode is enabled when a public callback URL is configured.
+WEBSUB_CALLBACK_URL = os.getenv("YOUTUBE_WEBSUB_CALLBACK_URL")
+WEBSUB_SECRET = os.getenv("YOUTUBE_WEBSUB_SECRET", "")
+WEBSUB_HUB_URL = os.getenv("YOUTUBE_WEBSUB_HUB_URL", DEFAULT_HUB_URL)
+WEBSUB_HOST = os.getenv("YOUTUBE_WEBSUB_HOST", "0.0.0.0")
+WEBSUB_PORT = int(os.getenv("YOUTUBE_WEBSUB_PORT", "8080"))
+# With push enabled, polling only acts as a slow safety net.
+WEBSUB_FALLBACK_POLL_MINUTES = int(os.getenv("YOUTUBE_WEBSUB_FALLBACK_POLL_MINUTES", "60"))
+
+# --- Shard Process Configuration ---
+# WebSub and the poll scheduler live in the primary shard process. The other
+# processes hand it /y2 and /y3 changes and /y6 queries over the shard
+# bridge (shard_bridge.py) on these channels.
+CONFIG_CHANGED_CHANNEL = "youtube_config_changed"
+HEALTH_REQUEST_CHANNEL = "youtube_health_request"
+HEALTH_REPLY_TIMEOUT = 5  # seconds a secondary waits for the primary's answer
+
 
 class YouTubeManager:
     """Manages YouTube notifications using RSS feeds (more reliable than API)."""
@@ -20,79 +95,344 @@ class YouTubeManager:
     def __init__(self, bot: commands.Bot, pool: asyncpg.Pool):
         self.bot = bot
         self.pool = pool
-        self.session = None  # aiohttp session for RSS fetching
+        self.http = bot.http_client  # shared HttpClient for RSS and page fetches
+        self.scheduler = PollScheduler(
+            min_interval=timedelta(minutes=POLL_MIN_MINUTES),
+            max_interval=timedelta(minutes=POLL_MAX_MINUTES),
+            gap_divisor=POLL_GAP_DIVISOR,
+            baseline_interval=timedelta(minutes=POLL_BASELINE_MINUTES),
+            failure_threshold=BREAKER_THRESHOLD,
+            max_backoff=timedelta(hours=BREAKER_MAX_BACKOFF_HOURS),
+        )
+        self.parser = FeedParser(mode=FEED_PARSE_MODE, workers=FEED_PARSE_WORKERS)
+        self.feed_cache = FeedCache(ttl=FEED_CACHE_TTL_SECONDS, max_entries=FEED_CACHE_SIZE)
+        self.notifications = NotificationQueue()
+        metrics.QUEUE_DEPTH.track(self.notifications.depth, "youtube_notifications")
+        metrics.QUEUE_DEPTH.track(self.parser.depth, "feed_parse_batch")
+        self.websub = None
+        # Polling, WebSub and log maintenance are global jobs: with several
+        # shard processes only the primary runs them, for every guild.
+        self.runs_global_jobs = sharding.is_primary()
+        if WEBSUB_CALLBACK_URL and self.runs_global_jobs:
+            if not WEBSUB_SECRET:
+                log.warning(
+                    "YOUTUBE_WEBSUB_CALLBACK_URL is set but YOUTUBE_WEBSUB_SECRET is empty; pushes cannot be verified. WebSub disabled."
+                )
+            else:
+                self.websub = WebSubReceiver(
+                    self,
+                    callback_url=WEBSUB_CALLBACK_URL,
+                    secret=WEBSUB_SECRET,
+                    hub_url=WEBSUB_HUB_URL,
+                    host=WEBSUB_HOST,
+                    port=WEBSUB_PORT,
+                )
         log.info("YouTube Notification system (RSS) has been initialized.")
 
     async def start(self):
         """Initializes and starts the background task."""
-        # Create aiohttp session for RSS requests
-        self.session = aiohttp.ClientSession()
+        if not self.runs_global_jobs:
+            log.info("YouTube polling runs in the primary shard process; not starting it here.")
+            return
+        if sharding.SHARD_COUNT:
+            self.bot.shard_bridge.on(CONFIG_CHANGED_CHANNEL, self.on_config_changed)
+            self.bot.shard_bridge.on(HEALTH_REQUEST_CHANNEL, self.on_health_request)
+        if self.websub:
+            await self.websub.start()
+            fallback = timedelta(minutes=WEBSUB_FALLBACK_POLL_MINUTES)
+            self.scheduler.min_interval = max(self.scheduler.min_interval, fallback)
+            self.scheduler.max_interval = max(self.scheduler.max_interval, fallback)
+            log.info(
+                f"WebSub push enabled; RSS polling every {WEBSUB_FALLBACK_POLL_MINUTES} minutes as fallback."
+            )
         self.check_for_videos.start()
+        self.maintain_log_partitions.start()
 
     async def close(self):
         """Cleanup when bot shuts down."""
-        if self.session:
-            await self.session.close()
+        if self.websub:
+            await self.websub.close()
+        await self.notifications.close()
+        self.parser.close()
 
     # --- RSS Feed Fetching ---
 
     async def fetch_rss_feed(self, yt_channel_id: str):
         """Fetches and parses YouTube RSS feed for a channel."""
-        rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={yt_channel_id}"
+        feed, _ = await self._fetch_rss_feed(yt_channel_id)
+        return feed
+
+    async def _fetch_rss_feed(self, yt_channel_id: str):
+        """
+        Like fetch_rss_feed, but returns (feed, error) so the poller can track failures.
+
+        Goes through the shared feed cache: a feed fetched in the last
+        FEED_CACHE_TTL_SECONDS is reused, and concurrent requests for the
+        same channel are merged into one download.
+        """
+        return await self.feed_cache.get(
+            yt_channel_id, lambda: self._download_rss_feed(yt_channel_id)
+        )
+
+    async def _download_rss_feed(self, yt_channel_id: str):
+        """Downloads and parses a channel's RSS feed, bypassing the cache."""
+        rss_url = RSS_FEED_URL.format(yt_channel_id)
 
         try:
-            async with self.session.get(rss_url, timeout=10) as response:
+            async with self.http.get(rss_url, timeout=FEED_TIMEOUT) as response:
                 if response.status != 200:
                     log.error(
                         f"RSS feed returned status {response.status} for channel {yt_channel_id}"
                     )
-                    return None
+                    return None, f"HTTP {response.status}"
 
-                xml_content = await response.text()
-                # Parse RSS feed (feedparser is synchronous, but fast)
-                feed = await self.bot.loop.run_in_executor(
-                    None, feedparser.parse, xml_content
-                )
-                return feed
+                xml_content = await response.read()
+                # Parse off the event loop (see YOUTUBE_FEED_PARSE_MODE)
+                feed = await self.parser.parse(xml_content)
+                return feed, None
 
         except asyncio.TimeoutError:
             log.error(f"Timeout fetching RSS feed for channel {yt_channel_id}")
-            return None
+            return None, "timeout"
         except Exception as e:
             log.error(f"Error fetching RSS feed for channel {yt_channel_id}: {e}")
-            return None
+            return None, str(e) or type(e).__name__
+
+    # --- Handle Resolution ---
+
+    async def resolve_handle(self, search_term: str):
+        """
+        Resolves an @handle, custom URL or username to a channel ID.
+
+        Repeat lookups are answered from public.youtube_handle_cache. Otherwise
+        the three URL patterns are requested concurrently and each page is
+        streamed only until the channel ID shows up. Results are still taken
+        in priority order (@handle, /c/, /user/), so the answer doesn't depend
+        on which request happens to finish first.
+        """
+        handle = search_term.strip().lower()
+        try:
+            cached = await self.pool.fetchval(
+                queries.YT_HANDLE_CACHE_GET,
+                handle,
+                HANDLE_CACHE_DAYS,
+            )
+            if cached:
+                return cached
+        except asyncpg.PostgresError as e:
+            log.warning(f"Could not read the YouTube handle cache: {e}")
+
+        test_urls = [
+            f"https://www.youtube.com/@{search_term}",
+            f"https://www.youtube.com/c/{search_term}",
+            f"https://www.youtube.com/user/{search_term}",
+        ]
+        lookups = [
+            asyncio.create_task(self._scan_page_for_channel_id(url))
+            for url in test_urls
+        ]
+        channel_id = None
+        try:
+            for lookup in lookups:
+                try:
+                    result = await lookup
+                except Exception:
+                    continue
+                if result and result.startswith("UC"):
+                    channel_id = result
+                    break
+        finally:
+            for lookup in lookups:
+                lookup.cancel()
+
+        if channel_id:
+            try:
+                await self.pool.execute(
+                    queries.YT_HANDLE_CACHE_PUT,
+                    handle,
+                    channel_id,
+                )
+            except asyncpg.PostgresError as e:
+                log.warning(f"Could not store handle '{handle}' in the cache: {e}")
+        return channel_id
+
+    async def _scan_page_for_channel_id(self, url: str):
+        """Streams a YouTube page and stops reading as soon as `"channelId":"...` is complete."""
+        async with self.http.get(url, timeout=PAGE_TIMEOUT, allow_redirects=True) as response:
+            if response.status != 200:
+                return None
+
+            buffer = b""
+            async for chunk in response.content.iter_chunked(16384):
+                buffer += chunk
+                start = buffer.find(CHANNEL_ID_MARKER)
+                if start == -1:
+                    # Keep just enough bytes to catch a marker split across chunks.
+                    buffer = buffer[-(len(CHANNEL_ID_MARKER) - 1) :]
+                    continue
+
+                start += len(CHANNEL_ID_MARKER)
+                end = buffer.find(b'"', start)
+                if end != -1:
+                    return buffer[start:end].decode(errors="ignore")
+                buffer = buffer[start - len(CHANNEL_ID_MARKER) :]
+        return None
 
     def extract_video_info(self, entry):
-        """Extracts video information from RSS feed entry."""
+        """Turns a compact VideoEntry from the feed parser into the dict used for notifications."""
+        return {
+            "video_id": entry.video_id,
+            "title": entry.title,
+            "link": entry.link,
+            "channel_name": entry.author,
+            "published_at": datetime.fromtimestamp(entry.published, timezone.utc),
+        }
+
+    async def log_videos(
+        self,
+        guild_id: int,
+        yt_channel_id: str,
+        video_ids: list,
+        backdate_days: int = 0,
+    ) -> list:
+        """
+        Logs a batch of videos as seen in a single round trip.
+
+        Returns the IDs that were actually inserted (in feed order), so callers
+        can tell new videos apart from ones that were already in the database.
+        """
+        video_ids = list(dict.fromkeys(video_ids))  # de-duplicate, keep order
+        if not video_ids:
+            return []
+
+        # The logs table is partitioned by time, so there is no unique
+        # constraint to conflict on; WHERE NOT EXISTS does the dedupe instead.
+        # The poller, WebSub pushes and /y commands (in any shard process)
+        # can log the same channel at once, so writers for one (guild,
+        # channel) pair are serialized by a transaction-scoped advisory lock.
+        # The insert is a separate statement so that its snapshot is taken
+        # after the lock is granted and sees the previous writer's rows.
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(queries.YT_LOG_LOCK, guild_id, yt_channel_id)
+                rows = await conn.fetch(
+                    queries.YT_LOG_VIDEOS,
+                    guild_id,
+                    yt_channel_id,
+                    video_ids,
+                    backdate_days,
+                )
+        inserted = {row["video_id"] for row in rows}
+        return [video_id for video_id in video_ids if video_id in inserted]
+
+    # --- Log Retention ---
+
+    @tasks.loop(hours=24)
+    @metrics.timed_loop("maintain_log_partitions")
+    async def maintain_log_partitions(self):
+        """
+        Keeps monthly partitions of youtube_notification_logs in shape:
+        creates the next LOG_PARTITIONS_AHEAD months and drops every month
+        that ended more than LOG_RETENTION_DAYS ago.
+        """
         try:
-            video_id = entry.get("yt_videoid")
-            published_str = entry.get("published")
+            now = datetime.now(timezone.utc)
+            month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+            async with self.pool.acquire() as conn:
+                start = month_start
+                for _ in range(LOG_PARTITIONS_AHEAD + 1):
+                    end = (start + timedelta(days=32)).replace(day=1)
+                    await conn.execute(
+                        f"CREATE TABLE IF NOT EXISTS public.{LOG_PARTITION_PREFIX}{start:%Y%m} "
+                        f"PARTITION OF public.youtube_notification_logs "
+                        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+                    )
+                    start = end
+
+                partitions = await conn.fetch(queries.YT_LOG_PARTITIONS)
+                cutoff = now - timedelta(days=LOG_RETENTION_DAYS)
+                for row in partitions:
+                    name = row["relname"]
+                    # Decided on the partition's own upper bound: every row in
+                    # it was logged before that, so no table scan is needed.
+                    upper = LOG_PARTITION_UPPER_BOUND.search(row["bound"] or "")
+                    if not name.startswith(LOG_PARTITION_PREFIX) or not upper:
+                        continue  # the default partition, or not one of ours
+                    if datetime.fromisoformat(upper.group(1)) > cutoff:
+                        continue
+                    await conn.execute(f"DROP TABLE IF EXISTS public.{name}")
+                    log.info(
+                        f"🧹 Dropped YouTube log partition {name} (older than {LOG_RETENTION_DAYS} days)."
+                    )
+        except Exception as e:
+            log.error(f"YouTube log partition maintenance failed: {e}", exc_info=True)
 
-            if not video_id or not published_str:
-                return None
+    @maintain_log_partitions.before_loop
+    async def before_maintain_log_partitions(self):
+        await self.bot.wait_until_ready()
 
-            # Parse publish date
-            published_at = datetime.strptime(published_str, "%Y-%m-%dT%H:%M:%S%z")
-
-            return {
-                "video_id": video_id,
-                "title": entry.get("title", "Untitled"),
-                "link": entry.get(
-                    "link", f"https://www.youtube.com/watch?v={video_id}"
-                ),
-                "channel_name": entry.get("author", "Unknown Channel"),
-                "published_at": published_at,
+    # --- Shard Processes ---
+
+    async def config_changed(self, yt_channel_id: str):
+        """Applies a /y2 or /y3 change to WebSub in the process that runs it."""
+        if self.runs_global_jobs:
+            await self.sync_websub_subscription(yt_channel_id)
+        else:
+            await self.bot.shard_bridge.notify(
+                CONFIG_CHANGED_CHANNEL, {"yt_channel_id": yt_channel_id}
+            )
+
+    async def sync_websub_subscription(self, yt_channel_id: str):
+        """Subscribes a followed channel without a lease; unsubscribes one nobody follows."""
+        if not self.websub:
+            return
+        followed = await self.pool.fetchval(queries.YT_CHANNEL_FOLLOWED, yt_channel_id)
+        if not followed:
+            await self.websub.unsubscribe(yt_channel_id)
+        elif yt_channel_id not in self.websub.leases:
+            await self.websub.subscribe(yt_channel_id)
+
+    def feed_health_snapshot(self, yt_channel_ids: list) -> dict:
+        """The scheduler's view of each channel for /y6, as JSON-friendly values."""
+        now = datetime.now(timezone.utc)
+        snapshot = {}
+        for yt_channel_id in yt_channel_ids:
+            next_due = self.scheduler.next_due.get(yt_channel_id)
+            interval = self.scheduler.intervals.get(yt_channel_id)
+            breaker = self.scheduler.breakers.get(yt_channel_id)
+            snapshot[yt_channel_id] = {
+                "state": breaker.state(now) if breaker else None,
+                "failures": breaker.failures if breaker else 0,
+                # NOTIFY payloads are limited to 8000 bytes.
+                "last_error": (breaker.last_error or "")[:80] if breaker else None,
+                "interval_minutes": interval.total_seconds() / 60 if interval else None,
+                "next_due": next_due.isoformat() if next_due else None,
             }
-        except Exception as e:
-            log.error(f"Error extracting video info from RSS entry: {e}")
-            return None
+        return snapshot
+
+    async def request_feed_health(self, yt_channel_ids: list):
+        """Asks the primary process for its feed_health_snapshot; None if it doesn't answer."""
+        replies = await self.bot.shard_bridge.request(
+            HEALTH_REQUEST_CHANNEL, {"channels": yt_channel_ids}, HEALTH_REPLY_TIMEOUT
+        )
+        return replies[0]["health"] if replies else None
+
+    async def on_config_changed(self, payload: dict):
+        """Shard bridge handler (primary only): a /y2 or /y3 change from another process."""
+        await self.sync_websub_subscription(payload["yt_channel_id"])
+
+    async def on_health_request(self, payload: dict) -> list:
+        """Shard bridge handler (primary only): answers /y6 from another process."""
+        return [{"health": self.feed_health_snapshot(payload["channels"])}]
 
     # --- Core Notification Logic ---
 
-    @tasks.loop(minutes=15)
+    @tasks.loop(minutes=1)
+    @metrics.timed_loop("check_for_videos")
     async def check_for_videos(self):
         """
-        The main loop that checks all configured channels for new videos.
+        The scheduler tick that polls every channel whose poll is due.
 
         How RSS feeds work:
         - YouTube RSS feeds return the ~15 most recent videos
@@ -106,120 +446,163 @@ class YouTubeManager:
         - We only need to check what's currently in the feed
 
         Logic:
-        1. Fetch RSS feed (returns ~15 latest videos)
-        2. Check each video against database
-        3. If NOT in database → NEW video → Check age → Notify if recent
-        4. If in database → Already seen → Skip
+        1. Ask the PollScheduler which channels are due this tick
+        2. Fetch each due RSS feed once (returns ~15 latest videos),
+           even if several guilds follow the channel
+        3. Reschedule the channel from the upload times in its feed
+        4. Log every video in one batch insert per guild (WHERE NOT EXISTS)
+        5. If it was inserted → NEW video → Check age → Notify if recent
+        6. If it already existed → Already seen → Skip
         """
-        log.info("Running YouTube RSS notification check...")
+        configs = await self.pool.fetch(queries.YT_CONFIGS_ENABLED)
+        configs_by_channel = {}
+        for config in configs:
+            configs_by_channel.setdefault(config["yt_channel_id"], []).append(config)
 
-        configs = await self.pool.fetch(
-            "SELECT * FROM public.youtube_notification_config WHERE is_enabled = TRUE"
-        )
-        if not configs:
-            log.info("No active YouTube notification configurations found.")
+        now = datetime.now(timezone.utc)
+        due = self.scheduler.due_channels(list(configs_by_channel), now)
+        if not due:
             return
 
-        for config in configs:
-            guild_id_str = config["guild_id"]
-            yt_channel_id = config["yt_channel_id"]
+        log.info(
+            f"Running YouTube RSS notification check for {len(due)} of {len(configs_by_channel)} channel(s)..."
+        )
 
-            try:
-                # 1. Fetch RSS feed
-                feed = await self.fetch_rss_feed(yt_channel_id)
-                if not feed or not feed.entries:
-                    log.warning(
-                        f"No entries found in RSS feed for channel {yt_channel_id}"
-                    )
-                    continue
+        # Due feeds are fetched concurrently (bounded), which also lets the
+        # process-pool parser batch them.
+        semaphore = asyncio.Semaphore(POLL_CONCURRENCY)
 
-                log.debug(
-                    f"Found {len(feed.entries)} videos in RSS feed for channel {yt_channel_id}"
-                )
+        async def poll(yt_channel_id):
+            async with semaphore:
+                await self._poll_channel(yt_channel_id, configs_by_channel[yt_channel_id])
 
-                # 2. Check ALL videos in feed against database
-                # RSS typically returns the last 15 videos
-                # We process all of them to catch any missed uploads
-                for entry in feed.entries:
-                    video_info = self.extract_video_info(entry)
+        await asyncio.gather(*(poll(yt_channel_id) for yt_channel_id in due))
 
-                    if not video_info:
-                        continue
+    async def _poll_channel(self, yt_channel_id: str, configs: list):
+        try:
+            # 1. Fetch RSS feed
+            feed, error = await self._fetch_rss_feed(yt_channel_id)
+            if error:
+                self.scheduler.record_failure(
+                    yt_channel_id, datetime.now(timezone.utc), error
+                )
+                return
+            if not feed.entries:
+                log.warning(f"No entries found in RSS feed for channel {yt_channel_id}")
+                self.scheduler.reschedule(yt_channel_id, [], datetime.now(timezone.utc))
+                return
 
-                    video_id = video_info["video_id"]
-                    published_at = video_info["published_at"]
+            log.debug(
+                f"Found {len(feed.entries)} videos in RSS feed for channel {yt_channel_id}"
+            )
 
-                    # Calculate video age
-                    age_days = (datetime.now(timezone.utc) - published_at).days
+            # 2. Pick the next poll time from the channel's upload history
+            published_times = [
+                datetime.fromtimestamp(entry.published, timezone.utc)
+                for entry in feed.entries
+            ]
+            interval = self.scheduler.reschedule(
+                yt_channel_id, published_times, datetime.now(timezone.utc)
+            )
+            log.debug(
+                f"Next poll for channel {yt_channel_id} in {interval.total_seconds() / 60:.0f} minutes"
+            )
 
-                    # 3. Check if this video is already in our database
-                    # Fast query thanks to index on (guild_id, yt_channel_id, video_id)
-                    log_exists = await self.pool.fetchval(
-                        "SELECT 1 FROM public.youtube_notification_logs WHERE guild_id = $1 AND yt_channel_id = $2 AND video_id = $3",
-                        guild_id_str,
-                        yt_channel_id,
-                        video_id,
-                    )
+            # 3. Check ALL videos in feed against database, for every guild
+            # RSS typically returns the last 15 videos
+            # We process all of them to catch any missed uploads
+            for config in configs:
+                await self.process_entries(config, feed.entries)
 
-                    if log_exists:
-                        # Already seen this video, skip silently
-                        continue
+        except Exception as e:
+            self.scheduler.postpone(yt_channel_id, datetime.now(timezone.utc))
+            log.error(
+                f"Unexpected error processing YouTube channel {yt_channel_id}: {e}",
+                exc_info=True,
+            )
 
-                    # 4. NEW VIDEO FOUND! This is not in our database yet
-                    # But check if it's actually NEW or just an old video appearing in feed
-                    if age_days > 2:
-                        # This is an old video (>2 days) that somehow appeared in RSS
-                        # Likely: YouTuber made old video public, or RSS glitch
-                        # Action: Log it silently without notifying
-                        log.info(
-                            f"📦 Old video ({age_days} days) found in RSS for guild {guild_id_str}: {video_id} - Logging without notification"
-                        )
-                        await self.pool.execute(
-                            "INSERT INTO public.youtube_notification_logs (guild_id, yt_channel_id, video_id, video_status) VALUES ($1, $2, $3, 'none') ON CONFLICT DO NOTHING",
-                            guild_id_str,
-                            yt_channel_id,
-                            video_id,
-                        )
-                        continue
+    async def process_entries(self, config, entries):
+        """
+        Logs feed entries for one notification config and notifies new uploads.
 
-                    # 5. Actually NEW video (0-2 days old)
-                    log.info(
-                        f"🆕 New video detected for guild {guild_id_str} on channel {yt_channel_id}: {video_id} (uploaded {age_days} days ago)"
-                    )
+        Shared by the RSS poller and the WebSub receiver; the batch insert
+        guarantees each video is announced at most once per guild, whichever
+        path sees it first.
+        """
+        guild_id = config["guild_id"]
+        yt_channel_id = config["yt_channel_id"]
+
+        videos = {}
+        for entry in entries:
+            if entry.video_id not in videos:
+                videos[entry.video_id] = self.extract_video_info(entry)
+
+        # Log the whole feed in one round trip.
+        # Only videos that were NOT already in our database come back,
+        # so the insert doubles as the "already seen?" check.
+        new_video_ids = await self.log_videos(
+            guild_id, yt_channel_id, list(videos)
+        )
 
-                    # Send notification
-                    await self.send_notification(config, video_info)
+        for video_id in new_video_ids:
+            video_info = videos[video_id]
+            age_days = (datetime.now(timezone.utc) - video_info["published_at"]).days
 
-                    # 5. Log to database to prevent future duplicates
-                    await self.pool.execute(
-                        "INSERT INTO public.youtube_notification_logs (guild_id, yt_channel_id, video_id, video_status) VALUES ($1, $2, $3, 'none') ON CONFLICT DO NOTHING",
-                        guild_id_str,
-                        yt_channel_id,
-                        video_id,
-                    )
+            # NEW VIDEO FOUND! Check if it's actually NEW or just an old video appearing in feed
+            if age_days > NEW_VIDEO_MAX_AGE_DAYS:
+                # This is an old video (>2 days) that somehow appeared in RSS
+                # Likely: YouTuber made old video public, or RSS glitch
+                # Action: It is already logged, so skip it without notifying
+                log.info(
+                    f"📦 Old video ({age_days} days) found in RSS for guild {guild_id}: {video_id} - Logging without notification"
+                )
+                continue
 
-                    # Small delay between notifications to avoid Discord rate limits
-                    await asyncio.sleep(2)
+            # Actually NEW video (0-2 days old)
+            log.info(
+                f"🆕 New video detected for guild {guild_id} on channel {yt_channel_id}: {video_id} (uploaded {age_days} days ago)"
+            )
 
+            # Queue notification (delivered by the target channel's worker)
+            self.send_notification(config, video_info)
+
+    async def handle_pushed_entries(self, yt_channel_id: str, entries):
+        """Runs entries pushed by the WebSub hub through every guild following the channel."""
+        # The cached feed predates this upload.
+        self.feed_cache.invalidate(yt_channel_id)
+        configs = await self.pool.fetch(
+            queries.YT_CONFIGS_FOR_CHANNEL,
+            yt_channel_id,
+        )
+        for config in configs:
+            try:
+                await self.process_entries(config, entries)
             except Exception as e:
                 log.error(
-                    f"Unexpected error processing YouTube channel {yt_channel_id}: {e}",
+                    f"Error processing pushed entries for channel {yt_channel_id} in guild {config['guild_id']}: {e}",
                     exc_info=True,
                 )
 
-    async def send_notification(self, config: dict, video_info: dict):
-        """Formats and sends the Discord notification message."""
-        guild = self.bot.get_guild(int(config["guild_id"]))
-        channel = self.bot.get_channel(int(config["target_channel_id"]))
-        if not guild or not channel:
-            return
-
-        role = (
-            guild.get_role(int(config["mention_role_id"]))
-            if config["mention_role_id"]
-            else None
-        )
-        mention = role.mention if role else "@here"
+    def send_notification(self, config: dict, video_info: dict):
+        """Formats the Discord notification message and queues it for its channel."""
+        guild_id = config["guild_id"]
+        channel_id = config["target_channel_id"]
+        if sharding.owns_guild(guild_id):
+            guild = self.bot.get_guild(guild_id)
+            channel = self.bot.get_channel(channel_id)
+            if not guild or not channel:
+                return
+            role = (
+                guild.get_role(config["mention_role_id"])
+                if config["mention_role_id"]
+                else None
+            )
+            mention = role.mention if role else "@here"
+        else:
+            # The guild lives in another shard process, so it is not cached
+            # here; the message goes out over REST to the channel ID instead.
+            channel = self.bot.get_partial_messageable(channel_id, guild_id=guild_id)
+            mention = f"<@&{config['mention_role_id']}>" if config["mention_role_id"] else "@here"
 
         video_id = video_info["video_id"]
         video_url = video_info["link"]
@@ -227,30 +610,15 @@ class YouTubeManager:
         channel_name = video_info["channel_name"]
 
         message = f"🔔 {mention} **{channel_name}** just uploaded a new video!\n\n**{title}**\n{video_url}"
-
-        try:
-            await channel.send(message)
-            log.info(
-                f"✅ Sent notification for video {video_id} to guild {config['guild_id']}"
-            )
-        except discord.Forbidden:
-            log.warning(
-                f"Missing permissions to send YouTube notification in channel {channel.id} (Guild: {guild.id})"
-            )
-        except Exception as e:
-            log.error(f"Failed to send YouTube notification: {e}")
+        self.notifications.enqueue(
+            channel,
+            message,
+            label=f"notification for video {video_id} (guild {config['guild_id']})",
+        )
 
     @check_for_videos.before_loop
     async def before_check_for_videos(self):
-        """Aligns the loop to start on a clean 15-minute mark."""
         await self.bot.wait_until_ready()
-        now = datetime.now(timezone.utc)
-        minutes_to_wait = 15 - (now.minute % 15)
-        seconds_to_wait = (minutes_to_wait * 60) - now.second
-        log.info(
-            f"Aligning YouTube check. Waiting {seconds_to_wait} seconds for first run."
-        )
-        await asyncio.sleep(seconds_to_wait)
 
     # --- Slash Commands ---
 
@@ -291,28 +659,7 @@ class YouTubeManager:
                         .replace("www.youtube.com/", "")
                     )
 
-                    # Try to fetch the RSS feed and extract channel ID from it
-                    test_urls = [
-                        f"https://www.youtube.com/@{search_term}",
-                        f"https://www.youtube.com/c/{search_term}",
-                        f"https://www.youtube.com/user/{search_term}",
-                    ]
-
-                    for test_url in test_urls:
-                        try:
-                            async with self.session.get(
-                                test_url, timeout=5, allow_redirects=True
-                            ) as response:
-                                if response.status == 200:
-                                    html = await response.text()
-                                    # Extract channel ID from HTML
-                                    if '"channelId":"' in html:
-                                        channel_id = html.split('"channelId":"')[
-                                            1
-                                        ].split('"')[0]
-                                        break
-                        except:
-                            continue
+                    channel_id = await self.resolve_handle(search_term)
 
                 if not channel_id or not channel_id.startswith("UC"):
                     await interaction.followup.send(
@@ -325,13 +672,13 @@ class YouTubeManager:
 
                 # Verify the channel exists by fetching its RSS feed
                 feed = await self.fetch_rss_feed(channel_id)
-                if not feed or not feed.feed:
+                if not feed or not feed.title:
                     await interaction.followup.send(
                         f"❌ Could not verify channel with ID `{channel_id}`"
                     )
                     return
 
-                channel_name = feed.feed.get("title", "Unknown Channel")
+                channel_name = feed.title
 
                 embed = discord.Embed(title="🔍 YouTube Channel Found", color=0xFF0000)
                 embed.add_field(name="Channel Name", value=channel_name, inline=False)
@@ -374,27 +721,20 @@ class YouTubeManager:
             try:
                 # Verify the channel exists by fetching its RSS feed
                 feed = await self.fetch_rss_feed(youtube_channel_id)
-                if not feed or not feed.feed:
+                if not feed or not feed.title:
                     await interaction.followup.send(
                         "❌ Could not find a YouTube channel with that ID. Please verify the ID is correct."
                     )
                     return
 
-                yt_channel_name = feed.feed.get("title", "Unknown Channel")
+                yt_channel_name = feed.title
 
-                query = """
-                    INSERT INTO public.youtube_notification_config (guild_id, yt_channel_id, target_channel_id, mention_role_id, guild_name, yt_channel_name, target_channel_name, mention_role_name)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    ON CONFLICT (guild_id, yt_channel_id) DO UPDATE SET
-                      target_channel_id = $3, mention_role_id = $4, updated_at = NOW(),
-                      yt_channel_name = $6, target_channel_name = $7, mention_role_name = $8;
-                """
                 await self.pool.execute(
-                    query,
-                    str(interaction.guild.id),
+                    queries.YT_CONFIG_UPSERT,
+                    interaction.guild.id,
                     youtube_channel_id,
-                    str(notification_channel.id),
-                    str(role_to_mention.id),
+                    notification_channel.id,
+                    role_to_mention.id,
                     interaction.guild.name,
                     yt_channel_name,
                     notification_channel.name,
@@ -411,24 +751,19 @@ class YouTubeManager:
                         log.info(
                             f"Auto-seeding {len(feed.entries)} videos for channel {youtube_channel_id}..."
                         )
-                        for entry in feed.entries:
-                            video_info = self.extract_video_info(entry)
-                            if video_info:
-                                video_id = video_info["video_id"]
-                                result = await self.pool.execute(
-                                    "INSERT INTO public.youtube_notification_logs (guild_id, yt_channel_id, video_id, video_status, notified_at) VALUES ($1, $2, $3, 'none', NOW()) ON CONFLICT DO NOTHING",
-                                    str(interaction.guild.id),
-                                    youtube_channel_id,
-                                    video_id,
-                                )
-                                if "INSERT" in result:
-                                    seeded_count += 1
+                        video_ids = [entry.video_id for entry in feed.entries]
+                        seeded = await self.log_videos(
+                            interaction.guild.id, youtube_channel_id, video_ids
+                        )
+                        seeded_count = len(seeded)
                         log.info(
                             f"✅ Auto-seeded {seeded_count} videos for channel {youtube_channel_id}"
                         )
                 except Exception as seed_error:
                     log.warning(f"Could not auto-seed videos: {seed_error}")
 
+                await self.config_changed(youtube_channel_id)
+
                 await interaction.followup.send(
                     f"✅ **Setup Complete!**\n\n"
                     f"📺 **Channel:** {yt_channel_name}\n"
@@ -454,11 +789,12 @@ class YouTubeManager:
         ):
             await interaction.response.defer(ephemeral=True)
             result = await self.pool.execute(
-                "DELETE FROM public.youtube_notification_config WHERE guild_id = $1 AND yt_channel_id = $2",
-                str(interaction.guild.id),
+                queries.YT_CONFIG_DELETE,
+                interaction.guild.id,
                 youtube_channel_id,
             )
             if result == "DELETE 1":
+                await self.config_changed(youtube_channel_id)
                 await interaction.followup.send(
                     f"✅ Notifications for the YouTube channel `{youtube_channel_id}` have been disabled."
                 )
@@ -508,28 +844,20 @@ class YouTubeManager:
                     )
                     return
 
-                channel_name = feed.feed.get("title", "Unknown Channel")
-
-                # Seed all videos from RSS feed
-                seeded_count = 0
-                skipped_count = 0
-
-                for entry in feed.entries[:max_videos]:
-                    video_info = self.extract_video_info(entry)
-                    if not video_info:
-                        continue
+                channel_name = feed.title or "Unknown Channel"
 
-                    video_id = video_info["video_id"]
-                    result = await self.pool.execute(
-                        "INSERT INTO public.youtube_notification_logs (guild_id, yt_channel_id, video_id, video_status, notified_at) VALUES ($1, $2, $3, 'none', NOW() - INTERVAL '90 days') ON CONFLICT DO NOTHING",
-                        str(interaction.guild.id),
-                        youtube_channel_id,
-                        video_id,
-                    )
-                    if "INSERT" in result:
-                        seeded_count += 1
-                    else:
-                        skipped_count += 1
+                # Seed all videos from RSS feed in a single round trip
+                video_ids = list(
+                    dict.fromkeys(entry.video_id for entry in feed.entries[:max_videos])
+                )
+                seeded = await self.log_videos(
+                    interaction.guild.id,
+                    youtube_channel_id,
+                    video_ids,
+                    backdate_days=90,
+                )
+                seeded_count = len(seeded)
+                skipped_count = len(video_ids) - seeded_count
 
                 embed = discord.Embed(
                     title="📦 Bulk Seed Complete",
@@ -584,7 +912,7 @@ class YouTubeManager:
                     )
                     return
 
-                channel_name = feed.feed.get("title", "Unknown Channel")
+                channel_name = feed.title or "Unknown Channel"
 
                 embed = discord.Embed(
                     title=f"📡 RSS Feed Test: {channel_name}",
@@ -602,8 +930,8 @@ class YouTubeManager:
 
                         # Check if in database
                         in_db = await self.pool.fetchval(
-                            "SELECT 1 FROM public.youtube_notification_logs WHERE guild_id = $1 AND yt_channel_id = $2 AND video_id = $3",
-                            str(interaction.guild.id),
+                            queries.YT_LOG_CONTAINS,
+                            interaction.guild.id,
                             youtube_channel_id,
                             video_info["video_id"],
                         )
@@ -631,4 +959,67 @@ class YouTubeManager:
                     "❌ An error occurred while testing the RSS feed."
                 )
 
+        @self.bot.tree.command(
+            name="y6-feed-health",
+            description="Show the polling schedule and feed health of this server's YouTube channels.",
+        )
+        @app_commands.checks.has_permissions(manage_guild=True)
+        async def feed_health(interaction: discord.Interaction):
+            await interaction.response.defer(ephemeral=True)
+            configs = await self.pool.fetch(
+                queries.YT_GUILD_CHANNELS,
+                interaction.guild.id,
+            )
+            if not configs:
+                await interaction.followup.send(
+                    "❌ No YouTube channels are being monitored in this server."
+                )
+                return
+
+            # The scheduler lives in the primary shard process; other
+            # processes ask it over the shard bridge.
+            yt_channel_ids = [config["yt_channel_id"] for config in configs[:25]]
+            if self.runs_global_jobs:
+                health = self.feed_health_snapshot(yt_channel_ids)
+            else:
+                health = await self.request_feed_health(yt_channel_ids)
+                if health is None:
+                    await interaction.followup.send(
+                        "⚠️ Feed health is tracked by the primary shard process, which did not answer. Please try again later."
+                    )
+                    return
+
+            now = datetime.now(timezone.utc)
+            embed = discord.Embed(title="🩺 YouTube Feed Health", color=0xFF0000)
+            for config in configs[:25]:
+                yt_channel_id = config["yt_channel_id"]
+                feed = health.get(yt_channel_id) or {}
+                state, failures, error = feed.get("state"), feed.get("failures"), feed.get("last_error")
+
+                if state == "open":
+                    status = f"⛔ Paused after {failures} failures (`{error}`)"
+                elif state == "half-open":
+                    status = f"🟡 Retrying after {failures} failures (`{error}`)"
+                elif state:
+                    status = f"⚠️ {failures} recent failure(s) (`{error}`)"
+                else:
+                    status = "✅ Healthy"
+
+                interval = feed.get("interval_minutes")
+                schedule = f"every {interval:.0f} min" if interval else "not polled yet"
+                next_due = feed.get("next_due")
+                next_poll = (
+                    discord.utils.format_dt(max(datetime.fromisoformat(next_due), now), "R")
+                    if next_due
+                    else "soon"
+                )
+                embed.add_field(
+                    name=config["yt_channel_name"] or yt_channel_id,
+                    value=f"{status}\nPolled {schedule} | Next poll {next_poll}\nID: `{yt_channel_id}`",
+                    inline=False,
+                )
+            if len(configs) > 25:
+                embed.set_footer(text=f"Showing 25 of {len(configs)} channels.")
+            await interaction.followup.send(embed=embed)
+
         log.info("💻 YouTube Notification commands (RSS) registered.")
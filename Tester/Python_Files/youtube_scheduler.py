@@ -0,0 +1,164 @@
+# Python_Files/youtube_scheduler.py
+
+from datetime import datetime, timedelta
+import statistics
+import logging
+import zlib
+
+log = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive fetch failures (non-200s, timeouts) for one feed.
+
+    - closed:    the feed is healthy and polled on its normal interval
+    - open:      too many failures in a row, no requests until `open_until`
+    - half-open: the backoff has passed, the next poll is a single trial;
+                 success closes the breaker, failure re-opens it for twice as long
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = None
+        self.last_error = None
+
+    def state(self, now: datetime) -> str:
+        if self.open_until is None:
+            return self.CLOSED
+        return self.OPEN if now < self.open_until else self.HALF_OPEN
+
+
+class PollScheduler:
+    """
+    Decides when each YouTube channel should be polled next.
+
+    Every channel gets its own interval, derived from the upload history in
+    its RSS feed: a creator who uploads every few hours is checked often, a
+    regular uploader never less often than `baseline_interval` (15 minutes by
+    default), and only a dormant channel drifts towards the upper bound.
+
+    interval = median gap between uploads / gap_divisor, capped at
+    `baseline_interval`. Once the time since the latest upload passes
+    DORMANT_AFTER median gaps, the channel counts as dormant and the interval
+    grows with that silence instead (time since latest upload / gap_divisor).
+    The result is clamped to [min_interval, max_interval]; a feed with fewer
+    than two uploads gets `initial_interval`.
+
+    Polls are spread with deterministic per-channel jitter: every channel has
+    a fixed phase derived from a hash of its ID, which places its first poll
+    inside the initial interval and skews its interval by up to ±10%, so
+    channels never line up on the same tick, not even after a restart.
+
+    Each channel also has a CircuitBreaker: after `failure_threshold` failed
+    fetches in a row it stops polling the feed, backing off exponentially
+    from `base_backoff` up to `max_backoff`.
+    """
+
+    JITTER = 0.1
+    DORMANT_AFTER = 2  # median upload gaps of silence before a channel slows down
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        gap_divisor: float = 24,
+        initial_interval: timedelta = timedelta(minutes=15),
+        baseline_interval: timedelta = timedelta(minutes=15),
+        failure_threshold: int = 3,
+        base_backoff: timedelta = timedelta(minutes=15),
+        max_backoff: timedelta = timedelta(hours=24),
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.gap_divisor = gap_divisor
+        self.initial_interval = initial_interval
+        self.baseline_interval = baseline_interval
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.intervals = {}  # yt_channel_id -> timedelta
+        self.next_due = {}  # yt_channel_id -> datetime
+        self.breakers = {}  # yt_channel_id -> CircuitBreaker
+
+    @staticmethod
+    def phase(yt_channel_id: str) -> float:
+        """A stable number in [0, 1) for a channel, used as its jitter."""
+        return zlib.crc32(yt_channel_id.encode()) / 2**32
+
+    def due_channels(self, yt_channel_ids: list, now: datetime) -> list:
+        """Returns the channels whose poll is due, oldest deadline first."""
+        active = set(yt_channel_ids)
+        for yt_channel_id in [c for c in self.next_due if c not in active]:
+            del self.next_due[yt_channel_id]
+            self.intervals.pop(yt_channel_id, None)
+            self.breakers.pop(yt_channel_id, None)
+
+        # Newly seen channels are spread over the initial interval by their
+        # phase instead of all being fetched in the same tick.
+        for yt_channel_id in yt_channel_ids:
+            if yt_channel_id not in self.next_due:
+                self.next_due[yt_channel_id] = (
+                    now + self.initial_interval * self.phase(yt_channel_id)
+                )
+
+        due = [c for c in active if self.next_due[c] <= now]
+        return sorted(due, key=self.next_due.get)
+
+    def compute_interval(self, published_times: list, now: datetime) -> timedelta:
+        times = sorted(published_times, reverse=True)
+        if len(times) < 2:
+            # A new or nearly empty channel: no rhythm to go by yet.
+            return max(self.min_interval, min(self.max_interval, self.initial_interval))
+
+        gaps = [newer - older for newer, older in zip(times, times[1:])]
+        median_gap = statistics.median(gaps)
+        interval = min(median_gap / self.gap_divisor, self.baseline_interval)
+        silence = now - times[0]
+        if silence > median_gap * self.DORMANT_AFTER:
+            interval = max(interval, silence / self.gap_divisor)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _jittered(self, yt_channel_id: str, interval: timedelta) -> timedelta:
+        return interval * (1 + self.JITTER * (2 * self.phase(yt_channel_id) - 1))
+
+    def reschedule(
+        self, yt_channel_id: str, published_times: list, now: datetime
+    ) -> timedelta:
+        """Sets the next poll after a successful fetch, based on the feed's upload history."""
+        breaker = self.breakers.pop(yt_channel_id, None)
+        if breaker and breaker.open_until:
+            log.info(f"🟢 Feed for channel {yt_channel_id} recovered; circuit closed.")
+
+        interval = self.compute_interval(published_times, now)
+        self.intervals[yt_channel_id] = interval
+        self.next_due[yt_channel_id] = now + self._jittered(yt_channel_id, interval)
+        return interval
+
+    def postpone(self, yt_channel_id: str, now: datetime):
+        """Keeps the current interval after an error that is not the feed's fault."""
+        interval = self.intervals.get(yt_channel_id, self.initial_interval)
+        self.next_due[yt_channel_id] = now + self._jittered(yt_channel_id, interval)
+
+    def record_failure(self, yt_channel_id: str, now: datetime, error: str):
+        """Counts a failed fetch and opens the channel's circuit once the threshold is reached."""
+        breaker = self.breakers.setdefault(yt_channel_id, CircuitBreaker())
+        breaker.failures += 1
+        breaker.last_error = error
+
+        if breaker.failures < self.failure_threshold:
+            self.postpone(yt_channel_id, now)
+            return
+
+        backoff = min(
+            self.max_backoff,
+            self.base_backoff * 2 ** min(breaker.failures - self.failure_threshold, 16),
+        )
+        breaker.open_until = now + backoff
+        self.next_due[yt_channel_id] = breaker.open_until
+        log.warning(
+            f"🔴 Circuit open for channel {yt_channel_id} after {breaker.failures} failures "
+            f"({error}); next attempt in {backoff.total_seconds() / 60:.0f} minutes."
+        )